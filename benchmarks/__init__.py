@@ -0,0 +1,8 @@
+"""Creopyson benchmarks.
+
+Run offline against the fake CREOSON server::
+
+    python -m benchmarks
+    python -m benchmarks --quick --save
+
+"""
@@ -0,0 +1,4 @@
+"""Run the benchmarks, see `python -m benchmarks --help`."""
+from benchmarks.run import main
+
+main()
@@ -0,0 +1,374 @@
+"""Per-command benchmarks."""
+import atexit
+import json
+import os
+import tempfile
+
+import requests
+
+import creopyson
+from benchmarks.run import benchmark
+from creopyson.bomdiff import BomSnapshot, diff
+from creopyson.bomtree import BomTree
+from creopyson.catalog import DimensionCatalog
+from creopyson.codec import get_codec
+from creopyson.encoding import Base64Encoding, encode
+from creopyson.fakeserver import translation
+from creopyson.table import ParameterTable
+from creopyson.transport import RecordingTransport, ReplayTransport
+
+PARAMLIST = {
+    "status": {"error": False},
+    "data": {
+        "paramlist": [
+            {
+                "name": "PARAM_{}".format(i),
+                "type": "STRING",
+                "value": "value {}".format(i),
+                "designate": False,
+                "description": "",
+                "encoded": False,
+                "owner_name": "box.prt",
+            }
+            for i in range(50)
+        ]
+    },
+}
+
+
+class StubSession(object):
+    """Session answering every request with the same response, no network."""
+
+    def __init__(self, result):
+        self.response = requests.Response()
+        self.response.status_code = 200
+        self.response._content = json.dumps(result).encode()
+
+    def post(self, url, data=None, **kwargs):
+        return self.response
+
+    def close(self):
+        pass
+
+
+def _stub_client(result, codec=None):
+    client = creopyson.Client(codec=codec)
+    client._session = StubSession(result)
+    return client
+
+
+def _bom(count):
+    """Return a get_paths result with `count` components and transforms."""
+    children = [
+        {
+            "file": "part_{}.prt".format(i),
+            "seq_path": "root.{}".format(i),
+            "path": [i],
+            "transform": translation(x=float(i)),
+        }
+        for i in range(1, count + 1)
+    ]
+    return {
+        "status": {"error": False},
+        "data": {
+            "file": "top.asm",
+            "children": {"file": "top.asm", "seq_path": "root", "children": children},
+        },
+    }
+
+
+@benchmark("overhead.creoson_post_small", number=20000)
+def creoson_post_small(context):
+    """Client side cost of a request with a small response."""
+    client = _stub_client({"status": {"error": False}, "data": {"exists": True}})
+    return lambda: client._creoson_post("file", "exists", {"file": "box.prt"}, "exists")
+
+
+@benchmark("overhead.parameter_list_50", number=5000)
+def parameter_list_overhead(context):
+    """Client side cost of `parameter_list` returning 50 parameters."""
+    client = _stub_client(PARAMLIST)
+    return lambda: client.parameter_list(file_="box.prt")
+
+
+@benchmark("overhead.bom_get_paths_5000_json", number=20)
+def bom_get_paths_json(context):
+    """Decoding a 5,000 components BOM with transforms, standard json."""
+    client = _stub_client(_bom(5000), codec="json")
+    return lambda: client.bom_get_paths(file_="top.asm")
+
+
+@benchmark("overhead.bom_get_paths_5000", number=20)
+def bom_get_paths_default(context):
+    """Decoding a 5,000 components BOM with transforms, default codec."""
+    client = _stub_client(_bom(5000))
+    return lambda: client.bom_get_paths(file_="top.asm")
+
+
+@benchmark("overhead.bom_tree_5000", number=20)
+def bom_tree(context):
+    """Indexing a 5,000 components BOM with transforms in a BomTree."""
+    result = _bom(5000)["data"]
+    return lambda: BomTree(result)
+
+
+@benchmark("overhead.bom_snapshot_diff_5000", number=20)
+def bom_snapshot_diff(context):
+    """Snapshot of a 5,000 components BOM and diff with the previous one."""
+    tree = BomTree(_bom(5000)["data"])
+    previous = BomSnapshot(tree)
+    return lambda: diff(previous, BomSnapshot(tree))
+
+
+def _add_box(context):
+    context.server.add_model(
+        "box.prt",
+        parameters={"PARAM_{}".format(i): "value {}".format(i) for i in range(50)},
+        dimensions={"d{}".format(i): float(i + 1) for i in range(20)},
+    )
+
+
+@benchmark("calls.file_exists", number=1000)
+def file_exists(context):
+    """Round trip of a small command."""
+    _add_box(context)
+    return lambda: context.client.file_exists("box.prt")
+
+
+@benchmark("calls.parameter_list", number=1000)
+def parameter_list(context):
+    """Round trip of `parameter_list`, file given."""
+    _add_box(context)
+    return lambda: context.client.parameter_list(file_="box.prt")
+
+
+@benchmark("calls.parameter_list_active", number=1000)
+def parameter_list_active(context):
+    """Round trip of `parameter_list` on the active model, no active cache."""
+    _add_box(context)
+    client = context.server.client(cache_active_file=False)
+    client.connect()
+    client.file_open("box.prt")
+    return lambda: client.parameter_list()
+
+
+@benchmark("calls.dimension_set", number=1000)
+def dimension_set(context):
+    """Round trip of `dimension_set`."""
+    _add_box(context)
+    return lambda: context.client.dimension_set("d0", 12.5, file_="box.prt")
+
+
+def _deep_tree(context):
+    """BomTree of a 4,681 components assembly, 4 levels, with transforms."""
+    if not context.server.session.models.get("deep.asm"):
+        context.server.add_assembly("deep", 8, 4)
+    return context.client.bom_get_tree(file_="deep.asm", get_transforms=True)
+
+
+def _matmul(a, b):
+    return [
+        [sum(a[i][k] * b[k][j] for k in range(4)) for j in range(4)]
+        for i in range(4)
+    ]
+
+
+@benchmark("overhead.bom_world_transforms_python", number=5, quick=1)
+def world_transforms_python(context):
+    """Composing parent-relative transforms of a 4,681 components BOM, per node."""
+    tree = _deep_tree(context)
+
+    def run():
+        local = [
+            [
+                [m["x_axis"]["x"], m["y_axis"]["x"], m["z_axis"]["x"], m["origin"]["x"]],
+                [m["x_axis"]["y"], m["y_axis"]["y"], m["z_axis"]["y"], m["origin"]["y"]],
+                [m["x_axis"]["z"], m["y_axis"]["z"], m["z_axis"]["z"], m["origin"]["z"]],
+                [0.0, 0.0, 0.0, 1.0],
+            ]
+            for m in map(tree.transform, range(len(tree)))
+        ]
+        world = list(local)
+        for index in range(1, len(tree)):
+            world[index] = _matmul(world[tree.parents[index]], local[index])
+        return world
+
+    return run
+
+
+@benchmark("overhead.bom_world_transforms_numpy", number=50, quick=5)
+def world_transforms_numpy(context):
+    """Composing parent-relative transforms of a 4,681 components BOM, per level."""
+    tree = _deep_tree(context)
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return lambda: None
+    from creopyson.bomtree import compose
+
+    return lambda: compose(tree.transform_array(), tree.parents, tree.depths)
+
+
+def _parameters(count=20000):
+    """`parameter_list_many` like result of `count` parameters."""
+    return {
+        ("part_{}.prt".format(i // 20), "P{}".format(i % 20)): {
+            "name": "P{}".format(i % 20),
+            "type": "DOUBLE",
+            "value": float(i),
+            "designate": bool(i % 2),
+            "description": "",
+            "encoded": False,
+        }
+        for i in range(count)
+    }
+
+
+@benchmark("overhead.parameter_dataframe_dicts_20000", number=10, quick=2)
+def parameter_dataframe_dicts(context):
+    """DataFrame of 20,000 parameters built from one dict per row."""
+    params = _parameters()
+    try:
+        import pandas
+    except ImportError:
+        return lambda: None
+    return lambda: pandas.DataFrame(
+        [dict(param, file=file_) for (file_, _), param in params.items()]
+    )
+
+
+@benchmark("overhead.parameter_dataframe_table_20000", number=10, quick=2)
+def parameter_dataframe_table(context):
+    """DataFrame of 20,000 parameters built from a ParameterTable."""
+    params = _parameters()
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        return lambda: None
+    return lambda: ParameterTable.from_many(params).to_pandas(categories=["file"])
+
+
+def _dimensions(drawings=500, count=100):
+    """`dimension_list_detail` results of `drawings` drawings."""
+    types = ["linear", "linear", "radial", "diameter", "angular"]
+    return {
+        "drawing_{}.drw".format(d): [
+            {
+                "name": "d{}".format(i),
+                "value": float(i),
+                "encoded": False,
+                "dwg_dim": bool(i % 3),
+                "sheet": 1 + i % 3,
+                "view_name": "VIEW_{}".format(i % 6),
+                "dim_type": types[i % 5],
+                "text": "@D",
+                "location": {"x": float(i), "y": float(d), "z": 0.0},
+                "tolerance_type": "plus_minus",
+                "tol_plus": 0.01 * (i % 10),
+                "tol_minus": 0.01 * (i % 7),
+            }
+            for i in range(count)
+        ]
+        for d in range(drawings)
+    }
+
+
+@benchmark("overhead.dimension_catalog_build_50000", number=5, quick=1)
+def dimension_catalog_build(context):
+    """DimensionCatalog of 50,000 dimensions, from `dimension_list_detail` dicts."""
+    dims = _dimensions()
+    return lambda: DimensionCatalog.from_many(dims)
+
+
+@benchmark("overhead.dimension_filter_dicts_50000", number=20, quick=2)
+def dimension_filter_dicts(context):
+    """Linear dimensions of a view with a tolerance band, from 50,000 dicts."""
+    dims = _dimensions()
+
+    def run():
+        return [
+            (file_, dim)
+            for file_, file_dims in dims.items()
+            for dim in file_dims
+            if dim["dim_type"] == "linear"
+            and dim["view_name"] == "VIEW_2"
+            and dim.get("tol_plus") is not None
+            and dim["tol_plus"] + dim["tol_minus"] >= 0.1
+        ]
+
+    return run
+
+
+@benchmark("overhead.dimension_filter_catalog_50000", number=20, quick=2)
+def dimension_filter_catalog(context):
+    """Linear dimensions of a view with a tolerance band, from a DimensionCatalog."""
+    catalog = DimensionCatalog.from_many(_dimensions())
+    return lambda: catalog.indices(dim_type="linear", view="VIEW_2", tolerance=(0.1, None))
+
+
+def _encoded_parameters(count=20000):
+    """JSON response of `count` encoded parameters, and its codec."""
+    codec = get_codec()
+    params = [
+        {
+            "name": "P{}".format(i),
+            "type": "STRING",
+            "value": encode("Ø{} ±0.1".format(i)),
+            "designate": False,
+            "description": "",
+            "encoded": True,
+        }
+        for i in range(count)
+    ]
+    return codec, codec.dumps(params)
+
+
+@benchmark("overhead.parameter_decode_loop_20000", number=10, quick=2)
+def parameter_decode_loop(context):
+    """20,000 encoded parameters decoded by hand, one decoded copy per parameter."""
+    import base64
+
+    codec, body = _encoded_parameters()
+
+    def run():
+        return [
+            dict(param, value=base64.b64decode(param["value"]).decode("utf-8"), encoded=False)
+            if param["encoded"]
+            else param
+            for param in codec.loads(body)
+        ]
+
+    return run
+
+
+@benchmark("overhead.parameter_decode_in_place_20000", number=10, quick=2)
+def parameter_decode_in_place(context):
+    """20,000 encoded parameters decoded in place by the encoding layer."""
+    codec, body = _encoded_parameters()
+    encoding = Base64Encoding()
+    return lambda: encoding.result("parameter", "list", codec.loads(body))
+
+
+@benchmark("overhead.replay_parameter_list_200", number=5, quick=1)
+def replay_parameter_list(context):
+    """Replay of 200 recorded `parameter_list`, no latency: client time only."""
+    names = ["replay_{}.prt".format(i) for i in range(200)]
+    for name in names:
+        context.server.add_model(
+            name, parameters={"P{}".format(i): i for i in range(10)}
+        )
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    os.close(fd)
+    atexit.register(os.remove, path)
+    with RecordingTransport(path) as recorder:
+        client = context.server.client(transport=recorder)
+        client.connect()
+        for name in names:
+            client.parameter_list(file_=name)
+
+    def run():
+        client.transport = ReplayTransport(path, speed=None)
+        for name in names:
+            client.parameter_list(file_=name)
+
+    return run
@@ -0,0 +1,49 @@
+"""Import time benchmarks, each run in a new interpreter."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.run import benchmark
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def _python(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    command = [sys.executable, "-c", code]
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+@benchmark("import.python", number=20, quick=5)
+def python_startup(context):
+    """Interpreter start, the floor of the import benchmarks."""
+    return _python("pass")
+
+
+@benchmark("import.creopyson", number=20, quick=5)
+def import_creopyson(context):
+    """`import creopyson`, nothing used."""
+    return _python("import creopyson")
+
+
+@benchmark("import.creopyson_one_command", number=20, quick=5)
+def import_one_command(context):
+    """A short script: one Client and one command module."""
+    return _python(
+        "import creopyson\n"
+        "c = creopyson.Client()\n"
+        "c.session\n"
+        "c.parameter_list\n"
+    )
+
+
+@benchmark("import.creopyson_all", number=20, quick=5)
+def import_all(context):
+    """Every command module, AsyncClient and ClientPool."""
+    return _python(
+        "import creopyson\n"
+        "for name in creopyson.COMMANDS:\n"
+        "    getattr(creopyson.Client, name)\n"
+        "creopyson.AsyncClient, creopyson.ClientPool\n"
+    )
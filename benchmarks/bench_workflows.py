@@ -0,0 +1,345 @@
+"""End-to-end benchmarks."""
+import atexit
+import itertools
+
+from benchmarks.run import benchmark
+
+
+def walk(node):
+    """Yield every BOM node."""
+    yield node
+    for child in node.get("children", []):
+        yield from walk(child)
+
+
+def _add_top(context):
+    """Add a ~5,000 component assembly (~400 with --quick)."""
+    if not context.server.session.models.get("top.asm"):
+        breadth = 20 if context.quick else 70
+        context.server.add_assembly("top", breadth, 2, parameters={"COLOR": "red"})
+
+
+@benchmark("workflow.bom_get_paths_5000", number=5, quick=2)
+def bom_get_paths(context):
+    """`bom_get_paths` of the whole assembly, with transforms."""
+    _add_top(context)
+    return lambda: context.client.bom_get_paths(
+        file_="top.asm", paths=True, get_transforms=True
+    )
+
+
+@benchmark("workflow.bom_walk_parameter_dump_5000", number=1)
+def bom_walk_parameter_dump(context):
+    """BOM walk then `parameter_list` of every component."""
+    _add_top(context)
+    client = context.client
+
+    def operation():
+        bom = client.bom_get_paths(file_="top.asm")
+        return {
+            node["file"]: client.parameter_list(file_=node["file"])
+            for node in walk(bom["children"])
+        }
+
+    return operation
+
+
+@benchmark("workflow.set_300_parameters_regenerate", number=3, quick=1)
+def set_parameters_regenerate(context):
+    """Set 300 parameters then regenerate, 2 ms latency."""
+    context.remote.add_model("bulk.prt")
+    client = context.remote_client
+
+    def operation():
+        for i in range(300):
+            client.parameter_set("P{}".format(i), i, file_="bulk.prt", type_="INTEGER")
+        client.file_regenerate(file_="bulk.prt")
+
+    return operation
+
+
+@benchmark("workflow.set_300_parameters_regenerate_batch", number=3, quick=1)
+def set_parameters_regenerate_batch(context):
+    """Set 300 parameters then regenerate in a batch, 2 ms latency."""
+    context.remote.add_model("bulk.prt")
+    client = context.remote_client
+
+    def operation():
+        with client.batch():
+            for i in range(300):
+                client.parameter_set("P{}".format(i), i, file_="bulk.prt", type_="INTEGER")
+            client.file_regenerate(file_="bulk.prt")
+
+    return operation
+
+
+def _add_wide(context):
+    """Add a 3 levels assembly, 8 components each, on the remote server."""
+    if not context.remote.session.models.get("wide.asm"):
+        context.remote.add_assembly("wide", 8, 3)
+
+
+@benchmark("workflow.bom_iter_paths_first_10", number=10, quick=3)
+def bom_iter_paths_first(context):
+    """First 10 components of a 585 components assembly, 2 ms latency."""
+    _add_wide(context)
+    client = context.remote_client
+    return lambda: list(itertools.islice(client.bom_iter_paths(file_="wide.asm"), 10))
+
+
+@benchmark("workflow.bom_iter_paths_all", number=3, quick=1)
+def bom_iter_paths_all(context):
+    """Every component of a 585 components assembly, 2 ms latency."""
+    _add_wide(context)
+    client = context.remote_client
+    return lambda: list(client.bom_iter_paths(file_="wide.asm"))
+
+
+@benchmark("workflow.bom_iter_paths_all_prefetch", number=3, quick=1)
+def bom_iter_paths_all_prefetch(context):
+    """Every component of a 585 components assembly, 8 workers, 2 ms latency."""
+    _add_wide(context)
+    client = context.remote_client
+    return lambda: list(client.bom_iter_paths(file_="wide.asm", workers=8))
+
+
+def _remote_parts(context, count=200):
+    """Add `count` parts with 10 parameters on the remote server."""
+    names = ["bulk_{}.prt".format(i) for i in range(count)]
+    if not context.remote.session.models.get(names[0]):
+        parameters = {"P{}".format(i): i for i in range(10)}
+        for name in names:
+            context.remote.add_model(name, parameters=parameters)
+    return names
+
+
+@benchmark("workflow.parameter_list_200_models", number=3, quick=1)
+def parameter_list_models(context):
+    """`parameter_list` of 200 models one by one, 2 ms latency."""
+    names = _remote_parts(context)
+    client = context.remote_client
+    return lambda: {name: client.parameter_list(file_=name) for name in names}
+
+
+@benchmark("workflow.parameter_list_many_200_models", number=3, quick=1)
+def parameter_list_many_models(context):
+    """`parameter_list_many` of 200 models, 2 ms latency."""
+    names = _remote_parts(context)
+    client = context.remote_client
+    return lambda: client.parameter_list_many(names)
+
+
+def _desired(names):
+    """Desired state of the remote parts: one parameter changed on 10% of them."""
+    return {
+        name: {
+            "P{}".format(i): i + (index % 10 == 0 and i == 0)
+            for i in range(10)
+        }
+        for index, name in enumerate(names)
+    }
+
+
+@benchmark("workflow.parameter_set_all_200_models", number=3, quick=1)
+def parameter_set_all(context):
+    """`parameter_set` of 10 parameters on 200 models one by one, 2 ms latency."""
+    names = _remote_parts(context)
+    desired = _desired(names)
+    client = context.remote_client
+
+    def run():
+        for name, params in desired.items():
+            for param, value in params.items():
+                client.parameter_set(param, value, file_=name, type_="INTEGER")
+
+    return run
+
+
+@benchmark("workflow.parameter_sync_200_models", number=3, quick=1)
+def parameter_sync(context):
+    """`parameter_sync` of 10 parameters on 200 models, 10% changed, 2 ms latency."""
+    names = _remote_parts(context)
+    desired = _desired(names)
+    client = context.remote_client
+    models = context.remote.session.models
+
+    def run():
+        for name in names:
+            models[name].parameters["P0"]["value"] = 0
+        return client.parameter_sync(desired)
+
+    return run
+
+
+def _repeated_reads(client):
+    """20 steps reading units and parameters of a model, then setting one."""
+
+    def run():
+        for step in range(20):
+            client.file_get_length_units(file_="bulk_0.prt")
+            client.file_get_mass_units(file_="bulk_0.prt")
+            client.parameter_list(file_="bulk_0.prt")
+            if step % 5 == 4:
+                client.parameter_set("P0", step, file_="bulk_0.prt", type_="INTEGER")
+
+    return run
+
+
+@benchmark("workflow.repeated_reads", number=3, quick=1)
+def repeated_reads(context):
+    """Reads repeated between a few changes, no cache, 2 ms latency."""
+    _remote_parts(context)
+    return _repeated_reads(context.remote_client)
+
+
+@benchmark("workflow.repeated_reads_cached", number=3, quick=1)
+def repeated_reads_cached(context):
+    """Reads repeated between a few changes, `cache=True`, 2 ms latency."""
+    _remote_parts(context)
+    client = context.remote.client(cache=True)
+    client.connect()
+    return _repeated_reads(client)
+
+
+def _remote_dimensions(context):
+    """Add 5 parts with 20 dimensions on the remote server."""
+    names = ["dims_{}.prt".format(i) for i in range(5)]
+    if not context.remote.session.models.get(names[0]):
+        for name in names:
+            context.remote.add_model(
+                name, dimensions={"d{}".format(i): float(i + 1) for i in range(20)}
+            )
+    return names
+
+
+@benchmark("workflow.dimension_set_regenerate_100", number=3, quick=1)
+def dimension_set_regenerate(context):
+    """100 `dimension_set`, each followed by a regeneration, 2 ms latency."""
+    names = _remote_dimensions(context)
+    client = context.remote_client
+
+    def run():
+        for name in names:
+            for i in range(20):
+                client.dimension_set("d{}".format(i), i + 2.0, file_=name)
+                client.file_regenerate(file_=name)
+
+    return run
+
+
+@benchmark("workflow.dimension_editor_100", number=3, quick=1)
+def dimension_editor(context):
+    """100 dimension edits with `dimension_editor`, 2 ms latency."""
+    names = _remote_dimensions(context)
+    client = context.remote_client
+    values = [0.0]
+
+    def run():
+        values[0] += 1
+        editor = client.dimension_editor()
+        for name in names:
+            editor.update({"d{}".format(i): i + values[0] for i in range(20)}, file_=name)
+        return editor.apply()
+
+    return run
+
+
+def _doe_sessions(count):
+    """Start `count` fake Creo sessions with a box, 2 ms latency, 1 ms processing."""
+    from creopyson.fakeserver import FakeCreoson
+
+    servers = []
+    for _ in range(count):
+        server = FakeCreoson(latency=0.002, processing=0.001).start()
+        server.add_model("box.prt", dimensions={"d0": 1.0, "d1": 2.0, "d2": 3.0})
+        atexit.register(server.stop)
+        servers.append(server)
+    return servers
+
+
+def _doe_plan():
+    from creopyson import doe
+
+    return doe.full_factorial({"d0": [1, 2, 3, 4], "d1": [1, 2, 3], "d2": [1, 2]})
+
+
+@benchmark("workflow.doe_24_variants", number=3, quick=1)
+def doe_one_session(context):
+    """DOE of 24 variants with massprops on one session."""
+    from creopyson import doe
+
+    server = _doe_sessions(1)[0]
+    client = server.client()
+    client.connect()
+    plan = _doe_plan()
+    return lambda: doe.DoeRunner("box.prt", plan).run(client)
+
+
+@benchmark("workflow.doe_24_variants_4_sessions", number=3, quick=1)
+def doe_four_sessions(context):
+    """DOE of 24 variants with massprops spread over 4 sessions."""
+    import creopyson
+    from creopyson import doe
+
+    servers = _doe_sessions(4)
+    pool = creopyson.ClientPool([("127.0.0.1", server.port) for server in servers])
+    plan = _doe_plan()
+    return lambda: doe.DoeRunner("box.prt", plan).run(pool)
+
+
+def _remote_features(context):
+    """Add a part with 300 features on the remote server."""
+    if not context.remote.session.models.get("features.prt"):
+        types = ["PROTRUSION", "CUT", "HOLE", "ROUND", "DATUM_PLANE"]
+        context.remote.add_model("features.prt", features=[
+            {
+                "name": "FEAT_{}".format(i),
+                "type": types[i % 5],
+                "status": "SUPPRESSED" if i % 7 == 0 else "ACTIVE",
+            }
+            for i in range(300)
+        ])
+
+
+_FEATURE_QUERIES = [
+    {"status": "SUPPRESSED"},
+    {"type_": "HOLE"},
+    {"type_": "CUT", "status": "ACTIVE"},
+    {"name": "FEAT_1*"},
+    {"type_": "ROUND", "status": "SUPPRESSED"},
+] * 4
+
+
+@benchmark("workflow.feature_queries_20", number=3, quick=1)
+def feature_queries(context):
+    """20 filtered `feature_list`, then a suppress, 2 ms latency."""
+    _remote_features(context)
+    client = context.remote_client
+
+    def run():
+        for query in _FEATURE_QUERIES:
+            client.feature_list(file_="features.prt", **query)
+        client.feature_suppress(
+            file_="features.prt", name="FEAT_2", clip=False, with_children=False
+        )
+        client.feature_list(file_="features.prt", status="SUPPRESSED")
+        client.feature_resume(file_="features.prt", name="FEAT_2")
+
+    return run
+
+
+@benchmark("workflow.feature_index_queries_20", number=3, quick=1)
+def feature_index_queries(context):
+    """The same queries on a FeatureIndex listed once, 2 ms latency."""
+    _remote_features(context)
+    client = context.remote_client
+
+    def run():
+        index = client.feature_index("features.prt")
+        for query in _FEATURE_QUERIES:
+            index.query(**query)
+        index.suppress("FEAT_2", clip=False, with_children=False)
+        index.query(status="SUPPRESSED")
+        index.resume("FEAT_2")
+
+    return run
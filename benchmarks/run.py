@@ -0,0 +1,211 @@
+"""Benchmark harness.
+
+Benchmarks are registered with the `benchmark` decorator. A benchmark gets a
+`Context` (fake CREOSON server and connected Client) and returns the
+operation to time. Results are saved as JSON in `benchmarks/results/`, one
+file per creopyson version, so releases can be compared.
+"""
+import argparse
+import importlib
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import creopyson
+from creopyson.fakeserver import FakeCreoson
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MODULES = [
+    "benchmarks.bench_client",
+    "benchmarks.bench_import",
+    "benchmarks.bench_workflows",
+]
+REGRESSION = 1.10
+
+BENCHMARKS = []
+
+
+def benchmark(name, number=1000, quick=None):
+    """Register a benchmark.
+
+    Args:
+        name (str):
+            Benchmark name, used in the results.
+        number (int, optional):
+            Operations per run. Defaults to 1000.
+        quick (int, optional):
+            Operations per run with `--quick`. Defaults is number / 10.
+
+    """
+
+    def decorator(func):
+        BENCHMARKS.append((name, func, number, quick or max(number // 10, 1)))
+        return func
+
+    return decorator
+
+
+class Context(object):
+    """Shared fake servers and clients, started on first use.
+
+    `server` answers at once, `remote` adds `REMOTE_LATENCY` to each request
+    like a Creo session over the network.
+    """
+
+    REMOTE_LATENCY = 0.002
+
+    def __init__(self, quick=False):
+        self.quick = quick
+        self._server = None
+        self._client = None
+        self._remote = None
+        self._remote_client = None
+
+    @property
+    def server(self):
+        """FakeCreoson: the fake server."""
+        if self._server is None:
+            self._server = FakeCreoson().start()
+        return self._server
+
+    @property
+    def client(self):
+        """Client: connected to the fake server."""
+        if self._client is None:
+            self._client = self.server.client()
+            self._client.connect()
+        return self._client
+
+    @property
+    def remote(self):
+        """FakeCreoson: the fake server with latency."""
+        if self._remote is None:
+            self._remote = FakeCreoson(latency=self.REMOTE_LATENCY).start()
+        return self._remote
+
+    @property
+    def remote_client(self):
+        """Client: connected to the fake server with latency."""
+        if self._remote_client is None:
+            self._remote_client = self.remote.client()
+            self._remote_client.connect()
+        return self._remote_client
+
+    def close(self):
+        """Stop the fake servers."""
+        for client in (self._client, self._remote_client):
+            if client is not None:
+                client.close()
+        for server in (self._server, self._remote):
+            if server is not None:
+                server.stop()
+
+
+def timeit(operation, number, repeat):
+    """Return the seconds per operation of each run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def run(pattern=None, quick=False, repeat=5):
+    """Run the benchmarks matching `pattern` and return their results."""
+    for module in MODULES:
+        importlib.import_module(module)
+    results = {}
+    context = Context(quick)
+    try:
+        for name, func, number, quick_number in BENCHMARKS:
+            if pattern and pattern not in name:
+                continue
+            operation = func(context)
+            number = quick_number if quick else number
+            operation()  # warm up
+            timings = timeit(operation, number, repeat)
+            best = min(timings)
+            results[name] = {
+                "seconds": best,
+                "median": statistics.median(timings),
+                "ops_per_sec": 1.0 / best if best else None,
+                "number": number,
+            }
+            print("{:40} {:>12.1f} us {:>12.1f} ops/s".format(
+                name, best * 1e6, results[name]["ops_per_sec"] or 0.0
+            ))
+    finally:
+        context.close()
+    return results
+
+
+def save(results, quick, directory=RESULTS_DIR):
+    """Save results as `<directory>/<version>.json`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "{}{}.json".format(creopyson.__version__, "-quick" if quick else "")
+    document = {
+        "version": creopyson.__version__,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=2, sort_keys=True))
+    return path
+
+
+def compare(results, baseline_path):
+    """Print the ratio of each result to the baseline, return regressions."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    print("\nCompared to {} ({}):".format(baseline["version"], baseline_path))
+    regressions = []
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        flag = ""
+        if ratio > REGRESSION:
+            flag = "REGRESSION"
+            regressions.append(name)
+        print("{:40} {:>8.2f}x {}".format(name, ratio, flag))
+    return regressions
+
+
+def latest_baseline(quick, directory=RESULTS_DIR):
+    """Return the newest saved result of another version, if any."""
+    current = "{}{}.json".format(creopyson.__version__, "-quick" if quick else "")
+    candidates = [
+        path
+        for path in directory.glob("*.json")
+        if path.name.endswith("-quick.json") == quick and path.name != current
+    ]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda path: path.stat().st_mtime)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run creopyson benchmarks.")
+    parser.add_argument("-k", dest="pattern", help="only run matching benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer operations")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark")
+    parser.add_argument("--save", action="store_true", help="save the results")
+    parser.add_argument("--compare", help="results file to compare with")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.quick, args.repeat)
+    if args.save:
+        print("\nSaved to {}".format(save(results, args.quick)))
+    baseline = args.compare or latest_baseline(args.quick)
+    if baseline:
+        if compare(results, baseline):
+            sys.exit(1)
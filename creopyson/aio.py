@@ -0,0 +1,731 @@
+"""Asyncio module.
+
+`AsyncClient` exposes the same commands as `Client` as coroutines::
+
+    import asyncio
+    import creopyson
+
+    async def main():
+        async with creopyson.AsyncClient("host1") as c:
+            await c.connect()
+            return await c.parameter_list(file_="box.prt")
+
+    asyncio.run(main())
+
+The coroutines are generated from the module functions: each function is run
+against a stand-in client which stops on every CREOSON request. The request
+is then sent with the asyncio transport and the function is run again with
+the answers received so far, until it returns.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+from collections import deque
+
+from .codec import get_codec
+from .connection import (
+    ACTIVE_FILE_CHANGES,
+    SERVER_COMMANDS,
+    Client,
+    LazyCommand,
+    parse_result,
+)
+from .exceptions import ErrorJsonDecode, RequestTimeout, StatusError
+from .resilience import CircuitBreaker, command_timeout, is_read_only
+
+lg = logging.getLogger(__name__)
+
+
+class _HttpPool(object):
+    """Keep-alive HTTP/1.1 connections to one host, on asyncio streams."""
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle = []
+        self._semaphore = None
+        self._loop = None
+
+    async def post(self, path, body):
+        """Send a POST request and return `(status code, content)`."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # streams are bound to their event loop.
+            self._idle = []
+            self._semaphore = asyncio.Semaphore(self.size)
+            self._loop = loop
+        async with self._semaphore:
+            # a pooled connection may have been closed by the server:
+            # retry once on a new connection.
+            if self._idle:
+                reader, writer = self._idle.pop()
+                try:
+                    return await self._send(reader, writer, path, body)
+                except (OSError, asyncio.IncompleteReadError):
+                    writer.close()
+                except BaseException:
+                    # cancelled (ie. timed out): the answer may still come
+                    writer.close()
+                    raise
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                return await self._send(reader, writer, path, body)
+            except BaseException:
+                writer.close()
+                raise
+
+    async def _send(self, reader, writer, path, body):
+        head = (
+            "POST {} HTTP/1.1\r\n"
+            "Host: {}:{}\r\n"
+            "Content-Type: application/json\r\n"
+            "Content-Length: {}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).format(path, self.host, self.port, len(body))
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+        try:
+            status, content, keep_alive = await self._receive(reader)
+        except (ValueError, IndexError) as e:
+            # malformed or truncated response
+            raise ConnectionError("Invalid HTTP response: {}".format(e))
+
+        if keep_alive:
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, content
+
+    async def _receive(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await reader.read()
+            keep_alive = False
+        return status, content, keep_alive
+
+    def close(self):
+        """Close idle connections."""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class _Request(BaseException):
+    """Raised by `_ReplayClient` when a function needs a CREOSON answer."""
+
+    def __init__(self, command, function, data, key_data):
+        self.command = command
+        self.function = function
+        self.data = data
+        self.key_data = key_data
+
+
+class _ReplayClient(Client):
+    """Client replaying known answers, raising `_Request` for the next one."""
+
+    def __init__(self, async_client, answers, active_file):
+        self.server = async_client.server
+        self.sessionId = async_client.sessionId
+        self.cache_active_file = async_client.cache_active_file
+        self._active_file = active_file
+        self._answers = iter(answers)
+
+    def _creoson_post(self, command, function, data=None, key_data=None):
+        if (command, function) in ACTIVE_FILE_CHANGES:
+            self._active_file = None
+        try:
+            success, value = next(self._answers)
+        except StopIteration:
+            raise _Request(command, function, data, key_data)
+        if success:
+            return value
+        raise value
+
+
+class AsyncClient(object):
+    """Creates an asyncio Client object.
+
+    Every `Client` command is available as a coroutine with the same name
+    and arguments (ie. `await c.file_open("box.prt")`). `Client.batch` and
+    the hooks are not: run commands concurrently with `gather`.
+    """
+
+    def __init__(
+        self,
+        ip_adress="localhost",
+        port=9056,
+        pool_size=10,
+        cache_active_file=True,
+        codec=None,
+        timeout=None,
+        timeouts=None,
+        retries=0,
+        backoff=0.5,
+        circuit_breaker=None,
+        cache=None,
+        encoding=None,
+    ):
+        """Create AsyncClient objet. Define server and sessionID vars.
+
+        Args:
+            ip_adress (str, optional):
+                CREOSON host. Defaults to `localhost`.
+            port (int, optional):
+                CREOSON port. Defaults to 9056.
+            pool_size (int, optional):
+                Maximum number of connections (and so of concurrent
+                requests) opened to CREOSON. Defaults to 10.
+            cache_active_file (bool, optional):
+                Whether to cache the active model, see `Client`.
+                Defaults to True.
+            codec (str|obj:Codec, optional):
+                JSON codec, see `Client`. Defaults is the fastest installed.
+            timeout (float|tuple, optional):
+                Seconds to wait for CREOSON, including the wait for a free
+                connection, before raising `RequestTimeout`. A (connect,
+                read) tuple allows their sum. Defaults is no limit.
+            timeouts (dict, optional):
+                Timeouts per command, see `Client`.
+                Defaults is `timeout` for every command.
+            retries (int, optional):
+                How many times a read-only command is sent again after a
+                connection error or timeout, see `Client`. Defaults to 0.
+            backoff (float, optional):
+                Seconds before the first retry, doubled for each next one.
+                Defaults to 0.5.
+            circuit_breaker (int|obj:CircuitBreaker, optional):
+                Fail fast with `CircuitOpen` after this number of connection
+                errors in a row, see `Client`.
+                Defaults is no circuit breaker.
+            cache (bool|obj:ResultCache, optional):
+                Cache the results of read-only commands, see `Client`.
+                Defaults is no cache.
+            encoding (bool|obj:Base64Encoding, optional):
+                Exchange values Base64-encoded, see `Client`.
+                Defaults is no encoding.
+
+        """
+        self.server = "http://{}:{}/creoson".format(ip_adress, port)
+        self.sessionId = ""
+        self.pool_size = pool_size
+        self.cache_active_file = cache_active_file
+        self._active_file = None
+        # bumped when the active model may change, see `_run`
+        self._active_generation = 0
+        self.codec = get_codec(codec)
+        self._pool = _HttpPool(ip_adress, port, pool_size)
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.retries = retries
+        self.backoff = backoff
+        if isinstance(circuit_breaker, int):
+            circuit_breaker = CircuitBreaker(circuit_breaker)
+        self.circuit_breaker = circuit_breaker
+        if cache is True:
+            from .cache import ResultCache
+
+            cache = ResultCache(codec=self.codec)
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        if encoding is True:
+            from .encoding import Base64Encoding
+
+            encoding = Base64Encoding()
+        elif encoding is False:
+            encoding = None
+        self.encoding = encoding
+
+    async def __aenter__(self):
+        """Return the client itself."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Disconnect from CREOSON if needed and close the connections."""
+        if self.sessionId:
+            try:
+                await self.disconnect()
+            except (ConnectionError, RuntimeError) as e:
+                lg.warning("disconnect failed: %s", e)
+        await self.close()
+
+    async def close(self):
+        """Close the pooled connections."""
+        self._pool.close()
+
+    def invalidate_active_file(self):
+        """Drop the cached active model."""
+        self._active_file = None
+        self._active_generation += 1
+
+    async def _post(self, path, request):
+        """Post a request and return the decoded result.
+
+        Read-only commands are sent again after a connection error, up to
+        `retries` times, see `Client`.
+        """
+        command, function = request["command"], request["function"]
+        timeout = command_timeout(command, function, self.timeout, self.timeouts)
+        if isinstance(timeout, tuple):
+            timeout = sum(timeout)
+        retries = 0
+        if self.retries and is_read_only(command, function):
+            retries = self.retries
+        breaker = self.circuit_breaker
+        body = self.codec.dumps(request)
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before()
+            try:
+                content = await self._send(path, body, timeout)
+            except ConnectionError as e:
+                if breaker is not None:
+                    breaker.failure()
+                if attempt >= retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                attempt += 1
+                lg.warning(
+                    "%s %s failed (%s), retry %s/%s in %.2fs",
+                    command, function, e, attempt, retries, delay
+                )
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.success()
+            break
+        try:
+            json_result = self.codec.loads(content)
+            lg.debug("response: %s", json_result)
+        except (TypeError, ValueError):
+            raise ErrorJsonDecode("Cannot decode JSON, creoson result invalid.")
+        return json_result
+
+    async def _send(self, path, body, timeout=None):
+        """Post a request body, return the response body.
+
+        Raises:
+            RequestTimeout: creoson did not answer in `timeout` seconds.
+            StatusError: creoson answered with an HTTP error status.
+            ConnectionError: creoson not reachable.
+
+        """
+        try:
+            status, content = await asyncio.wait_for(
+                self._pool.post(path, body), timeout
+            )
+        except asyncio.TimeoutError:
+            raise RequestTimeout(
+                "No answer from {} in {} seconds".format(self.server, timeout)
+            )
+        except (OSError, asyncio.IncompleteReadError) as e:
+            raise ConnectionError(e)
+        if status != 200:
+            raise StatusError(status)
+        return content
+
+    async def _creoson_post(self, command, function, data=None, key_data=None):
+        """Send a POST request to creoson server and return waited data.
+
+        See `Client._creoson_post`.
+        """
+        encoding = self.encoding
+        if encoding is None or (command, function) not in encoding.commands:
+            return await self._request(command, function, data, key_data)
+        data, decode_result = encoding.request(command, function, data)
+        result = await self._request(command, function, data, key_data)
+        if decode_result:
+            return encoding.result(command, function, result)
+        return result
+
+    async def _request(self, command, function, data, key_data):
+        """Send a request, through the result cache if any."""
+        request = {
+            "sessionId": self.sessionId,
+            "command": command,
+            "function": function,
+            "data": data,
+        }
+        lg.debug("request: %s", request)
+        if (command, function) in ACTIVE_FILE_CHANGES:
+            self.invalidate_active_file()
+        path = "/server" if command in SERVER_COMMANDS else "/creoson"
+        cache = self.cache
+        if cache is None:
+            json_result = await self._post(path, request)
+            return parse_result(command, function, json_result, key_data)
+        key = cache.key(command, function, data, key_data)
+        if key is None:
+            cache.notify(command, function, data)
+            try:
+                json_result = await self._post(path, request)
+                return parse_result(command, function, json_result, key_data)
+            finally:
+                cache.notify(command, function, data)
+        found, result = cache.get(key)
+        if found:
+            return result
+        generation = cache.generation
+        json_result = await self._post(path, request)
+        result = parse_result(command, function, json_result, key_data)
+        cache.put(key, result, generation)
+        return result
+
+    async def _run(self, func, *args, **kwargs):
+        """Run a synchronous module function, sending its requests async."""
+        answers = []
+        # each run replays the same state; the active model found is kept
+        # unless it was invalidated meanwhile, by this call or another one
+        active_file = self._active_file
+        generation = self._active_generation
+        while True:
+            client = _ReplayClient(self, answers, active_file)
+            try:
+                result = func(client, *args, **kwargs)
+            except _Request as request:
+                try:
+                    value = await self._creoson_post(
+                        request.command,
+                        request.function,
+                        request.data,
+                        request.key_data,
+                    )
+                    answers.append((True, value))
+                except Exception as e:
+                    answers.append((False, e))
+                continue
+            if (
+                self.cache_active_file
+                and client._active_file
+                and generation == self._active_generation
+            ):
+                self._active_file = client._active_file
+            return result
+
+    async def connect(self):
+        """Connect to CREOSON.
+
+        Define 'sessionId'.
+        """
+        self.sessionId = await self._creoson_post("connection", "connect")
+
+    async def disconnect(self):
+        """Disconnect from CREOSON.
+
+        Empty sessionId and close the pooled connections.
+        """
+        await self._creoson_post("connection", "disconnect")
+        self.sessionId = ""
+        await self.close()
+
+    async def bom_iter_paths(
+        self,
+        file_=None,
+        paths=None,
+        skeletons=None,
+        get_transforms=None,
+        exclude_inactive=None,
+        breadth_first=False,
+        workers=None,
+        expand=None,
+    ):
+        """Iterate over the components of an assembly, fetched level by level.
+
+        Asynchronous generator, see `bom.iter_paths`.
+        """
+        from .bom import _component
+
+        if file_ is None:
+            active_file = await self.file_get_active()
+            if active_file:
+                file_ = active_file["file"]
+        options = {
+            "paths": paths,
+            "skeletons": skeletons,
+            "get_transforms": get_transforms,
+            "exclude_inactive": exclude_inactive,
+        }
+
+        async def fetch(name):
+            result = await self.bom_get_paths(file_=name, top_level=True, **options)
+            return result["children"]
+
+        def is_expanded(item):
+            return item["file"].lower().endswith(".asm") and (expand is None or expand(item))
+
+        cache = {}
+        pending = {}
+
+        async def children(name):
+            key = name.lower()
+            nodes = cache.get(key)
+            if nodes is None:
+                task = pending.pop(key, None)
+                root = await (task if task is not None else fetch(name))
+                nodes = cache[key] = root.get("children") or []
+            return nodes
+
+        def prefetch(frontier):
+            count = min(len(frontier), workers * 2)
+            for position in range(count):
+                item = frontier[position] if breadth_first else frontier[-1 - position]
+                key = item["file"].lower()
+                if key not in cache and key not in pending and is_expanded(item):
+                    pending[key] = asyncio.ensure_future(fetch(item["file"]))
+
+        try:
+            root = await fetch(file_)
+            top = {key: value for key, value in root.items() if key != "children"}
+            top["depth"] = 0
+            cache[root["file"].lower()] = root.get("children") or []
+            frontier = deque([top])
+            while frontier:
+                item = frontier.popleft() if breadth_first else frontier.pop()
+                yield item
+                if item["depth"] == 0 or is_expanded(item):
+                    nodes = [_component(item, node) for node in await children(item["file"])]
+                    if breadth_first:
+                        frontier.extend(nodes)
+                    else:
+                        frontier.extend(reversed(nodes))
+                if workers and workers > 1:
+                    prefetch(frontier)
+        finally:
+            for task in pending.values():
+                task.cancel()
+
+    async def parameter_iter_many(
+        self,
+        files,
+        name=None,
+        encoded=None,
+        value=None,
+        workers=None,
+        return_exceptions=False,
+    ):
+        """Get the parameters of many models, fetched concurrently.
+
+        Asynchronous generator, see `parameter.iter_many`.
+        """
+        workers = workers or self.pool_size
+        files = iter(files)
+        window = deque()
+
+        def submit():
+            for file_ in files:
+                window.append((file_, asyncio.ensure_future(self.parameter_list(
+                    name=name, file_=file_, encoded=encoded, value=value
+                ))))
+                return True
+            return False
+
+        try:
+            while len(window) < workers and submit():
+                pass
+            while window:
+                file_, task = window.popleft()
+                try:
+                    params = await task
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    params = e
+                submit()
+                yield file_, params
+        finally:
+            for _, task in window:
+                task.cancel()
+
+    async def parameter_list_many(
+        self, files, name=None, encoded=None, value=None, workers=None
+    ):
+        """Get the parameters of many models, fetched concurrently.
+
+        See `parameter.list_many`.
+        """
+        return {
+            (file_, param["name"]): param
+            async for file_, params in self.parameter_iter_many(
+                files, name=name, encoded=encoded, value=value, workers=workers
+            )
+            for param in params
+        }
+
+    async def parameter_list_table(
+        self, files, name=None, encoded=None, value=None, workers=None
+    ):
+        """Get the parameters of many models as a table.
+
+        See `parameter.list_table`.
+        """
+        from .table import ParameterTable
+
+        return ParameterTable.from_many([
+            item
+            async for item in self.parameter_iter_many(
+                files, name=name, encoded=encoded, value=value, workers=workers
+            )
+        ])
+
+    def dimension_editor(self, regenerate=True, workers=None, tolerance=1e-9):
+        """Create an editor sending many dimension edits at once.
+
+        Apply the edits with `await editor.apply_async()`,
+        see `dimension.editor`.
+        """
+        from .editor import DimensionEditor
+
+        return DimensionEditor(self, regenerate, workers, tolerance)
+
+    async def dimension_list_catalog(self, files, dim_type=None, views=False, workers=None):
+        """Get the dimension details of many models or drawings as a catalog.
+
+        See `dimension.list_catalog`.
+        """
+        from .catalog import DimensionCatalog
+
+        files = list(files)
+        drawings = [file_ for file_ in files if file_.lower().endswith(".drw")] if views else []
+        results = await gather(
+            *(self.dimension_list_detail(file_=file_, dim_type=dim_type) for file_ in files),
+            *(self.drawing_list_view_details(drawing=file_) for file_ in drawings),
+            limit=workers or self.pool_size,
+        )
+        return DimensionCatalog.from_many(
+            zip(files, results), views=dict(zip(drawings, results[len(files):]))
+        )
+
+    async def feature_index(
+        self, file_=None, groups=(), patterns=(), inc_unnamed=False
+    ):
+        """Get the features of a model, indexed for queries without requests.
+
+        Send changes with `await index.suppress_async()` (`resume_async`,
+        `delete_async`, `rename_async`), see `feature.index`.
+        """
+        from .featuretree import FeatureIndex
+
+        features = FeatureIndex(self, file_, groups, patterns, inc_unnamed)
+        await features.update_async()
+        return features
+
+    async def parameter_sync(self, desired, dry_run=False, workers=None):
+        """Bring the parameters of many models to a desired state.
+
+        See `parameter.sync`.
+        """
+        from .sync import desired_names, prepare
+
+        files, names = desired_names(desired)
+        report = prepare(
+            desired,
+            [
+                item
+                async for item in self.parameter_iter_many(
+                    files, name=names, workers=workers, return_exceptions=True
+                )
+            ],
+            dry_run,
+        )
+        if dry_run or not report.changes:
+            return report
+        results = await gather(
+            *(change.send(self) for change in report.changes),
+            limit=workers or self.pool_size,
+            return_exceptions=True,
+        )
+        report.record([
+            result if isinstance(result, Exception) else None for result in results
+        ])
+        return report
+
+
+async def gather(*aws, limit=None, return_exceptions=False):
+    """Run awaitables concurrently, at most `limit` at the same time.
+
+    Args:
+        aws (awaitable):
+            Coroutines to run (ie. `c.parameter_list(file_=name)`).
+        limit (int, optional):
+            Maximum number of awaitables running at the same time.
+            Defaults is no limit.
+        return_exceptions (bool, optional):
+            Whether exceptions are returned as results instead of being
+            raised, see `asyncio.gather`. Defaults is False.
+
+    Returns:
+        (list): results in the same order as `aws`.
+
+    """
+    if limit is None:
+        return await asyncio.gather(*aws, return_exceptions=return_exceptions)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def limited(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(
+        *(limited(aw) for aw in aws), return_exceptions=return_exceptions
+    )
+
+
+def _coroutine(func):
+    """Return a coroutine method running `func` with an AsyncClient."""
+
+    async def method(self, *args, **kwargs):
+        return await self._run(func, *args, **kwargs)
+
+    return functools.update_wrapper(method, func)
+
+
+# Client methods which send no CREOSON command
+_LOCAL_METHODS = frozenset({"batch", "add_hook", "remove_hook"})
+
+
+def _bind(client_class=Client):
+    """Add a coroutine to AsyncClient for each command of `client_class`."""
+    for name, attr in list(vars(client_class).items()):
+        if name.startswith("_") or name in _LOCAL_METHODS or name in vars(AsyncClient):
+            continue
+        if isinstance(attr, LazyCommand):
+            setattr(AsyncClient, name, LazyCommand(
+                AsyncClient, name, attr.module, attr.function, _coroutine
+            ))
+        elif inspect.isfunction(attr):
+            setattr(AsyncClient, name, _coroutine(attr))
+
+
+_bind()
@@ -0,0 +1,170 @@
+"""Batch module.
+
+Inside `Client.batch()`, commands are queued and return a
+`concurrent.futures.Future`; they are sent when the `with` block exits::
+
+    with c.batch():
+        futures = [
+            c.parameter_set(name, value, file_="box.prt")
+            for name, value in values.items()
+        ]
+        c.file_regenerate(file_="box.prt")
+    errors = [f.exception() for f in futures]
+
+CREOSON has no multi-command request, so the queue is flushed with
+concurrent requests on the pooled HTTP connections:
+
+* commands on different models (`file`) are sent concurrently;
+* on the same model, commands are sent in order, except a run of the same
+  command on different `name` (ie. setting many parameters) which is sent
+  concurrently;
+* a command without `file` is a barrier: it waits for the previous commands
+  and the next ones wait for it.
+"""
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import zip_longest
+
+lg = logging.getLogger(__name__)
+
+# Commands sent immediately inside a batch: their result is needed to build
+# the next requests (ie. the active model when `file_` is not set).
+IMMEDIATE = {
+    ("file", "get_active"),
+    ("windchill", "get_workspace"),
+}
+
+
+class _Call(object):
+    __slots__ = ("command", "function", "data", "key_data", "future")
+
+    def __init__(self, command, function, data, key_data):
+        self.command = command
+        self.function = function
+        self.data = data
+        self.key_data = key_data
+        self.future = Future()
+
+    def get(self, key):
+        if isinstance(self.data, dict):
+            return self.data.get(key)
+        return None
+
+
+class Batch(object):
+    """Queue of commands, sent by `flush()`."""
+
+    def __init__(self, client, ordered=False, workers=None):
+        """Create an empty batch.
+
+        Args:
+            client (obj):
+                creopyson Client.
+            ordered (bool, optional):
+                Whether every command is sent in order, one at a time.
+                Defaults is False.
+            workers (int, optional):
+                Maximum concurrent requests.
+                Defaults is the client's `pool_size`.
+
+        """
+        self.client = client
+        self.ordered = ordered
+        self.workers = workers or client.pool_size
+        self.calls = []
+
+    def __len__(self):
+        """Return the number of queued commands."""
+        return len(self.calls)
+
+    def is_immediate(self, command, function):
+        """Check whether a command is sent without being queued."""
+        return command == "connection" or (command, function) in IMMEDIATE
+
+    def add(self, command, function, data=None, key_data=None):
+        """Queue a command.
+
+        Returns:
+            (Future): result of the command, once flushed.
+
+        """
+        call = _Call(command, function, data, key_data)
+        self.calls.append(call)
+        return call.future
+
+    def _send(self, call):
+        if not call.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = self.client._send(
+                call.command, call.function, call.data, call.key_data
+            )
+        except Exception as e:
+            call.future.set_exception(e)
+        else:
+            call.future.set_result(result)
+
+    def _segments(self):
+        """Split calls at barriers, return lanes of calls (one per file)."""
+        lanes = {}
+        for call in self.calls:
+            file_ = call.get("file")
+            if self.ordered or not isinstance(file_, str):
+                if lanes:
+                    yield list(lanes.values())
+                    lanes = {}
+                yield [[call]]
+            else:
+                lanes.setdefault(file_.lower(), []).append(call)
+        if lanes:
+            yield list(lanes.values())
+
+    @staticmethod
+    def _waves(lane):
+        """Split a lane in groups of independent calls."""
+        waves = []
+        for call in lane:
+            name = call.get("name")
+            if isinstance(name, str) and waves:
+                calls, names = waves[-1]
+                if (
+                    names is not None
+                    and name not in names
+                    and calls[0].command == call.command
+                    and calls[0].function == call.function
+                ):
+                    calls.append(call)
+                    names.add(name)
+                    continue
+            waves.append(([call], {name} if isinstance(name, str) else None))
+        return [calls for calls, _ in waves]
+
+    def flush(self):
+        """Send the queued commands.
+
+        Errors are set on the futures, not raised.
+
+        Returns:
+            (int): number of commands sent.
+
+        """
+        count = len(self.calls)
+        if not count:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for lanes in self._segments():
+                for waves in zip_longest(*(self._waves(lane) for lane in lanes)):
+                    calls = [call for wave in waves if wave for call in wave]
+                    if len(calls) == 1:
+                        self._send(calls[0])
+                    else:
+                        list(executor.map(self._send, calls))
+        self.calls = []
+        lg.debug("batch: %s commands sent", count)
+        return count
+
+    def cancel(self):
+        """Cancel the queued commands."""
+        for call in self.calls:
+            call.future.cancel()
+        self.calls = []
@@ -1,5 +1,9 @@
 """Bom module."""
 
+from collections import deque
+
+from .bomtree import BomTree
+
 
 def get_paths(
     client,
@@ -76,3 +80,189 @@ def get_paths(
     if get_simpreps is not None:
         data["get_simpreps"] = get_simpreps
     return client._creoson_post("bom", "get_paths", data)
+
+
+def get_tree(
+    client,
+    file_=None,
+    paths=None,
+    skeletons=None,
+    top_level=None,
+    get_transforms=None,
+    exclude_inactive=None,
+    get_simpreps=None,
+):
+    """Get the hierarchy of components within an assembly, indexed.
+
+    Same arguments as `get_paths`.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        `file_` (string, optional):
+            file name, if not set, active model is used.
+        paths (boolean, optional):
+            Whether to return component paths for each component
+            (default" : False)
+        skeletons (boolean, optional):
+            Whether to include skeleton components
+            (default" : False)
+        top_level (boolean, optional):
+            Whether to return only the top-level components
+            in the assembly. (default" : False)
+        get_transforms (boolean, optional):
+            Whether to return the 3D transform matrix
+            for each component. (default" : False)
+        exclude_inactive (boolean, optional):
+            Whether to exclude components which do not
+            have an ACTIVE status. (default" : False)
+        get_simpreps (boolean, optionnal):
+            Whether to return the Simplified Rep data for each component.
+            (default" : False)
+
+    Returns:
+        (obj:BomTree): indexed tree, see `bomtree` module.
+
+    """
+    result = get_paths(
+        client,
+        file_=file_,
+        paths=paths,
+        skeletons=skeletons,
+        top_level=top_level,
+        get_transforms=get_transforms,
+        exclude_inactive=exclude_inactive,
+        get_simpreps=get_simpreps,
+    )
+    return BomTree(result)
+
+
+def _component(parent, node):
+    """Return a `get_paths` node seen from the top-level assembly."""
+    item = {
+        key: value for key, value in node.items() if key not in ("children", "seq_path")
+    }
+    item["seq_path"] = parent["seq_path"] + node["seq_path"][4:]
+    item["depth"] = parent["depth"] + 1
+    if "path" in node:
+        item["path"] = parent.get("path", []) + node["path"]
+    return item
+
+
+def iter_paths(
+    client,
+    file_=None,
+    paths=None,
+    skeletons=None,
+    get_transforms=None,
+    exclude_inactive=None,
+    breadth_first=False,
+    workers=None,
+    expand=None,
+):
+    """Iterate over the components of an assembly, fetched level by level.
+
+    Each assembly is fetched with `top_level=True` when the traversal reaches
+    it, so the whole tree is never held in memory and the iteration can stop
+    early. An assembly used many times is fetched once. Assemblies are
+    recognized by their `.asm` extension.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        `file_` (string, optional):
+            file name, if not set, active model is used.
+        paths (boolean, optional):
+            Whether to return component paths for each component
+            (default" : False)
+        skeletons (boolean, optional):
+            Whether to include skeleton components
+            (default" : False)
+        get_transforms (boolean, optional):
+            Whether to return the 3D transform matrix
+            for each component, relative to its parent assembly, see
+            `bomtree.compose`. (default" : False)
+        exclude_inactive (boolean, optional):
+            Whether to exclude components which do not
+            have an ACTIVE status. (default" : False)
+        breadth_first (boolean, optional):
+            Whether to yield a whole level before the next one.
+            Defaults is depth-first, in the `bom_get_paths` order.
+        workers (int, optional):
+            Number of sub-assemblies fetched ahead concurrently.
+            Defaults is one at a time, when reached.
+        expand (callable, optional):
+            `expand(component)` returns whether to fetch the components of
+            an assembly. Defaults is every assembly.
+
+    Yields:
+        (dict): component, the top-level assembly first:
+            file (str), seq_path (str, ie. `root.3.2`), depth (int),
+            path (list:int) and transform (dict) if requested.
+
+    """
+    if file_ is None:
+        active_file = client.file_get_active()
+        if active_file:
+            file_ = active_file["file"]
+    options = {
+        "paths": paths,
+        "skeletons": skeletons,
+        "get_transforms": get_transforms,
+        "exclude_inactive": exclude_inactive,
+    }
+
+    def fetch(name):
+        result = get_paths(client, file_=name, top_level=True, **options)
+        return result["children"]
+
+    def is_expanded(item):
+        return item["file"].lower().endswith(".asm") and (expand is None or expand(item))
+
+    cache = {}
+    pending = {}
+    executor = None
+    if workers and workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    def children(name):
+        key = name.lower()
+        nodes = cache.get(key)
+        if nodes is None:
+            future = pending.pop(key, None)
+            root = future.result() if future is not None else fetch(name)
+            nodes = cache[key] = root.get("children") or []
+        return nodes
+
+    def prefetch(frontier):
+        count = min(len(frontier), workers * 2)
+        for position in range(count):
+            item = frontier[position] if breadth_first else frontier[-1 - position]
+            key = item["file"].lower()
+            if key not in cache and key not in pending and is_expanded(item):
+                pending[key] = executor.submit(fetch, item["file"])
+
+    try:
+        root = fetch(file_)
+        top = {key: value for key, value in root.items() if key != "children"}
+        top["depth"] = 0
+        cache[root["file"].lower()] = root.get("children") or []
+        frontier = deque([top])
+        while frontier:
+            item = frontier.popleft() if breadth_first else frontier.pop()
+            yield item
+            if item["depth"] == 0 or is_expanded(item):
+                nodes = [_component(item, node) for node in children(item["file"])]
+                if breadth_first:
+                    frontier.extend(nodes)
+                else:
+                    frontier.extend(reversed(nodes))
+            if executor is not None:
+                prefetch(frontier)
+    finally:
+        if executor is not None:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,238 @@
+"""BOM diff module.
+
+Compare two states of an assembly::
+
+    tree = c.bom_get_tree(file_="top.asm", paths=True, get_transforms=True)
+    snapshot = BomSnapshot(tree)
+    if Path("top.bom.gz").exists():
+        changes = diff(BomSnapshot.load("top.bom.gz"), snapshot)
+        for change in changes:
+            print(change.kind, change.seq_path, change.file)
+    snapshot.save("top.bom.gz")
+
+Components are matched by component path when the BOM was fetched with
+`paths=True` (ids do not change when components are inserted before), else
+by seq_path. Transforms are kept as tuples and only compared with a tolerance
+when they differ, so the diff is one dict lookup per component.
+"""
+import gzip
+import hashlib
+
+from .codec import get_codec
+
+FORMAT_VERSION = 1
+
+
+class Change(object):
+    """A component change between two snapshots.
+
+    Attributes:
+        kind (str): `added`, `removed`, `replaced` or `moved`.
+        key (tuple|str): component path, or seq_path.
+        seq_path (str): seq_path in the new snapshot (old one if removed).
+        file (str): file name in the new snapshot (old one if removed).
+        old_file (str): file name in the old snapshot, None if added.
+        translation (tuple:float):
+            (dx, dy, dz) origin change if moved, else None.
+        rotated (bool): whether the orientation changed if moved.
+
+    """
+
+    __slots__ = (
+        "kind", "key", "seq_path", "file", "old_file", "translation", "rotated"
+    )
+
+    def __init__(
+        self, kind, key, seq_path, file_, old_file=None, translation=None, rotated=False
+    ):
+        """Create a change."""
+        self.kind = kind
+        self.key = key
+        self.seq_path = seq_path
+        self.file = file_
+        self.old_file = old_file
+        self.translation = translation
+        self.rotated = rotated
+
+    def __repr__(self):
+        """Return the kind, seq_path and file."""
+        return "<Change {} {} {}>".format(self.kind, self.seq_path, self.file)
+
+
+class BomSnapshot(object):
+    """Compact state of an assembly: file and transform of each component."""
+
+    def __init__(self, tree=None):
+        """Create a snapshot of a BOM.
+
+        Args:
+            tree (obj:BomTree, optional):
+                BOM to snapshot, see `bom_get_tree`. Defaults is empty.
+
+        """
+        self.file = None
+        self.key_type = "seq_path"
+        # {key: (seq_path, file, transform tuple or None)}
+        self.entries = {}
+        if tree is not None:
+            self._read(tree)
+
+    def _read(self, tree):
+        self.file = tree.file
+        keys = tree.seq_paths
+        if tree.paths is not None:
+            self.key_type = "path"
+            keys = tree.paths
+        transforms = tree.transforms
+        entries = self.entries
+        for index, (key, seq_path, file_) in enumerate(
+            zip(keys, tree.seq_paths, tree.files)
+        ):
+            transform = None
+            if transforms is not None:
+                transform = tuple(transforms[index * 12:index * 12 + 12])
+            entries[key] = (seq_path, file_, transform)
+
+    def __len__(self):
+        """Return the number of components, the assembly included."""
+        return len(self.entries)
+
+    def __eq__(self, other):
+        """Check whether both snapshots have the same components."""
+        return isinstance(other, BomSnapshot) and self.entries == other.entries
+
+    @property
+    def digest(self):
+        """str: hash of the components, equal for equal snapshots."""
+        sha = hashlib.sha1()
+        for key, entry in self.entries.items():
+            sha.update(repr((key, entry)).encode("utf-8"))
+        return sha.hexdigest()
+
+    def save(self, path):
+        """Save the snapshot as gzipped JSON.
+
+        Args:
+            path (str|Path): destination file.
+
+        """
+        document = {
+            "version": FORMAT_VERSION,
+            "file": self.file,
+            "key_type": self.key_type,
+            "nodes": [
+                [key, seq_path, file_, transform]
+                for key, (seq_path, file_, transform) in self.entries.items()
+            ],
+        }
+        with gzip.open(path, "wb", compresslevel=5) as stream:
+            stream.write(get_codec().dumps(document))
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot saved by `save`.
+
+        Args:
+            path (str|Path): snapshot file.
+
+        Raises:
+            ValueError: unknown snapshot format.
+
+        Returns:
+            (obj:BomSnapshot): the snapshot.
+
+        """
+        with gzip.open(path, "rb") as stream:
+            document = get_codec().loads(stream.read())
+        if document.get("version") != FORMAT_VERSION:
+            raise ValueError("Unknown BOM snapshot version in {}".format(path))
+        snapshot = cls()
+        snapshot.file = document["file"]
+        snapshot.key_type = document["key_type"]
+        for key, seq_path, file_, transform in document["nodes"]:
+            if isinstance(key, list):
+                key = tuple(key)
+            snapshot.entries[key] = (
+                seq_path,
+                file_,
+                tuple(transform) if transform is not None else None,
+            )
+        return snapshot
+
+
+class BomDiff(object):
+    """Changes between two snapshots, see `diff`."""
+
+    def __init__(self):
+        """Create an empty diff."""
+        self.added = []
+        self.removed = []
+        self.replaced = []
+        self.moved = []
+
+    def __iter__(self):
+        """Iterate over every change: added, removed, replaced, moved."""
+        for changes in (self.added, self.removed, self.replaced, self.moved):
+            yield from changes
+
+    def __len__(self):
+        """Return the number of changes."""
+        return len(self.added) + len(self.removed) + len(self.replaced) + len(self.moved)
+
+    def __bool__(self):
+        """Check whether there are changes."""
+        return len(self) > 0
+
+    def __repr__(self):
+        """Return the number of changes of each kind."""
+        return "<BomDiff +{} -{} ~{} >{}>".format(
+            len(self.added), len(self.removed), len(self.replaced), len(self.moved)
+        )
+
+
+def diff(old, new, tolerance=1e-6):
+    """Compare two snapshots of an assembly.
+
+    Args:
+        old (obj:BomSnapshot): previous state.
+        new (obj:BomSnapshot): current state.
+        tolerance (float, optional):
+            Transform values closer than this are equal. Defaults to 1e-6.
+
+    Raises:
+        ValueError: snapshots keyed differently (`paths=True` in one only).
+
+    Returns:
+        (obj:BomDiff): changes; a component is `replaced` when its file
+            changed, `moved` when its transform changed.
+
+    """
+    if old.entries and new.entries and old.key_type != new.key_type:
+        raise ValueError("Cannot compare a snapshot with paths to one without.")
+    changes = BomDiff()
+    old_entries = old.entries
+    for key, (seq_path, file_, transform) in new.entries.items():
+        previous = old_entries.get(key)
+        if previous is None:
+            changes.added.append(Change("added", key, seq_path, file_))
+            continue
+        old_file, old_transform = previous[1], previous[2]
+        if old_file.lower() != file_.lower():
+            changes.replaced.append(Change("replaced", key, seq_path, file_, old_file))
+        elif transform != old_transform and transform and old_transform:
+            deltas = [after - before for after, before in zip(transform, old_transform)]
+            if max(abs(delta) for delta in deltas) > tolerance:
+                changes.moved.append(Change(
+                    "moved",
+                    key,
+                    seq_path,
+                    file_,
+                    old_file,
+                    translation=tuple(deltas[:3]),
+                    rotated=max(abs(delta) for delta in deltas[3:]) > tolerance,
+                ))
+    new_entries = new.entries
+    for key, (seq_path, file_, _) in old_entries.items():
+        if key not in new_entries:
+            changes.removed.append(Change("removed", key, seq_path, file_, file_))
+    return changes
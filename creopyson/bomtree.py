@@ -0,0 +1,538 @@
+"""BOM tree module.
+
+`BomTree` indexes the result of `bom_get_paths`::
+
+    tree = c.bom_get_tree(file_="top.asm", paths=True)
+    tree["root.3.2"].file
+    tree.where_used("bolt.prt")
+    tree.quantities()
+
+Nodes are stored in flat arrays, in depth-first order: a node is an index and
+its subtree is the range `index + 1 .. ends[index]`. `BomNode` is a light view
+on one index. The nested dicts of the CREOSON result are not kept.
+
+With `numpy` installed, the transforms of `bom_get_tree(get_transforms=True)`
+are available as one (N, 4, 4) array, in the node order. CREOSON returns them
+relative to the top-level assembly::
+
+    tree = c.bom_get_tree(file_="top.asm", get_transforms=True)
+    origins = tree.transform_array()[:, :3, 3]
+    in_parent = tree.local_transforms()
+
+`compose` does the opposite, for transforms relative to their parent (ie.
+collected from `bom_iter_paths`, which fetches each assembly on its own).
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+_AXES = ("origin", "x_axis", "y_axis", "z_axis")
+_IDENTITY = (0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+_NODE_KEYS = {"file", "seq_path", "path", "transform", "children"}
+
+
+class BomNode(object):
+    """View on a component of a `BomTree`."""
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        """Create a view on the node `index` of `tree`."""
+        self.tree = tree
+        self.index = index
+
+    def __repr__(self):
+        """Return the seq_path and the file."""
+        return "<BomNode {} {}>".format(self.seq_path, self.file)
+
+    def __eq__(self, other):
+        """Check whether both views are on the same node."""
+        return (
+            isinstance(other, BomNode)
+            and other.tree is self.tree
+            and other.index == self.index
+        )
+
+    def __hash__(self):
+        """Hash of the node index."""
+        return hash((id(self.tree), self.index))
+
+    @property
+    def file(self):
+        """str: file name."""
+        return self.tree.files[self.index]
+
+    @property
+    def seq_path(self):
+        """str: sequence path, ie. `root.3.2`."""
+        return self.tree.seq_paths[self.index]
+
+    @property
+    def path(self):
+        """tuple:int: component path (ids), None if not requested."""
+        if self.tree.paths is None:
+            return None
+        return self.tree.paths[self.index]
+
+    @property
+    def depth(self):
+        """int: level in the tree, 0 for the top-level assembly."""
+        return self.tree.depths[self.index]
+
+    @property
+    def parent(self):
+        """BomNode: parent assembly, None for the top-level assembly."""
+        parent = self.tree.parents[self.index]
+        return None if parent < 0 else BomNode(self.tree, parent)
+
+    @property
+    def children(self):
+        """list:BomNode: direct components."""
+        return [BomNode(self.tree, index) for index in self.tree.children(self.index)]
+
+    @property
+    def is_assembly(self):
+        """bool: whether the node has components."""
+        return self.tree.ends[self.index] > self.index + 1
+
+    @property
+    def transform(self):
+        """dict: JLTransform of the component, None if not requested."""
+        return self.tree.transform(self.index)
+
+    @property
+    def data(self):
+        """dict: other keys of the CREOSON node (ie. `simpreps`)."""
+        return self.tree.extra.get(self.index, {})
+
+    def descendants(self):
+        """Return the components below this node, depth-first."""
+        return [
+            BomNode(self.tree, index)
+            for index in range(self.index + 1, self.tree.ends[self.index])
+        ]
+
+    def ancestors(self):
+        """Return the assemblies above this node, parent first."""
+        nodes = []
+        parent = self.tree.parents[self.index]
+        while parent >= 0:
+            nodes.append(BomNode(self.tree, parent))
+            parent = self.tree.parents[parent]
+        return nodes
+
+
+class BomTree(object):
+    """Indexed BOM of an assembly.
+
+    Attributes:
+        file (str): Assembly file name.
+        generic (str): Generic name of the assembly.
+        has_simprep (bool): Whether the assembly has a Simplified Rep.
+        files (list:str): File name of each node.
+        seq_paths (list:str): Sequence path of each node.
+        paths (list:tuple): Component path of each node, None if not requested.
+        parents (array:int): Parent index of each node, -1 for the root.
+        depths (array:int): Level of each node, 0 for the root.
+        ends (array:int): End (excluded) of the subtree of each node.
+        transforms (array:float):
+            12 floats per node (origin, x_axis, y_axis, z_axis), relative
+            to the top-level assembly, None if not requested.
+        extra (dict): Other keys of the CREOSON nodes, by node index.
+
+    """
+
+    def __init__(self, result):
+        """Build the tree from a `bom_get_paths` result.
+
+        Args:
+            result (dict): `bom_get_paths` result.
+
+        """
+        self.file = result.get("file")
+        self.generic = result.get("generic")
+        self.has_simprep = result.get("has_simprep", False)
+        self.files = []
+        self.seq_paths = []
+        self.paths = None
+        self.parents = array("i")
+        self.depths = array("i")
+        self.transforms = None
+        self.extra = {}
+        root = result.get("children")
+        if root:
+            self._build(root)
+        self.ends = self._compute_ends(self.parents)
+        self._by_seq_path = {seq: index for index, seq in enumerate(self.seq_paths)}
+        # lower file name: index, or list of indexes if many occurrences.
+        by_file = self._by_file = {}
+        for index, name in enumerate(self.files):
+            key = name.lower()
+            found = by_file.setdefault(key, index)
+            if found != index:
+                if isinstance(found, int):
+                    by_file[key] = [found, index]
+                else:
+                    found.append(index)
+        self._by_path = None
+        if self.paths is not None:
+            self._by_path = {
+                path: index for index, path in enumerate(self.paths) if path is not None
+            }
+
+    def _build(self, root):
+        intern = sys.intern
+        has_paths = False
+        has_transforms = False
+        paths = []
+        transforms = array("d")
+        stack = [(root, -1, 0)]
+        while stack:
+            node, parent, depth = stack.pop()
+            index = len(self.files)
+            self.files.append(intern(node.get("file", "")))
+            self.seq_paths.append(node.get("seq_path", ""))
+            self.parents.append(parent)
+            self.depths.append(depth)
+            path = node.get("path")
+            if path is not None:
+                has_paths = True
+                path = tuple(path)
+            paths.append(path)
+            transform = node.get("transform")
+            if transform is not None:
+                has_transforms = True
+                origin, x_axis, y_axis, z_axis = (
+                    transform["origin"],
+                    transform["x_axis"],
+                    transform["y_axis"],
+                    transform["z_axis"],
+                )
+                transforms.extend((
+                    origin["x"], origin["y"], origin["z"],
+                    x_axis["x"], x_axis["y"], x_axis["z"],
+                    y_axis["x"], y_axis["y"], y_axis["z"],
+                    z_axis["x"], z_axis["y"], z_axis["z"],
+                ))
+            else:
+                transforms.extend(_IDENTITY)
+            if not _NODE_KEYS.issuperset(node):
+                self.extra[index] = {
+                    key: value for key, value in node.items() if key not in _NODE_KEYS
+                }
+            children = node.get("children") or ()
+            for child in reversed(children):
+                stack.append((child, index, depth + 1))
+        if has_paths:
+            self.paths = paths
+        if has_transforms:
+            self.transforms = transforms
+
+    @staticmethod
+    def _compute_ends(parents):
+        ends = array("i", range(1, len(parents) + 1))
+        for index in range(len(parents) - 1, 0, -1):
+            parent = parents[index]
+            if ends[index] > ends[parent]:
+                ends[parent] = ends[index]
+        return ends
+
+    def __len__(self):
+        """Return the number of nodes, the top-level assembly included."""
+        return len(self.files)
+
+    def __iter__(self):
+        """Iterate over the nodes, depth-first."""
+        for index in range(len(self.files)):
+            yield BomNode(self, index)
+
+    def __getitem__(self, key):
+        """Return a node by index or seq_path.
+
+        Raises:
+            KeyError: unknown seq_path.
+            IndexError: index out of range.
+
+        """
+        if isinstance(key, int):
+            if key < 0:
+                key += len(self.files)
+            if not 0 <= key < len(self.files):
+                raise IndexError(key)
+            return BomNode(self, key)
+        return BomNode(self, self._by_seq_path[key])
+
+    def __contains__(self, seq_path):
+        """Check whether a seq_path is in the tree."""
+        return seq_path in self._by_seq_path
+
+    def __repr__(self):
+        """Return the assembly name and the size."""
+        return "<BomTree {} ({} nodes)>".format(self.file, len(self))
+
+    @property
+    def root(self):
+        """BomNode: the top-level assembly."""
+        return BomNode(self, 0)
+
+    def children(self, index):
+        """Return the indexes of the direct components of a node."""
+        child = index + 1
+        end = self.ends[index]
+        while child < end:
+            yield child
+            child = self.ends[child]
+
+    def get(self, seq_path, default=None):
+        """Return the node of a seq_path, `default` if not found."""
+        index = self._by_seq_path.get(seq_path)
+        return default if index is None else BomNode(self, index)
+
+    def by_path(self, path):
+        """Return the node of a component path.
+
+        Args:
+            path (list:int): component ids, see `bom_get_paths(paths=True)`.
+
+        Raises:
+            ValueError: the paths were not requested.
+            KeyError: unknown path.
+
+        Returns:
+            (obj:BomNode): the node.
+
+        """
+        if self._by_path is None:
+            raise ValueError("Component paths were not requested (`paths=True`).")
+        return BomNode(self, self._by_path[tuple(path)])
+
+    def _occurrences(self, file_):
+        found = self._by_file.get(file_.lower(), ())
+        return (found,) if isinstance(found, int) else found
+
+    def find(self, file_):
+        """Return every occurrence of a file.
+
+        Args:
+            `file_` (str): file name, case insensitive.
+
+        Returns:
+            (list:BomNode): occurrences, depth-first.
+
+        """
+        return [BomNode(self, index) for index in self._occurrences(file_)]
+
+    def where_used(self, file_):
+        """Return the assemblies which have a file as direct component.
+
+        Args:
+            `file_` (str): file name, case insensitive.
+
+        Returns:
+            (dict): {assembly file name: number of occurrences in it}.
+
+        """
+        used = {}
+        for index in self._occurrences(file_):
+            parent = self.parents[index]
+            if parent >= 0:
+                name = self.files[parent]
+                used[name] = used.get(name, 0) + 1
+        return used
+
+    def quantity(self, file_, under=None):
+        """Count the occurrences of a file.
+
+        Args:
+            `file_` (str): file name, case insensitive.
+            under (str|obj:BomNode, optional):
+                Only count below this node (seq_path or node).
+                Defaults is the whole tree.
+
+        Returns:
+            (int): number of occurrences.
+
+        """
+        indexes = self._occurrences(file_)
+        if under is None:
+            return len([index for index in indexes if index > 0])
+        if not isinstance(under, BomNode):
+            under = self[under]
+        start, end = under.index + 1, self.ends[under.index]
+        return bisect_left(indexes, end) - bisect_right(indexes, start - 1)
+
+    def quantities(self, under=None):
+        """Count the occurrences of each file.
+
+        Args:
+            under (str|obj:BomNode, optional):
+                Only count below this node (seq_path or node).
+                Defaults is the whole tree.
+
+        Returns:
+            (dict): {file name: number of occurrences}.
+
+        """
+        if under is None:
+            start, end = 1, len(self.files)
+        else:
+            if not isinstance(under, BomNode):
+                under = self[under]
+            start, end = under.index + 1, self.ends[under.index]
+        counts = {}
+        files = self.files
+        for index in range(start, end):
+            name = files[index]
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    def transform(self, index):
+        """Return the JLTransform of a node, None if not requested."""
+        if self.transforms is None:
+            return None
+        values = self.transforms[index * 12:index * 12 + 12]
+        return {
+            axis: {"x": values[i * 3], "y": values[i * 3 + 1], "z": values[i * 3 + 2]}
+            for i, axis in enumerate(_AXES)
+        }
+
+    def transform_array(self):
+        """Return the transforms as 4x4 matrices, in the node order.
+
+        Columns are x_axis, y_axis, z_axis and origin. The transforms are
+        relative to the top-level assembly. Requires `numpy`.
+
+        Raises:
+            ValueError: the transforms were not requested.
+
+        Returns:
+            (numpy.ndarray): (N, 4, 4) float array.
+
+        """
+        if self.transforms is None:
+            raise ValueError("Transforms were not requested (`get_transforms=True`).")
+        return to_matrices(self.transforms)
+
+    def local_transforms(self):
+        """Return the transforms relative to the parent of each node.
+
+        The top-level assembly keeps its own. Requires `numpy`.
+
+        Returns:
+            (numpy.ndarray): (N, 4, 4) float array.
+
+        """
+        return decompose(self.transform_array(), self.parents)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("numpy is required for transform arrays: pip install numpy")
+    return numpy
+
+
+def to_matrices(transforms):
+    """Return 4x4 matrices of JLTransform values.
+
+    Args:
+        transforms (array|buffer):
+            12 floats per transform: origin, x_axis, y_axis, z_axis.
+
+    Returns:
+        (numpy.ndarray): (N, 4, 4) float array.
+
+    """
+    np = _numpy()
+    values = np.frombuffer(transforms, dtype=np.float64).reshape(-1, 4, 3)
+    matrices = np.zeros((len(values), 4, 4))
+    matrices[:, :3, :3] = values[:, 1:, :].transpose(0, 2, 1)
+    matrices[:, :3, 3] = values[:, 0, :]
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def compose(local, parents, depths):
+    """Compose transforms along the component paths.
+
+    Only for transforms relative to their parent: `bom_get_paths` returns
+    them relative to the top-level assembly already.
+
+    The matrices of one level are multiplied by the ones of their parents
+    at once: one matrix product per level of the tree.
+
+    Args:
+        local (numpy.ndarray):
+            (N, 4, 4) transforms, each relative to its parent.
+        parents (sequence:int):
+            Parent index of each node, -1 for the roots; a parent must have
+            a lower depth than its children.
+        depths (sequence:int):
+            Level of each node, 0 for the roots.
+
+    Returns:
+        (numpy.ndarray): (N, 4, 4) transforms relative to the roots.
+
+    """
+    np = _numpy()
+    parents = np.asarray(parents, dtype=np.intp)
+    depths = np.asarray(depths, dtype=np.intp)
+    world = np.array(local, dtype=np.float64, copy=True)
+    if not len(depths):
+        return world
+    order = np.argsort(depths, kind="stable")
+    bounds = np.searchsorted(depths[order], np.arange(1, depths.max() + 1))
+    for start, end in zip(bounds, list(bounds[1:]) + [len(order)]):
+        level = order[start:end]
+        world[level] = world[parents[level]] @ local[level]
+    return world
+
+
+def decompose(world, parents):
+    """Return transforms relative to their parent, the inverse of `compose`.
+
+    Args:
+        world (numpy.ndarray):
+            (N, 4, 4) rigid transforms, relative to the roots.
+        parents (sequence:int):
+            Parent index of each node, -1 for the roots.
+
+    Returns:
+        (numpy.ndarray): (N, 4, 4) transforms relative to the parents.
+
+    """
+    np = _numpy()
+    parents = np.asarray(parents, dtype=np.intp)
+    world = np.asarray(world, dtype=np.float64)
+    local = world.copy()
+    children = np.flatnonzero(parents >= 0)
+    above = world[parents[children]]
+    # inverse of a rigid transform: transposed rotation, rotated origin
+    rotation = above[:, :3, :3].transpose(0, 2, 1)
+    inverse = np.zeros_like(above)
+    inverse[:, :3, :3] = rotation
+    inverse[:, :3, 3] = -np.einsum("nij,nj->ni", rotation, above[:, :3, 3])
+    inverse[:, 3, 3] = 1.0
+    local[children] = inverse @ world[children]
+    return local
+
+
+def to_transform(matrix):
+    """Return the JLTransform of a 4x4 matrix.
+
+    Args:
+        matrix (numpy.ndarray|list): 4x4 matrix.
+
+    Returns:
+        (dict): JLTransform.
+
+    """
+    return {
+        axis: {
+            "x": float(matrix[0][column]),
+            "y": float(matrix[1][column]),
+            "z": float(matrix[2][column]),
+        }
+        for axis, column in zip(_AXES, (3, 0, 1, 2))
+    }
@@ -0,0 +1,431 @@
+"""Cache module.
+
+Opt-in cache of read-only results, kept until a command changes the model::
+
+    c = creopyson.Client(cache=True)
+    c.file_get_length_units(file_="box.prt")  # sent to CREOSON
+    c.file_get_length_units(file_="box.prt")  # from the cache
+    c.file_set_length_units("mm", file_="box.prt")  # evicts box.prt units
+    c.cache.stats()
+
+Results of the commands of `CACHEABLE` are cached by (command, function,
+data). A command changing a model evicts the entries of that model listed in
+`INVALIDATES`; a command missing from the tables evicts every entry of the
+models in its data, or the whole cache if it has no model. Commands of
+`NEUTRAL` and other read-only commands (see `resilience.is_read_only`) evict
+nothing.
+
+Rules are per model: the results of `AGGREGATES` (mass properties, BOM...)
+depend on other models, so they are evicted for every model at once.
+Changes made outside of creopyson (ie. by the user in Creo) are not seen:
+call `clear()`, or set a `ttl`.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .codec import get_codec
+from .resilience import is_read_only
+
+# Read-only commands which results are cached.
+CACHEABLE = {
+    ("bom", "get_paths"),
+    ("dimension", "list"),
+    ("dimension", "list_detail"),
+    ("drawing", "get_cur_model"),
+    ("drawing", "get_cur_sheet"),
+    ("drawing", "get_num_sheets"),
+    ("drawing", "get_sheet_format"),
+    ("drawing", "get_sheet_scale"),
+    ("drawing", "get_sheet_size"),
+    ("drawing", "get_view_loc"),
+    ("drawing", "get_view_scale"),
+    ("drawing", "get_view_sheet"),
+    ("drawing", "list_models"),
+    ("drawing", "list_symbols"),
+    ("drawing", "list_view_details"),
+    ("drawing", "list_views"),
+    ("familytable", "exists"),
+    ("familytable", "get_cell"),
+    ("familytable", "get_header"),
+    ("familytable", "get_parents"),
+    ("familytable", "get_row"),
+    ("familytable", "list"),
+    ("familytable", "list_tree"),
+    ("feature", "list"),
+    ("feature", "list_group_features"),
+    ("feature", "list_params"),
+    ("feature", "list_pattern_features"),
+    ("feature", "param_exists"),
+    ("file", "get_accuracy"),
+    ("file", "get_cur_material"),
+    ("file", "get_length_units"),
+    ("file", "get_mass_units"),
+    ("file", "get_transform"),
+    ("file", "has_instances"),
+    ("file", "list_instances"),
+    ("file", "list_materials"),
+    ("file", "list_simp_reps"),
+    ("file", "massprops"),
+    ("file", "postregen_relations_get"),
+    ("file", "relations_get"),
+    ("geometry", "bound_box"),
+    ("geometry", "get_edges"),
+    ("geometry", "get_surfaces"),
+    ("layer", "exists"),
+    ("layer", "list"),
+    ("note", "exists"),
+    ("note", "get"),
+    ("note", "list"),
+    ("parameter", "exists"),
+    ("parameter", "list"),
+    ("view", "list"),
+    ("view", "list_exploded"),
+}
+
+# Cached results depending on other models than the one of the request.
+AGGREGATES = {
+    ("bom", "get_paths"),
+    ("file", "get_transform"),
+    ("file", "massprops"),
+    ("geometry", "bound_box"),
+}
+
+# Commands changing nothing cached.
+NEUTRAL = {
+    ("creo", "cd"),
+    ("creo", "delete_files"),
+    ("creo", "mkdir"),
+    ("creo", "rmdir"),
+    ("creo", "set_creo_version"),
+    ("dimension", "show"),
+    ("dimension", "user_select"),
+    ("feature", "user_select_csys"),
+    ("file", "backup"),
+    ("file", "close_window"),
+    ("file", "display"),
+    ("file", "repaint"),
+    ("file", "save"),
+    ("interface", "export_file"),
+    ("interface", "export_image"),
+    ("interface", "export_pdf"),
+    ("interface", "export_program"),
+    ("interface", "plot"),
+    ("view", "activate"),
+}
+
+_MATERIAL = (
+    ("file", "get_cur_material"),
+    ("file", "list_materials"),
+    ("file", "massprops"),
+    "parameter",
+)
+_FAMILY_TABLE = ("familytable", ("file", "has_instances"), ("file", "list_instances"))
+
+# {mutating command: entries evicted on its models}, an entry being a command
+# (all its functions) or a (command, function).
+INVALIDATES = {
+    ("dimension", "copy"): ("dimension",),
+    ("dimension", "set"): ("dimension", "geometry", ("file", "massprops")),
+    ("dimension", "set_text"): ("dimension",),
+    ("familytable", "add_inst"): _FAMILY_TABLE,
+    ("familytable", "create_inst"): _FAMILY_TABLE,
+    ("familytable", "delete"): _FAMILY_TABLE,
+    ("familytable", "delete_inst"): _FAMILY_TABLE,
+    ("familytable", "replace"): _FAMILY_TABLE,
+    ("familytable", "set_cell"): _FAMILY_TABLE,
+    ("feature", "delete_param"): (("feature", "list_params"), ("feature", "param_exists")),
+    ("feature", "set_param"): (("feature", "list_params"), ("feature", "param_exists")),
+    ("file", "delete_material"): _MATERIAL,
+    ("file", "load_material_file"): _MATERIAL,
+    ("file", "postregen_relations_set"): (("file", "postregen_relations_get"),),
+    ("file", "relations_set"): (("file", "relations_get"), "parameter", "dimension"),
+    ("file", "set_cur_material"): _MATERIAL,
+    ("file", "set_mass_units"): (("file", "get_mass_units"), ("file", "massprops")),
+    ("layer", "delete"): ("layer",),
+    ("layer", "show"): ("layer",),
+    ("note", "copy"): ("note",),
+    ("note", "delete"): ("note",),
+    ("note", "set"): ("note",),
+    ("parameter", "copy"): ("parameter",),
+    ("parameter", "delete"): ("parameter",),
+    ("parameter", "set"): ("parameter",),
+    ("parameter", "set_designated"): ("parameter",),
+    ("view", "save"): ("view",),
+}
+
+# Data keys holding the model names of a request.
+FILE_KEYS = ("file", "to_file", "drawing", "model", "files")
+
+
+def freeze(value):
+    """Return a hashable copy of JSON data."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def _model(name):
+    """Return the cache group of a model name: None if active or pattern."""
+    if not isinstance(name, str) or "*" in name or "?" in name:
+        return None
+    return name.lower()
+
+
+def request_files(data):
+    """Return the model names of a request.
+
+    Args:
+        data (dict): data params of the request.
+
+    Returns:
+        (list:str): lower case names, None for a name pattern.
+            Empty if the request has no model (ie. active model).
+
+    """
+    files = []
+    if isinstance(data, dict):
+        for key in FILE_KEYS:
+            value = data.get(key)
+            if isinstance(value, list):
+                files.extend(_model(name) for name in value)
+            elif value is not None:
+                files.append(_model(value))
+    return files
+
+
+class ResultCache(object):
+    """LRU cache of read-only results, with invalidation rules per model.
+
+    See `cache` module.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, codec=None):
+        """Create an empty cache.
+
+        Args:
+            maxsize (int, optional):
+                Maximum number of results, the least recently used ones are
+                evicted. Defaults to 1024.
+            ttl (float, optional):
+                Seconds a result is kept. Defaults is no limit.
+            codec (str|obj:Codec, optional):
+                JSON codec storing the results, so that callers get copies
+                they can change. Defaults is the fastest installed one.
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.codec = get_codec(codec)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        # {key: (encoded result, expiry time or None)}
+        self._entries = OrderedDict()
+        # {model or None: {key}}
+        self._by_file = {}
+        # keys of the results of `AGGREGATES`
+        self._aggregates = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached results."""
+        return len(self._entries)
+
+    def __repr__(self):
+        """Return the size and the hit rate."""
+        return "<ResultCache {}/{} results, {:.0%} hits>".format(
+            len(self), self.maxsize, self.hit_rate
+        )
+
+    @property
+    def hit_rate(self):
+        """float: ratio of cacheable requests found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Return the cache counters.
+
+        Returns:
+            (dict): size, hits, misses, hit_rate, evictions (size limit),
+                expirations (ttl) and invalidations (changed models).
+
+        """
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def key(self, command, function, data=None, key_data=None):
+        """Return the cache key of a request, None if it is not cacheable."""
+        if (command, function) not in CACHEABLE:
+            return None
+        files = request_files(data)
+        return (
+            files[0] if files else None,
+            command,
+            function,
+            freeze(data),
+            key_data,
+        )
+
+    def get(self, key):
+        """Return a cached result.
+
+        Returns:
+            (tuple): (True, result), or (False, None) if it is not cached.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, self.codec.loads(entry[0])
+
+    def put(self, key, result, generation=None):
+        """Cache a result.
+
+        Args:
+            key (tuple): see `key`.
+            result: result of the request.
+            generation (int, optional):
+                `generation` when the request was sent: the result is
+                dropped if a model changed since. Defaults is always cached.
+
+        """
+        encoded = self.codec.dumps(result)
+        expiry = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (encoded, expiry)
+            self._by_file.setdefault(key[0], set()).add(key)
+            if (key[1], key[2]) in AGGREGATES:
+                self._aggregates.add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        del self._entries[key]
+        self._aggregates.discard(key)
+        keys = self._by_file.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_file[key[0]]
+
+    def notify(self, command, function, data=None):
+        """Evict the results changed by a request, see `cache` module.
+
+        Call it before and after sending the request.
+        """
+        if (command, function) in CACHEABLE or (command, function) in NEUTRAL:
+            return
+        rule = INVALIDATES.get((command, function))
+        if rule is None and is_read_only(command, function):
+            return
+        files = request_files(data)
+        if not files or None in files:
+            self.clear()
+        else:
+            self.invalidate(files, rule)
+
+    def invalidate(self, files=None, entries=None):
+        """Evict cached results.
+
+        Args:
+            files (str|list:str, optional):
+                Model names. Defaults is every model.
+            entries (tuple, optional):
+                Commands or (command, function) to evict. Defaults is all.
+
+        """
+        if files is None:
+            if entries is None:
+                self.clear()
+                return
+            groups = None
+        else:
+            if isinstance(files, str):
+                files = [files]
+            # results of the active model and of patterns may be any model
+            groups = {_model(name) for name in files} | {None}
+        with self._lock:
+            self.generation += 1
+            if groups is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for group in groups for key in self._by_file.get(group, ())]
+            keys.extend(self._aggregates)
+            if entries is not None:
+                keys = [key for key in keys if _matches(key, entries)]
+            for key in set(keys):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        """Evict every cached result."""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_file.clear()
+            self._aggregates.clear()
+
+    def call(self, command, function, data, key_data, send):
+        """Return a cached result, or call `send` and cache its result.
+
+        Args:
+            command (str): Command param of the request.
+            function (str): Function param of the request.
+            data (dict): data params of the request.
+            key_data (str): param name waited in result.
+            send (callable): sends the request, returns its result.
+
+        Returns:
+            (depends request): creoson return.
+
+        """
+        key = self.key(command, function, data, key_data)
+        if key is None:
+            self.notify(command, function, data)
+            try:
+                return send()
+            finally:
+                self.notify(command, function, data)
+        found, result = self.get(key)
+        if found:
+            return result
+        generation = self.generation
+        result = send()
+        self.put(key, result, generation)
+        return result
+
+
+def _matches(key, entries):
+    """Check whether a cache key is one of the commands of `entries`."""
+    for entry in entries:
+        if entry == key[1] or entry == (key[1], key[2]):
+            return True
+    return False
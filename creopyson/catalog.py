@@ -0,0 +1,446 @@
+"""Catalog module.
+
+Dimension details of many models or drawings, stored by columns::
+
+    catalog = c.dimension_list_catalog(drawings, views=True)
+    loose = catalog.where(dim_type="linear", tolerance=(0.2, None))
+    section = catalog.where(sheet=2, view="SECTION_*")
+    table = section.join_views()
+    df = table.to_pandas()
+
+`dimension_list_detail` returns a dict per dimension, with a location dict
+and optional tolerances. The catalog reads them in one pass into typed
+arrays: values are decoded (Base64 values included) to floats, and the
+model, type, view and tolerance type are stored as integer codes of a few
+distinct strings. Filters compare these arrays with NumPy when it is
+installed, and work the same without it.
+"""
+import fnmatch
+import math
+from array import array
+
+from .encoding import decode
+from .table import _NUMPY_TYPES, TYPECODES, ColumnTable
+
+COLUMNS = (
+    "file",
+    "name",
+    "value",
+    "value_text",
+    "text",
+    "dim_type",
+    "sheet",
+    "view_name",
+    "dwg_dim",
+    "encoded",
+    "x",
+    "y",
+    "z",
+    "tolerance_type",
+    "tol_plus",
+    "tol_minus",
+)
+TYPES = {
+    "value": "float",
+    "sheet": "int",
+    "dwg_dim": "bool",
+    "encoded": "bool",
+    "x": "float",
+    "y": "float",
+    "z": "float",
+    "tol_plus": "float",
+    "tol_minus": "float",
+}
+# string columns stored as codes of their distinct values
+CODED = ("file", "dim_type", "view_name", "tolerance_type")
+
+VIEW_COLUMNS = ("view_sheet", "view_x", "view_y", "text_height", "view_model", "simp_rep")
+VIEW_TYPES = {
+    "view_sheet": "int",
+    "view_x": "float",
+    "view_y": "float",
+    "text_height": "float",
+}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _float(value):
+    return math.nan if value is None else float(value)
+
+
+def decode_value(value, encoded=False):
+    """Decode a `dimension_list_detail` value.
+
+    Args:
+        value (str|float): dimension value.
+        encoded (bool, optional):
+            Whether the value is Base64-encoded. Defaults is False.
+
+    Returns:
+        (tuple): (float value, or NaN if it is not a number;
+            str value if it is not a number, else None).
+
+    """
+    if encoded and isinstance(value, str):
+        value = decode(value)
+    if value is None:
+        return math.nan, None
+    try:
+        return float(value), None
+    except (TypeError, ValueError):
+        return math.nan, value
+
+
+class DimensionCatalog(object):
+    """Dimension details of many models, one row per dimension.
+
+    Columns: file, name, value (float, NaN if not a number), value_text
+    (decoded value which is not a number), text, dim_type, sheet (0 if not
+    given), view_name, dwg_dim, encoded, x, y, z (location), tolerance_type,
+    tol_plus, tol_minus (NaN if no tolerance).
+
+    Attributes:
+        views (dict): {drawing: `drawing_list_view_details` result},
+            used by `join_views`.
+
+    """
+
+    def __init__(self):
+        """Create an empty catalog."""
+        self.columns = {
+            name: array(TYPECODES[TYPES[name]]) if name in TYPES else []
+            for name in COLUMNS
+            if name not in CODED
+        }
+        self.codes = {name: array("q") for name in CODED}
+        self.categories = {name: [] for name in CODED}
+        self._lookup = {name: {} for name in CODED}
+        self.views = {}
+
+    def __len__(self):
+        """Return the number of dimensions."""
+        return len(self.columns["name"])
+
+    def __getitem__(self, name):
+        """Return a column, as a list for the coded ones."""
+        if name in CODED:
+            categories = self.categories[name]
+            return [categories[code] for code in self.codes[name]]
+        return self.columns[name]
+
+    def __repr__(self):
+        """Return the size and the number of models."""
+        return "<DimensionCatalog {} dimensions of {} models>".format(
+            len(self), len(self.categories["file"])
+        )
+
+    def _code(self, name, value):
+        """Return the code of a value of a coded column."""
+        lookup = self._lookup[name]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return code
+
+    @classmethod
+    def from_many(cls, results, views=None):
+        """Create a catalog from `dimension_list_detail` results.
+
+        Args:
+            results (dict|iterable):
+                {file: dimensions}, or (file, dimensions) pairs.
+            views (dict, optional):
+                {drawing: `drawing_list_view_details` result}.
+                Defaults is none.
+
+        Returns:
+            (obj:DimensionCatalog): the catalog.
+
+        """
+        catalog = cls()
+        if isinstance(results, dict):
+            results = results.items()
+        for file_, dims in results:
+            catalog.add(dims, file_)
+        catalog.views.update(views or {})
+        return catalog
+
+    def add(self, dims, file_=None):
+        """Add the dimensions of a model.
+
+        Args:
+            dims (list:dict): `dimension_list_detail` result.
+            `file_` (str, optional): Model name. Defaults is None.
+
+        """
+        columns = self.columns
+        codes = self.codes
+        file_code = self._code("file", file_)
+        codes["file"].extend([file_code] * len(dims))
+        name, text = columns["name"], columns["text"]
+        value, value_text = columns["value"], columns["value_text"]
+        sheet, dwg_dim, encoded = columns["sheet"], columns["dwg_dim"], columns["encoded"]
+        x, y, z = columns["x"], columns["y"], columns["z"]
+        tol_plus, tol_minus = columns["tol_plus"], columns["tol_minus"]
+        dim_type, view_name = codes["dim_type"], codes["view_name"]
+        tolerance_type = codes["tolerance_type"]
+        code = self._code
+        for dim in dims:
+            number, string = decode_value(dim.get("value"), dim.get("encoded"))
+            name.append(dim.get("name"))
+            value.append(number)
+            value_text.append(string)
+            text.append(dim.get("text"))
+            dim_type.append(code("dim_type", dim.get("dim_type")))
+            sheet.append(dim.get("sheet") or 0)
+            view_name.append(code("view_name", dim.get("view_name")))
+            dwg_dim.append(bool(dim.get("dwg_dim")))
+            encoded.append(bool(dim.get("encoded")))
+            location = dim.get("location") or {}
+            x.append(_float(location.get("x")))
+            y.append(_float(location.get("y")))
+            z.append(_float(location.get("z")))
+            tolerance_type.append(code("tolerance_type", dim.get("tolerance_type")))
+            tol_plus.append(_float(dim.get("tol_plus")))
+            tol_minus.append(_float(dim.get("tol_minus")))
+
+    def _matching_codes(self, name, patterns):
+        """Return the codes of a column matching patterns (wildcards allowed)."""
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        return {
+            code
+            for code, category in enumerate(self.categories[name])
+            if category is not None
+            and any(fnmatch.fnmatch(category.lower(), p.lower()) for p in patterns)
+        }
+
+    def indices(
+        self,
+        file_=None,
+        dim_type=None,
+        view=None,
+        sheet=None,
+        tolerance=None,
+        tolerance_type=None,
+        dwg_dim=None,
+    ):
+        """Return the rows matching every given filter.
+
+        Args:
+            `file_` (str|list:str, optional):
+                Model names (wildcards allowed).
+            dim_type (str|list:str, optional):
+                Dimension types (ie. linear, radial, diameter, angular).
+            view (str|list:str, optional):
+                View names (wildcards allowed).
+            sheet (int|list:int, optional):
+                Sheet numbers.
+            tolerance (tuple, optional):
+                (min, max) of the tolerance band, tol_plus + tol_minus;
+                None for no bound. Dimensions without tolerance never match.
+            tolerance_type (str|list:str, optional):
+                Tolerance types (ie. plus_minus).
+            dwg_dim (bool, optional):
+                Whether only drawing dimensions, or model dimensions, match.
+
+        Returns:
+            (numpy.ndarray|array): row indices, a NumPy array if NumPy is
+                installed.
+
+        """
+        coded = [
+            (column, self._matching_codes(column, patterns))
+            for column, patterns in (
+                ("file", file_),
+                ("dim_type", dim_type),
+                ("view_name", view),
+                ("tolerance_type", tolerance_type),
+            )
+            if patterns is not None
+        ]
+        if sheet is not None:
+            sheet = {sheet} if isinstance(sheet, int) else set(sheet)
+        low, high = tolerance if tolerance is not None else (None, None)
+        np = _numpy()
+        if np is not None:
+            return self._indices_numpy(np, coded, sheet, low, high, dwg_dim)
+        columns = self.columns
+        rows = range(len(self))
+        for column, allowed in coded:
+            codes = self.codes[column]
+            rows = [row for row in rows if codes[row] in allowed]
+        if sheet is not None:
+            sheets = columns["sheet"]
+            rows = [row for row in rows if sheets[row] in sheet]
+        if dwg_dim is not None:
+            dwg_dims = columns["dwg_dim"]
+            rows = [row for row in rows if bool(dwg_dims[row]) == bool(dwg_dim)]
+        if tolerance is not None:
+            plus, minus = columns["tol_plus"], columns["tol_minus"]
+            low = -math.inf if low is None else low
+            high = math.inf if high is None else high
+            rows = [row for row in rows if low <= plus[row] + minus[row] <= high]
+        return array("q", rows)
+
+    def _indices_numpy(self, np, coded, sheet, low, high, dwg_dim):
+        mask = np.ones(len(self), dtype=bool)
+        for column, allowed in coded:
+            mask &= np.isin(self._view(np, self.codes[column]), list(allowed))
+        if sheet is not None:
+            mask &= np.isin(self._view(np, self.columns["sheet"]), list(sheet))
+        if dwg_dim is not None:
+            mask &= (self._view(np, self.columns["dwg_dim"]) != 0) == bool(dwg_dim)
+        if low is not None or high is not None:
+            band = self._view(np, self.columns["tol_plus"]) + self._view(
+                np, self.columns["tol_minus"]
+            )
+            mask &= ~np.isnan(band)
+            if low is not None:
+                mask &= band >= low
+            if high is not None:
+                mask &= band <= high
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _view(np, column):
+        """Return an array column as a NumPy array, without copy."""
+        dtype = _NUMPY_TYPES[column.typecode]
+        if not column:
+            return np.empty(0, dtype=dtype)
+        return np.frombuffer(column, dtype=dtype)
+
+    def take(self, rows):
+        """Return a catalog of some rows.
+
+        Args:
+            rows (sequence:int): row indices, ie. from `indices`.
+
+        Returns:
+            (obj:DimensionCatalog): the rows, in the given order.
+
+        """
+        catalog = type(self)()
+        np = _numpy()
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            row_list = rows.tolist()
+        else:
+            row_list = rows
+        for columns, target in ((self.columns, catalog.columns), (self.codes, catalog.codes)):
+            for name, column in columns.items():
+                if np is not None and isinstance(column, array):
+                    target[name].frombytes(self._view(np, column)[rows].tobytes())
+                else:
+                    target[name].extend([column[row] for row in row_list])
+        for name in CODED:
+            catalog.categories[name] = list(self.categories[name])
+            catalog._lookup[name] = dict(self._lookup[name])
+        catalog.views = dict(self.views)
+        return catalog
+
+    def where(self, **filters):
+        """Return a catalog of the rows matching every filter, see `indices`."""
+        return self.take(self.indices(**filters))
+
+    def to_table(self):
+        """Return the catalog as a `ColumnTable`, see `table` module."""
+        table = ColumnTable(COLUMNS, TYPES)
+        for name in COLUMNS:
+            table.columns[name] = self[name] if name in CODED else self.columns[name][:]
+        return table
+
+    def to_pandas(self):
+        """Return the catalog as a `pandas.DataFrame`. Requires `pandas`.
+
+        The coded columns have the `category` dtype.
+        """
+        return self.to_table().to_pandas(categories=CODED)
+
+    def _view_rows(self, views):
+        """Return the index in `rows` of the view of each dimension, -1 if none."""
+        rows = []
+        index = {}
+        files = {
+            (file_ or "").lower(): code
+            for code, file_ in enumerate(self.categories["file"])
+        }
+        view_codes = self._lookup["view_name"]
+        for drawing, drawing_views in views.items():
+            file_code = files.get((drawing or "").lower())
+            if file_code is None:
+                continue
+            for view in drawing_views:
+                view_code = view_codes.get(view.get("name"))
+                if view_code is not None:
+                    index[(file_code, view_code)] = len(rows)
+                    rows.append(view)
+        np = _numpy()
+        width = len(self.categories["view_name"])
+        if np is not None:
+            lookup = np.full(len(self.categories["file"]) * width, -1, dtype=np.int64)
+            for (file_code, view_code), row in index.items():
+                lookup[file_code * width + view_code] = row
+            keys = self._view(np, self.codes["file"]) * width + self._view(
+                np, self.codes["view_name"]
+            )
+            return rows, lookup[keys]
+        return rows, [
+            index.get(key, -1) for key in zip(self.codes["file"], self.codes["view_name"])
+        ]
+
+    def join_views(self, views=None):
+        """Return the dimensions with the details of their drawing view.
+
+        Dimensions are matched to the views of their drawing by view name.
+
+        Args:
+            views (dict, optional):
+                {drawing: `drawing_list_view_details` result}.
+                Defaults is `views`.
+
+        Returns:
+            (obj:ColumnTable): catalog columns, then view_sheet, view_x,
+                view_y, text_height, view_model and simp_rep; None (or NaN)
+                for the dimensions without a view.
+
+        """
+        views, view_rows = self._view_rows(self.views if views is None else views)
+        values = {
+            "view_sheet": [view.get("sheet") or 0 for view in views],
+            "view_x": [_float((view.get("location") or {}).get("x")) for view in views],
+            "view_y": [_float((view.get("location") or {}).get("y")) for view in views],
+            "text_height": [_float(view.get("text_height")) for view in views],
+            "view_model": [view.get("view_model") for view in views],
+            "simp_rep": [view.get("simp_rep") for view in views],
+        }
+        missing = {
+            "view_sheet": 0,
+            "view_x": math.nan,
+            "view_y": math.nan,
+            "text_height": math.nan,
+        }
+        np = _numpy()
+        row_list = view_rows.tolist() if np is not None else view_rows
+        table = self.to_table()
+        table.names.extend(VIEW_COLUMNS)
+        for name in VIEW_COLUMNS:
+            kind = table.types[name] = VIEW_TYPES.get(name)
+            # row -1 is the value of the dimensions without a view
+            column = values[name] + [missing.get(name)]
+            if kind is None:
+                table.columns[name] = [column[row] for row in row_list]
+            elif np is not None:
+                joined = np.asarray(column, dtype=_NUMPY_TYPES[TYPECODES[kind]])[view_rows]
+                table.columns[name] = array(TYPECODES[kind], joined.tobytes())
+            else:
+                table.columns[name] = array(TYPECODES[kind], [column[row] for row in row_list])
+        return table
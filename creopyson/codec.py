@@ -0,0 +1,116 @@
+"""Codec module.
+
+JSON encoding of the requests and decoding of the responses, on bytes.
+`orjson` or `ujson` are used when installed, else the standard `json`::
+
+    c = creopyson.Client(codec="json")  # force the standard library
+
+
+Objects the JSON libraries do not know, such as NumPy scalars and arrays, are
+sent by their `tolist()` value.
+"""
+import json
+
+
+class Codec(object):
+    """JSON codec working on bytes."""
+
+    def __init__(self, name, dumps, loads):
+        """Create a codec.
+
+        Args:
+            name (str):
+                Codec name.
+            dumps (callable):
+                Return the JSON bytes of an object.
+            loads (callable):
+                Return the object of JSON bytes, raise ValueError if invalid.
+
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        """Return the codec name."""
+        return "Codec({!r})".format(self.name)
+
+
+def _tolist(obj):
+    """Return a JSON value of a NumPy scalar or array."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError("Type is not JSON serializable: {}".format(type(obj).__name__))
+
+
+def _json_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), default=_tolist).encode("utf-8")
+
+
+def _json():
+    return Codec("json", _json_dumps, json.loads)
+
+
+def _orjson():
+    import orjson
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj, default=_tolist, option=option)
+        except TypeError:
+            # integers wider than 64 bits
+            return _json_dumps(obj)
+
+    return Codec("orjson", dumps, orjson.loads)
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj):
+        try:
+            return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return _json_dumps(obj)
+
+    return Codec("ujson", dumps, ujson.loads)
+
+
+CODECS = {"orjson": _orjson, "ujson": _ujson, "json": _json}
+
+_default = None
+
+
+def get_codec(name=None):
+    """Return a codec.
+
+    Args:
+        name (str|obj:Codec, optional):
+            `orjson`, `ujson`, `json` or a Codec object.
+            Defaults is the fastest installed codec.
+
+    Raises:
+        ValueError: unknown codec name.
+        ImportError: codec library not installed.
+
+    Returns:
+        (obj:Codec): the codec.
+
+    """
+    global _default
+    if isinstance(name, Codec):
+        return name
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError("`{}` is not a known codec.".format(name))
+        return CODECS[name]()
+    if _default is None:
+        for factory in CODECS.values():
+            try:
+                _default = factory()
+                break
+            except ImportError:
+                continue
+    return _default
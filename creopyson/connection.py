@@ -1,32 +1,386 @@
-"""Connection module."""
-import requests
-import json
+"""Connection module.
+
+`requests` and the command modules are imported on first use, so that
+`import creopyson` stays fast for short scripts.
+"""
+import importlib
 import logging
-from pathlib import Path
-from .exceptions import MissingKey, ErrorJsonDecode
+import re
+import threading
+import time
+from contextlib import contextmanager
+from .codec import get_codec
+from .exceptions import MissingKey, ErrorJsonDecode, RequestTimeout, StatusError
+from .resilience import CircuitBreaker, command_timeout, is_read_only
 
 lg = logging.getLogger(__name__)
 
+# Commands that may change the active model in Creo:
+# the cached result of `file_get_active` is dropped when one is sent.
+ACTIVE_FILE_CHANGES = {
+    ("connection", "connect"),
+    ("connection", "disconnect"),
+    ("connection", "kill_creo"),
+    ("connection", "start_creo"),
+    ("connection", "stop_creo"),
+    ("drawing", "create"),
+    ("file", "close_window"),
+    ("file", "display"),
+    ("file", "erase"),
+    ("file", "erase_not_displayed"),
+    ("file", "open"),
+    ("file", "rename"),
+    ("interface", "import_file"),
+    ("interface", "mapkey"),
+}
+
+# Commands posted to `/server` instead of `/creoson`
+SERVER_COMMANDS = {"server"}
+
+
+def parse_result(command, function, json_result, key_data=None):
+    """Check a decoded creoson result and return waited data.
+
+    Args:
+        command (str): Command param of the request.
+        function (str): Function param of the request.
+        json_result (dict): Decoded creoson result.
+        key_data (str, optionnal): param name waited in result.
+
+    Raises:
+        RuntimeError: error message from creoson.
+        MissingKey: Missing arg in creoson return.
+
+    Returns:
+        (depends request): creoson return.
+
+    """
+    if "status" not in json_result.keys():
+        raise MissingKey("Missing `status` in creoson result.")
+
+    if "error" not in json_result["status"].keys():
+        raise MissingKey("Missing `error` in status' creoson's result.")
+
+    status = json_result["status"]["error"]
+    if status:
+        error_msg = json_result["status"]["message"]
+        raise RuntimeError(error_msg)
+
+    if command == "connection" and function == "connect":
+        if "sessionId" not in json_result.keys():
+            raise MissingKey("Missing `sessionId` in creoson result.")
+        else:
+            return json_result["sessionId"]
+
+    if key_data is not None:
+        if "data" not in json_result.keys():
+            raise MissingKey("Missing `data` in creoson return")
+        if key_data not in json_result["data"].keys():
+            raise MissingKey("Missing `{}` in creoson result".format(key_data))
+        return json_result["data"][key_data]
+
+    return json_result.get("data", None)
+
+
+class LazyCommand(object):
+    """Client method imported from its module on first access.
+
+    The first access imports the module and replaces the descriptor on its
+    class by the function itself, so next calls cost nothing more.
+    """
+
+    __slots__ = ("owner", "name", "module", "function", "wrap")
+
+    def __init__(self, owner, name, module, function, wrap=None):
+        """Create the descriptor.
+
+        Args:
+            owner (class): Class the descriptor is set on.
+            name (str): Attribute name (ie. `file_open`).
+            module (str): creopyson module name (ie. `file`).
+            function (str): Function name in the module (ie. `open_`).
+            wrap (callable, optional): Applied to the function once loaded.
+
+        """
+        self.owner = owner
+        self.name = name
+        self.module = module
+        self.function = function
+        self.wrap = wrap
+
+    def load(self):
+        """Import the function and set it on the class."""
+        module = importlib.import_module("creopyson." + self.module)
+        func = getattr(module, self.function)
+        if self.wrap is not None:
+            func = self.wrap(func)
+        setattr(self.owner, self.name, func)
+        return func
+
+    def __get__(self, instance, owner=None):
+        """Return the function, bound to `instance`."""
+        func = self.load()
+        if instance is None:
+            return func
+        return func.__get__(instance, owner)
+
+
+def bind_commands(client_class, commands, wrap=None):
+    """Add lazy command methods to a class.
+
+    Args:
+        client_class (class): Class to add the methods to.
+        commands (dict): {method name: (module, function)}.
+        wrap (callable, optional): Applied to each function once loaded.
+
+    """
+    for name, (module, function) in commands.items():
+        setattr(
+            client_class, name, LazyCommand(client_class, name, module, function, wrap)
+        )
+
 
 class Client(object):
-    """Creates Client object."""
+    """Creates Client object.
+
+    The client keeps a pooled HTTP session with keep-alive, so successive
+    requests reuse the same TCP connections to CREOSON. Use it as a context
+    manager (or call `close()`) to release the connections::
+
+        with creopyson.Client() as c:
+            c.connect()
+            c.creo_pwd()
+
+    """
+
+    def __init__(
+        self,
+        ip_adress="localhost",
+        port=9056,
+        pool_size=10,
+        cache_active_file=True,
+        codec=None,
+        timeout=None,
+        timeouts=None,
+        retries=0,
+        backoff=0.5,
+        circuit_breaker=None,
+        cache=None,
+        transport=None,
+        encoding=None,
+    ):
+        """Create Client objet. Define server and sessionID vars.
+
+        Args:
+            ip_adress (str, optional):
+                CREOSON host. Defaults to `localhost`.
+            port (int, optional):
+                CREOSON port. Defaults to 9056.
+            pool_size (int, optional):
+                Maximum number of keep-alive connections kept open to
+                CREOSON. Defaults to 10.
+            cache_active_file (bool, optional):
+                Whether to cache the active model returned by
+                `file_get_active`. Functions called without `file_` use it,
+                so caching saves a round trip for each of them. The cache is
+                dropped by commands which change the active model
+                (see `ACTIVE_FILE_CHANGES`) and by `invalidate_active_file()`.
+                Set it to False if the active window is changed outside of
+                creopyson (ie. by the user in Creo). Defaults to True.
+            codec (str|obj:Codec, optional):
+                JSON codec: `orjson`, `ujson` or `json`, see `codec` module.
+                Defaults is the fastest installed one.
+            timeout (float|tuple, optional):
+                Seconds to wait for CREOSON, or (connect, read) timeouts,
+                before raising `RequestTimeout`. Defaults is no limit.
+            timeouts (dict, optional):
+                Timeouts per command, keyed by (command, function) or
+                command; ie. `{("file", "open"): 300, "interface": 600}`.
+                Defaults is `timeout` for every command.
+            retries (int, optional):
+                How many times a read-only command is sent again after a
+                connection error or timeout (see `resilience.is_read_only`).
+                Defaults to 0.
+            backoff (float, optional):
+                Seconds before the first retry, doubled for each next one.
+                Defaults to 0.5.
+            circuit_breaker (int|obj:CircuitBreaker, optional):
+                Fail fast with `CircuitOpen` after this number of connection
+                errors in a row, see `resilience.CircuitBreaker`.
+                Defaults is no circuit breaker.
+            cache (bool|obj:ResultCache, optional):
+                Cache the results of read-only commands until a command
+                changes the model, see `cache` module. True creates a
+                `ResultCache()`. Defaults is no cache.
+            transport (obj, optional):
+                Sends the encoded requests instead of the HTTP session, ie.
+                `transport.RecordingTransport` or `ReplayTransport`.
+                Defaults is HTTP.
+            encoding (bool|obj:Base64Encoding, optional):
+                Whether values are exchanged Base64-encoded and decoded when
+                read, see `encoding` module. True creates a
+                `Base64Encoding()`. Defaults is no encoding.
 
-    def __init__(self, ip_adress="localhost", port=9056):
-        """Create Client objet. Define server and sessionID vars."""
+        """
         self.server = "http://{}:{}/creoson".format(ip_adress, port)
         self.sessionId = ""
+        self.pool_size = pool_size
+        self.cache_active_file = cache_active_file
+        self._active_file = None
+        self.codec = get_codec(codec)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._local = threading.local()
+        self._pre_hooks = []
+        self._post_hooks = []
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.retries = retries
+        self.backoff = backoff
+        if isinstance(circuit_breaker, int):
+            circuit_breaker = CircuitBreaker(circuit_breaker)
+        self.circuit_breaker = circuit_breaker
+        if cache is True:
+            from .cache import ResultCache
+
+            cache = ResultCache(codec=self.codec)
+        elif cache is False:
+            cache = None
+        self.cache = cache
+        self.transport = transport
+        if encoding is True:
+            from .encoding import Base64Encoding
+
+            encoding = Base64Encoding()
+        elif encoding is False:
+            encoding = None
+        self.encoding = encoding
+
+    def __enter__(self):
+        """Return the client itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Disconnect from CREOSON if needed and close the HTTP session."""
+        if self.sessionId:
+            try:
+                self.disconnect()
+            except (ConnectionError, RuntimeError) as e:
+                lg.warning("disconnect failed: %s", e)
+        self.close()
+
+    @property
+    def session(self):
+        """requests.Session: pooled HTTP session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1, pool_maxsize=self.pool_size
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def close(self):
+        """Close the HTTP session and its pooled connections.
+
+        The client stays usable: a new session is opened on the next request.
+        """
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def invalidate_active_file(self):
+        """Drop the cached active model.
+
+        The next `file_get_active` call asks Creo again.
+        """
+        self._active_file = None
 
     def connect(self):
         """Connect to CREOSON.
 
         Define 'sessionId'.
+        Open the pooled HTTP session if it is not opened yet.
         Exit if server not found.
         """
         self.sessionId = self._creoson_post("connection", "connect")
 
+    @contextmanager
+    def batch(self, ordered=False, workers=None):
+        """Queue the commands of a `with` block, send them at exit.
+
+        Inside the block, commands return a `concurrent.futures.Future`.
+        At exit, commands on different models are sent concurrently over the
+        pooled connections, commands on the same model are sent in order.
+        Errors are set on each future. If the block raises, the queued
+        commands are cancelled. Nested blocks join the outer batch.
+
+        Args:
+            ordered (bool, optional):
+                Whether every command is sent in order, one at a time.
+                Defaults is False.
+            workers (int, optional):
+                Maximum concurrent requests. Defaults is `pool_size`.
+
+        Yields:
+            (obj:Batch): the queue.
+
+        """
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            yield batch
+            return
+        from .batch import Batch
+
+        batch = Batch(self, ordered, workers)
+        self._local.batch = batch
+        try:
+            yield batch
+        except BaseException:
+            batch.cancel()
+            raise
+        finally:
+            self._local.batch = None
+        batch.flush()
+
     def _creoson_post(self, command, function, data=None, key_data=None):
         """Send a POST request to creoson server and return waited data.
 
+        Inside `batch()`, the request is queued and a Future is returned.
+
+        Args:
+            command (str): Command param for creoson.
+            function (str): Function param for creoson.
+            data (dict, optionnal): data params for creson request.
+            key_data (str, optionnal): param name waited in result.
+
+        Raises:
+            RuntimeError: error message from creoson.
+            ConnectionError: creoson not reachable.
+            RequestTimeout: creoson did not answer in time.
+            CircuitOpen: too many connection errors, request not sent.
+            MissingKey: Missing arg in creoson return.
+
+        Returns:
+            (depends request): creoson return.
+
+        """
+        batch = getattr(self._local, "batch", None)
+        if batch is not None and not batch.is_immediate(command, function):
+            return batch.add(command, function, data, key_data)
+        return self._send(command, function, data, key_data)
+
+    def _send(self, command, function, data=None, key_data=None):
+        """Send a POST request to creoson server and return waited data.
+
         Args:
             command (str): Command param for creoson.
             function (str): Function param for creoson.
@@ -36,66 +390,195 @@ class Client(object):
         Raises:
             RuntimeError: error message from creoson.
             ConnectionError: creoson not reachable.
+            RequestTimeout: creoson did not answer in time.
+            CircuitOpen: too many connection errors, request not sent.
             MissingKey: Missing arg in creoson return.
 
         Returns:
             (depends request): creoson return.
 
         """
+        encoding = self.encoding
+        if encoding is not None and (command, function) in encoding.commands:
+            return encoding.call(
+                command, function, data,
+                lambda data: self._request(command, function, data, key_data),
+            )
+        return self._request(command, function, data, key_data)
+
+    def _request(self, command, function, data, key_data):
+        """Send a request, through the result cache if any."""
         request = {
             "sessionId": self.sessionId,
             "command": command,
             "function": function,
             "data": data,
         }
-        lg.debug("request: %s", str(request))
+        lg.debug("request: %s", request)
+        if (command, function) in ACTIVE_FILE_CHANGES:
+            self._active_file = None
+        if self.cache is not None:
+            return self.cache.call(
+                command, function, data, key_data,
+                lambda: self._dispatch(request, key_data),
+            )
+        return self._dispatch(request, key_data)
+
+    def _dispatch(self, request, key_data):
+        """Post a request, calling the hooks if any, return waited data."""
+        if self._pre_hooks or self._post_hooks:
+            return self._send_instrumented(request, key_data)
+        return parse_result(
+            request["command"], request["function"], self._exchange(request), key_data
+        )
+
+    def _exchange(self, request, record=None):
+        """Post a request and return the decoded result.
+
+        Read-only commands are sent again after a connection error, up to
+        `retries` times. Sizes and timings are set on `record` if given.
+        """
+        command, function = request["command"], request["function"]
+        timeout = command_timeout(command, function, self.timeout, self.timeouts)
+        retries = 0
+        if self.retries and is_read_only(command, function):
+            retries = self.retries
+        breaker = self.circuit_breaker
+        url = self.server
+        if command in SERVER_COMMANDS:
+            # ask `http://localhost:9056/server` vs `http://localhost:9056/creoson`
+            url = re.sub(r"creoson$", "server", url)
+        body = self.codec.dumps(request)
+        if record is not None:
+            record.request_bytes = len(body)
+            start = time.perf_counter()
+        attempt = 0
+        status_code = None
         try:
-            r = requests.post(self.server, data=json.dumps(request))
-        except requests.exceptions.RequestException as e:
-            raise ConnectionError(e)
-
-        if r.status_code != 200:
-            raise ConnectionError("Status code : {}".format(r.status_code))
+            while True:
+                if breaker is not None:
+                    breaker.before()
+                status_code = None
+                try:
+                    if self.transport is None:
+                        response = self._post(body, timeout, url)
+                        status_code = response.status_code
+                        content = response.content
+                    else:
+                        content = self.transport.post(self, body, timeout, url)
+                except ConnectionError as e:
+                    status_code = getattr(e, "status_code", None)
+                    if breaker is not None:
+                        breaker.failure()
+                    if attempt >= retries:
+                        raise
+                    delay = self.backoff * 2 ** attempt
+                    attempt += 1
+                    lg.warning(
+                        "%s %s failed (%s), retry %s/%s in %.2fs",
+                        command, function, e, attempt, retries, delay
+                    )
+                    time.sleep(delay)
+                    continue
+                except BaseException:
+                    if breaker is not None:
+                        breaker.release()
+                    raise
+                if breaker is not None:
+                    breaker.success()
+                break
+        finally:
+            # set on failed requests too, before the post hooks are called
+            if record is not None:
+                received = time.perf_counter()
+                record.network_time = received - start
+                record.status_code = status_code
 
         try:
-            json_result = r.json()
-            lg.debug("response: %s", str(json_result))
-        except TypeError:
+            json_result = self.codec.loads(content)
+            lg.debug("response: %s", json_result)
+        except (TypeError, ValueError):
             raise ErrorJsonDecode("Cannot decode JSON, creoson result invalid.")
+        if record is not None:
+            record.response_bytes = len(content)
+            record.decode_time = time.perf_counter() - received
+        return json_result
 
-        if "status" not in json_result.keys():
-            raise MissingKey("Missing `status` in creoson result.")
+    def _post(self, body, timeout=None, url=None):
+        """Post a request body to `url` (defaults is `server`), return the HTTP response.
 
-        if "error" not in json_result["status"].keys():
-            raise MissingKey("Missing `error` in status' creoson's result.")
+        Raises:
+            RequestTimeout: creoson did not answer in `timeout` seconds.
+            StatusError: creoson answered with an HTTP error status.
+            ConnectionError: creoson not reachable.
 
-        status = json_result["status"]["error"]
-        if status:
-            error_msg = json_result["status"]["message"]
-            raise RuntimeError(error_msg)
+        """
+        try:
+            r = self.session.post(url or self.server, data=body, timeout=timeout)
+        except Exception as e:
+            from requests.exceptions import RequestException, Timeout
+
+            if isinstance(e, Timeout):
+                raise RequestTimeout(e)
+            if isinstance(e, RequestException):
+                raise ConnectionError(e)
+            raise
+        if r.status_code != 200:
+            raise StatusError(r.status_code)
+        return r
 
-        if request["command"] == "connection" and request["function"] == "connect":
-            if "sessionId" not in json_result.keys():
-                raise MissingKey("Missing `sessionId` in creoson result.")
-            else:
-                return json_result["sessionId"]
+    def _send_instrumented(self, request, key_data):
+        """Send a request, calling the pre and post hooks."""
+        command, function = request["command"], request["function"]
+        for hook in self._pre_hooks:
+            hook(command, function, request["data"])
+        from .instrument import CallRecord
 
-        if key_data is not None:
-            if "data" not in json_result.keys():
-                raise MissingKey("Missing `data` in creoson return")
-            if key_data not in json_result["data"].keys():
-                raise MissingKey("Missing `{}` in creoson result".format(key_data))
-            return json_result["data"][key_data]
+        record = CallRecord(command, function)
+        try:
+            json_result = self._exchange(request, record)
+            start = time.perf_counter()
+            result = parse_result(command, function, json_result, key_data)
+            record.decode_time += time.perf_counter() - start
+            return result
+        except Exception as e:
+            record.error = "{}: {}".format(type(e).__name__, e)
+            raise
+        finally:
+            for hook in self._post_hooks:
+                hook(record)
+
+    def add_hook(self, post=None, pre=None):
+        """Add instrumentation hooks around each request.
+
+        Args:
+            post (callable, optional):
+                Called after each request with a `CallRecord` (command,
+                function, sizes, network and decode times, error);
+                ie. `instrument.Histogram()` or `instrument.CsvTrace(path)`.
+            pre (callable, optional):
+                Called before each request with (command, function, data).
 
-        return json_result.get("data", None)
+        """
+        if post is not None:
+            self._post_hooks.append(post)
+        if pre is not None:
+            self._pre_hooks.append(pre)
+
+    def remove_hook(self, hook):
+        """Remove a hook added by `add_hook`."""
+        for hooks in (self._pre_hooks, self._post_hooks):
+            if hook in hooks:
+                hooks.remove(hook)
 
     def disconnect(self):
         """Disconnect from CREOSON.
 
-        Empty sessionId.
+        Empty sessionId and close the pooled HTTP session.
         """
         self._creoson_post("connection", "disconnect")
         self.sessionId = ""
+        self.close()
 
     def is_creo_running(self):
         """Check whether Creo is running.
@@ -167,6 +650,8 @@ class Client(object):
             None
 
         """
+        from pathlib import Path
+
         path_obj = Path(path)
         start_command = path_obj.name
         start_dir = str(path_obj.parents[0])
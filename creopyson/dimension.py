@@ -328,3 +328,71 @@ def user_select(client, file_=None, maxi=None):
     if maxi is not None:
         data["max"] = maxi
     return client._creoson_post("dimension", "user_select", data, "dimlist")
+
+
+def editor(client, regenerate=True, workers=None, tolerance=1e-9):
+    """Create an editor sending many dimension edits at once.
+
+    See `editor` module.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        regenerate (boolean, optional):
+            Whether each changed model is regenerated once, after the edits.
+            Defaults is True.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+        tolerance (float, optional):
+            Values closer than this to the current one are not sent.
+            Defaults to 1e-9.
+
+    Returns:
+        (obj:DimensionEditor): an empty editor.
+
+    """
+    from .editor import DimensionEditor
+
+    return DimensionEditor(client, regenerate, workers, tolerance)
+
+
+def list_catalog(client, files, dim_type=None, views=False, workers=None):
+    """Get the dimension details of many models or drawings as a catalog.
+
+    The models are listed concurrently, in a batch. See `catalog` module.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        files (iterable:str):
+            Model or drawing names.
+        dim_type (str, optional):
+            Dimension type filter. Defaults is `no filter`.
+            Valid values: linear, radial, diameter, angular.
+        views (boolean, optional):
+            Whether the view details of the drawings (`.drw` files) are
+            listed too, for `DimensionCatalog.join_views`. Defaults is False.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+
+    Raises:
+        RuntimeError: called inside `Client.batch()`, or error message from
+            creoson (ie. model not found).
+
+    Returns:
+        (obj:DimensionCatalog): one row per dimension.
+
+    """
+    from .catalog import DimensionCatalog
+
+    if getattr(client._local, "batch", None) is not None:
+        raise RuntimeError("dimension_list_catalog cannot be called inside a batch.")
+    files = list(files)
+    drawings = [file_ for file_ in files if file_.lower().endswith(".drw")] if views else []
+    with client.batch(workers=workers):
+        dims = [client.dimension_list_detail(file_=file_, dim_type=dim_type) for file_ in files]
+        drawing_views = [client.drawing_list_view_details(drawing=file_) for file_ in drawings]
+    return DimensionCatalog.from_many(
+        [(file_, future.result()) for file_, future in zip(files, dims)],
+        views={file_: future.result() for file_, future in zip(drawings, drawing_views)},
+    )
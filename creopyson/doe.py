@@ -0,0 +1,454 @@
+"""Design of experiments module.
+
+Run variants of a model over one or many Creo sessions and collect their
+outputs in a table::
+
+    from creopyson import doe
+
+    plan = doe.full_factorial({
+        "d1": [10, 12, 14],                         # dimension of the model
+        doe.parameter("MATERIAL"): ["STEEL", "ALU"],
+    })
+    runner = doe.DoeRunner("box.prt", plan, checkpoint="box_doe.jsonl")
+    with creopyson.ClientPool(hosts) as pool:
+        table = runner.run(pool)
+    table.to_pandas()
+
+Each variant sets its dimensions (with a `DimensionEditor`) and parameters,
+regenerates the model once and calls the readers (`massprops`, `bound_box`
+or custom functions). Every finished variant is appended to the checkpoint
+file: running the same plan again skips them, so a study stopped by a crash
+resumes where it stopped.
+"""
+import hashlib
+import os
+import random
+import threading
+from itertools import product
+
+from .codec import get_codec
+from .table import ColumnTable
+
+FORMAT_VERSION = 1
+
+
+class Input(object):
+    """A dimension or parameter of the model changed by the variants."""
+
+    __slots__ = ("kind", "name", "file", "type")
+
+    def __init__(self, kind, name, file_=None, type_=None):
+        """Create an input.
+
+        Args:
+            kind (str): `dimension` or `parameter`.
+            name (str): Dimension or parameter name.
+            `file_` (str, optional):
+                Model name. Defaults is the model of the runner.
+            `type_` (str, optional):
+                Parameter type, see `parameter_set`. Defaults is Creo's.
+
+        """
+        if kind not in ("dimension", "parameter"):
+            raise ValueError("Unknown input kind: {}".format(kind))
+        self.kind = kind
+        self.name = name
+        self.file = file_
+        self.type = type_
+
+    def __repr__(self):
+        """Return the kind and column name."""
+        return "<Input {} {}>".format(self.kind, self.column)
+
+    def __eq__(self, other):
+        """Check whether both inputs change the same value."""
+        return isinstance(other, Input) and self._key() == other._key()
+
+    def __hash__(self):
+        """Return the hash of the kind, name and model."""
+        return hash(self._key())
+
+    def _key(self):
+        return (self.kind, self.name, self.file.lower() if self.file else None)
+
+    @property
+    def column(self):
+        """str: column name in the result table (`file:name` if a model is set)."""
+        if self.file:
+            return "{}:{}".format(self.file, self.name)
+        return self.name
+
+
+def dimension(name, file_=None):
+    """Return a dimension input, see `Input`."""
+    return Input("dimension", name, file_)
+
+
+def parameter(name, file_=None, type_=None):
+    """Return a parameter input, see `Input`."""
+    return Input("parameter", name, file_, type_)
+
+
+def _input(key):
+    """Return the Input of a factor key; a str is a dimension name."""
+    return key if isinstance(key, Input) else dimension(key)
+
+
+def full_factorial(factors):
+    """Return every combination of the levels of the factors.
+
+    Args:
+        factors (dict):
+            {input: list of levels}; an input is a dimension name,
+            or `dimension()` / `parameter()`.
+
+    Returns:
+        (list:dict): variants, {input: value}.
+
+    """
+    inputs = [_input(key) for key in factors]
+    return [dict(zip(inputs, values)) for values in product(*factors.values())]
+
+
+def random_sampling(ranges, samples, seed=None):
+    """Return variants with uniformly random values.
+
+    Args:
+        ranges (dict): {input: (low, high)}.
+        samples (int): Number of variants.
+        seed (int, optional): Random seed. Defaults is a random plan.
+
+    Returns:
+        (list:dict): variants, {input: value}.
+
+    """
+    rng = random.Random(seed)
+    inputs = [(_input(key), low, high) for key, (low, high) in ranges.items()]
+    return [
+        {item: rng.uniform(low, high) for item, low, high in inputs}
+        for _ in range(samples)
+    ]
+
+
+def latin_hypercube(ranges, samples, seed=None):
+    """Return a Latin hypercube sampling plan.
+
+    Each range is split in `samples` intervals of equal width: every
+    interval of every input is used by exactly one variant.
+
+    Args:
+        ranges (dict): {input: (low, high)}.
+        samples (int): Number of variants.
+        seed (int, optional): Random seed. Defaults is a random plan.
+
+    Returns:
+        (list:dict): variants, {input: value}.
+
+    """
+    rng = random.Random(seed)
+    variants = [{} for _ in range(samples)]
+    for key, (low, high) in ranges.items():
+        item = _input(key)
+        width = (high - low) / samples
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        for variant, stratum in zip(variants, strata):
+            variant[item] = low + (stratum + rng.random()) * width
+    return variants
+
+
+def _massprops(client, file_):
+    result = client.file_massprops(file_=file_)
+    return {key: result.get(key) for key in ("mass", "volume", "density", "surface_area")}
+
+
+def _bound_box(client, file_):
+    return client.geometry_bound_box(file_=file_)
+
+
+# Readers known by name.
+READERS = {
+    "massprops": _massprops,
+    "bound_box": _bound_box,
+}
+
+
+def plan_digest(model, plan):
+    """Return a hash identifying a model and a plan, kept in checkpoints."""
+    sha = hashlib.sha1(str(model).lower().encode("utf-8"))
+    for variant in plan:
+        sha.update(repr(sorted(
+            (item.kind, item.column, repr(value)) for item, value in variant.items()
+        )).encode("utf-8"))
+    return sha.hexdigest()
+
+
+def read_checkpoint(path):
+    """Read a checkpoint file written by `DoeRunner.run`.
+
+    Args:
+        path (str|Path): checkpoint file.
+
+    Raises:
+        ValueError: unknown checkpoint format.
+
+    Returns:
+        (tuple): (header dict, {variant index: record dict}).
+
+    """
+    codec = get_codec()
+    with open(path, "rb") as stream:
+        lines = [line for line in stream if line.strip()]
+    if not lines:
+        raise ValueError("Empty DOE checkpoint {}".format(path))
+    header = codec.loads(lines[0])
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError("Unknown DOE checkpoint version in {}".format(path))
+    records = {}
+    for line in lines[1:]:
+        try:
+            record = codec.loads(line)
+        except ValueError:
+            # last line cut by a crash
+            continue
+        records[record["variant"]] = record
+    return header, records
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as stream:
+        stream.seek(-1, os.SEEK_END)
+        return stream.read(1) == b"\n"
+
+
+class DoeRunner(object):
+    """Run the variants of a plan, see `doe` module."""
+
+    def __init__(
+        self,
+        model,
+        plan,
+        readers=("massprops",),
+        checkpoint=None,
+        regenerate=True,
+        retry_failed=True,
+    ):
+        """Create a runner.
+
+        Args:
+            model (str):
+                Model name, opened in each session.
+            plan (list:dict):
+                Variants, see `full_factorial`, `latin_hypercube`.
+            readers (list|dict, optional):
+                Outputs read after each regeneration: names of `READERS`
+                (`massprops`, `bound_box`), or {column: reader(client, model)}.
+                A reader returning a dict adds a column per key.
+                Defaults is `massprops`.
+            checkpoint (str|Path, optional):
+                JSON lines file recording each finished variant.
+                Defaults is no checkpoint.
+            regenerate (bool, optional):
+                Whether the model is regenerated before reading the outputs.
+                Defaults is True.
+            retry_failed (bool, optional):
+                Whether variants which failed in a previous run are run
+                again when resuming. Defaults is True.
+
+        """
+        self.model = model
+        self.plan = [{_input(key): value for key, value in v.items()} for v in plan]
+        if isinstance(readers, dict):
+            self.readers = dict(readers)
+        else:
+            self.readers = {name: READERS[name] for name in readers}
+        self.checkpoint = checkpoint
+        self.regenerate = regenerate
+        self.retry_failed = retry_failed
+        self.digest = plan_digest(model, self.plan)
+        # {variant index: record}
+        self.records = {}
+        self._lock = threading.Lock()
+        self._stream = None
+        self._editors = {}
+
+    def __len__(self):
+        """Return the number of variants."""
+        return len(self.plan)
+
+    @property
+    def pending(self):
+        """list:int: indexes of the variants not run yet."""
+        return [
+            index for index in range(len(self.plan))
+            if index not in self.records
+            or (self.retry_failed and self.records[index].get("error"))
+        ]
+
+    def _resume(self):
+        """Load the records of the checkpoint, if it is for the same plan."""
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return False
+        header, records = read_checkpoint(self.checkpoint)
+        if header.get("plan") != self.digest:
+            raise ValueError(
+                "Checkpoint {} is for another model or plan".format(self.checkpoint)
+            )
+        self.records.update(records)
+        return True
+
+    def _write(self, document):
+        if self._stream is not None:
+            with self._lock:
+                self._stream.write(get_codec().dumps(document) + b"\n")
+                self._stream.flush()
+
+    def run_variant(self, client, index):
+        """Set the inputs of a variant, regenerate and read the outputs.
+
+        Args:
+            client (obj): creopyson Client.
+            index (int): variant index in the plan.
+
+        Raises:
+            ValueError: a dimension edit is invalid.
+
+        Returns:
+            (dict): {column: value} of the outputs.
+
+        """
+        from .editor import DimensionEditor
+
+        with self._lock:
+            editor = self._editors.get(client)
+            first = editor is None
+            if first:
+                editor = self._editors[client] = DimensionEditor(client, regenerate=False)
+        if first:
+            client.file_open(self.model)
+        variant = self.plan[index]
+        for item, value in variant.items():
+            if item.kind == "dimension":
+                editor.set(item.name, value, item.file or self.model)
+        report = editor.apply()
+        if report.failed:
+            edit = report.failed[0]
+            raise ValueError("{} {}: {}".format(edit.file, edit.name, edit.error))
+        for item, value in variant.items():
+            if item.kind == "parameter":
+                client.parameter_set(
+                    item.name, value, file_=item.file or self.model, type_=item.type
+                )
+        if self.regenerate:
+            client.file_regenerate(file_=self.model)
+        outputs = {}
+        for name, reader in self.readers.items():
+            value = reader(client, self.model)
+            if isinstance(value, dict):
+                outputs.update(value)
+            else:
+                outputs[name] = value
+        return outputs
+
+    def _job(self, client, index):
+        try:
+            outputs = self.run_variant(client, index)
+            error = None
+        except ConnectionError:
+            # not checkpointed: the pool runs the variant again on another
+            # session if nothing was sent, else it is run again on resume
+            raise
+        except Exception as e:
+            outputs = {}
+            error = "{}: {}".format(type(e).__name__, e)
+        record = {"variant": index, "outputs": outputs, "error": error}
+        with self._lock:
+            self.records[index] = record
+        self._write(record)
+        return record
+
+    def run(self, executor):
+        """Run the pending variants.
+
+        Args:
+            executor (obj):
+                creopyson Client (variants run one by one), or ClientPool
+                (variants spread over its sessions).
+
+        Raises:
+            ValueError: the checkpoint is for another model or plan.
+
+        Returns:
+            (obj:ColumnTable): one row per variant run so far, see `table`.
+
+        """
+        resumed = self._resume()
+        pending = self.pending
+        if self.checkpoint is not None:
+            self._stream = open(self.checkpoint, "ab")
+            if resumed and self._stream.tell() and not _ends_with_newline(self.checkpoint):
+                # a line cut by a crash must not be joined to the next one
+                self._stream.write(b"\n")
+            if not resumed:
+                self._write({
+                    "version": FORMAT_VERSION,
+                    "model": self.model,
+                    "plan": self.digest,
+                    "variants": len(self.plan),
+                })
+        try:
+            if hasattr(executor, "map"):
+                results = executor.map(self._job, pending, return_exceptions=True)
+                for index, result in zip(pending, results):
+                    if isinstance(result, Exception):
+                        # not checkpointed: run again on resume
+                        self.records[index] = {
+                            "variant": index,
+                            "outputs": {},
+                            "error": "{}: {}".format(type(result).__name__, result),
+                        }
+            else:
+                for index in pending:
+                    self._job(executor, index)
+        finally:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            self._editors.clear()
+        return self.table()
+
+    def table(self):
+        """Return the results as a table.
+
+        Returns:
+            (obj:ColumnTable): columns `variant`, the inputs, the outputs and
+                `error`, one row per variant run, in the plan order.
+
+        """
+        inputs = list(dict.fromkeys(item for variant in self.plan for item in variant))
+        records = [self.records[index] for index in sorted(self.records)]
+        outputs = list(dict.fromkeys(
+            name for record in records for name in record["outputs"]
+        ))
+        rows = []
+        for record in records:
+            variant = self.plan[record["variant"]]
+            rows.append(
+                [record["variant"]]
+                + [variant.get(item) for item in inputs]
+                + [record["outputs"].get(name) for name in outputs]
+                + [record.get("error")]
+            )
+        names = ["variant"] + [item.column for item in inputs] + outputs + ["error"]
+        types = {"variant": "int"}
+        for position, name in enumerate(names[1:-1], 1):
+            values = [row[position] for row in rows if row[position] is not None]
+            if values and all(
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                for value in values
+            ):
+                types[name] = "float"
+        table = ColumnTable(names, types)
+        for row in rows:
+            table.append(row)
+        return table
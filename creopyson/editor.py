@@ -0,0 +1,392 @@
+"""Editor module.
+
+Collect dimension edits, then send them at once with one regeneration per
+model::
+
+    editor = c.dimension_editor()
+    editor.set("d1", 12.5, file_="box.prt")
+    editor.update({"d2": 40, "d3": 8}, file_="box.prt")
+    editor.set("d0", 3, file_="plate.prt")
+    report = editor.apply()
+    for edit in report.failed:
+        print(edit.file, edit.name, edit.error)
+
+Edits are checked against the dimensions of each model, listed again at
+each apply so that values changed by a regeneration or outside the editor
+are seen: unknown dimensions and values which are not numbers are reported
+without being sent, unchanged values are skipped. Dimension names are case
+insensitive, as in Creo. The others are sent concurrently in a
+`Client.batch()`, then each changed model is regenerated once.
+"""
+import math
+
+PENDING = "pending"
+UNCHANGED = "unchanged"
+INVALID = "invalid"
+SET = "set"
+FAILED = "failed"
+
+
+class DimensionEdit(object):
+    """A dimension value to set.
+
+    Attributes:
+        file (str): model name, None for the active model until applied.
+        name (str): dimension name, as listed by Creo once validated.
+        value (str|float): new value.
+        old (str|float): value before the edit, None if not known yet.
+        status (str): `pending`, `unchanged` (also when a later edit of the
+            same dimension replaces it), `invalid`, `set` or `failed`.
+        error (Exception): why the edit is invalid or failed.
+
+    """
+
+    __slots__ = ("file", "name", "value", "old", "status", "error")
+
+    def __init__(self, file_, name, value):
+        """Create a pending edit."""
+        self.file = file_
+        self.name = name
+        self.value = value
+        self.old = None
+        self.status = PENDING
+        self.error = None
+
+    def __repr__(self):
+        """Return the model, dimension, value and status."""
+        return "<DimensionEdit {} {}={} {}>".format(
+            self.file, self.name, self.value, self.status
+        )
+
+
+class EditReport(object):
+    """Result of `DimensionEditor.apply`.
+
+    Attributes:
+        edits (list:DimensionEdit): applied edits, with their status.
+        regenerated (list:str): models regenerated.
+        regen_errors (dict): {model: exception} of the failed regenerations.
+        requests (int): requests sent.
+
+    """
+
+    def __init__(self, edits):
+        """Create a report of edits."""
+        self.edits = edits
+        self.regenerated = []
+        self.regen_errors = {}
+        self.requests = 0
+
+    def __repr__(self):
+        """Return the number of edits of each status."""
+        return "<EditReport {} set, {} unchanged, {} invalid, {} failed>".format(
+            len(self.set), len(self.unchanged), len(self.invalid), len(self.failed)
+        )
+
+    def __bool__(self):
+        """Check whether every edit was set or unchanged and regenerated."""
+        return not self.invalid and not self.failed and not self.regen_errors
+
+    def _status(self, status):
+        return [edit for edit in self.edits if edit.status == status]
+
+    @property
+    def set(self):
+        """list:DimensionEdit: edits sent successfully."""
+        return self._status(SET)
+
+    @property
+    def unchanged(self):
+        """list:DimensionEdit: edits skipped: value already set, or edited again."""
+        return self._status(UNCHANGED)
+
+    @property
+    def invalid(self):
+        """list:DimensionEdit: edits not sent (unknown dimension, bad value)."""
+        return self._status(INVALID)
+
+    @property
+    def failed(self):
+        """list:DimensionEdit: edits refused by Creo, and invalid ones."""
+        return [edit for edit in self.edits if edit.status in (INVALID, FAILED)]
+
+
+def _same(old, new, tolerance):
+    try:
+        return math.isclose(float(old), float(new), rel_tol=tolerance, abs_tol=tolerance)
+    except (TypeError, ValueError):
+        return old == new
+
+
+class DimensionEditor(object):
+    """Queue of dimension edits on many models, see `editor` module."""
+
+    def __init__(self, client, regenerate=True, workers=None, tolerance=1e-9):
+        """Create an empty editor.
+
+        Args:
+            client (obj):
+                creopyson Client or AsyncClient.
+            regenerate (bool, optional):
+                Whether each changed model is regenerated. Defaults is True.
+            workers (int, optional):
+                Maximum concurrent requests. Defaults is the client's `pool_size`.
+            tolerance (float, optional):
+                Values closer than this to the current one are not sent.
+                Defaults to 1e-9.
+
+        """
+        self.client = client
+        self.regenerate = regenerate
+        self.workers = workers
+        self.tolerance = tolerance
+        self.edits = []
+        self.report = None
+        # {model lower name: {dimension lower name: dimension}}, listed by
+        # the last apply
+        self.dimensions = {}
+
+    def __len__(self):
+        """Return the number of pending edits."""
+        return len(self.edits)
+
+    def __enter__(self):
+        """Return the editor itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Apply the edits, unless the block raised; see `report`."""
+        if exc_type is None:
+            self.report = self.apply()
+
+    def set(self, name, value, file_=None):
+        """Queue a dimension edit.
+
+        Args:
+            name (str): Dimension name.
+            value (str|float): Dimension value.
+            `file_` (str, optional):
+                Model name. Defaults is the active model when applied.
+
+        Returns:
+            (obj:DimensionEdit): the queued edit.
+
+        """
+        edit = DimensionEdit(file_, name, value)
+        self.edits.append(edit)
+        return edit
+
+    def update(self, values, file_=None):
+        """Queue many dimension edits.
+
+        Args:
+            values (dict|iterable):
+                {dimension name: value} of `file_`,
+                or (file, dimension name, value) tuples.
+            `file_` (str, optional):
+                Model name of a dict. Defaults is the active model.
+
+        """
+        if isinstance(values, dict):
+            for name, value in values.items():
+                self.set(name, value, file_)
+        else:
+            for model, name, value in values:
+                self.set(name, value, model)
+
+    def _models_to_list(self, active):
+        """Resolve the active model, return the edited models, listed again."""
+        self.dimensions = {}
+        models = {}
+        for edit in self.edits:
+            if edit.file is None:
+                edit.file = active
+            if edit.file is not None:
+                models.setdefault(edit.file.lower(), edit.file)
+        return list(models.values())
+
+    def _list_result(self, file_, result):
+        """Keep the dimensions listed for a model."""
+        if isinstance(result, Exception):
+            for edit in self.edits:
+                if edit.file is not None and edit.file.lower() == file_.lower():
+                    edit.status = INVALID
+                    edit.error = result
+        else:
+            self.dimensions[file_.lower()] = {dim["name"].lower(): dim for dim in result}
+
+    def validate(self):
+        """Check the pending edits against the known dimensions.
+
+        Edits of unknown dimensions, or with a value which is not a number,
+        are set `invalid`; edits of the current value are set `unchanged`.
+
+        Returns:
+            (list:DimensionEdit): edits to send.
+
+        """
+        to_send = {}
+        for edit in self.edits:
+            if edit.status != PENDING:
+                continue
+            if edit.file is None:
+                edit.status = INVALID
+                edit.error = ValueError("No model given and no active model.")
+                continue
+            dims = self.dimensions.get(edit.file.lower())
+            dim = dims.get(edit.name.lower()) if dims is not None else None
+            if dim is None:
+                edit.status = INVALID
+                edit.error = KeyError(
+                    "Dimension {} not found in {}".format(edit.name, edit.file)
+                )
+                continue
+            # sent with the name listed by Creo
+            edit.name = dim["name"]
+            edit.old = dim.get("value")
+            if not dim.get("encoded"):
+                try:
+                    float(edit.value)
+                except (TypeError, ValueError):
+                    edit.status = INVALID
+                    edit.error = ValueError(
+                        "Invalid value for dimension {}: {!r}".format(edit.name, edit.value)
+                    )
+                    continue
+            if _same(edit.old, edit.value, self.tolerance):
+                edit.status = UNCHANGED
+                continue
+            # the last edit of a dimension wins
+            key = (edit.file.lower(), edit.name.lower())
+            previous = to_send.pop(key, None)
+            if previous is not None:
+                previous.status = UNCHANGED
+            to_send[key] = edit
+        return list(to_send.values())
+
+    def _set_result(self, edit, error):
+        """Record the result of a sent edit."""
+        if error is None:
+            edit.status = SET
+        else:
+            edit.status = FAILED
+            edit.error = error
+
+    def _changed_models(self, to_send):
+        return list(dict.fromkeys(edit.file for edit in to_send if edit.status == SET))
+
+    def apply(self):
+        """Send the pending edits and regenerate each changed model once.
+
+        Errors are reported on each edit, not raised.
+
+        Raises:
+            TypeError: the client is an AsyncClient, see `apply_async`.
+            RuntimeError: called inside `Client.batch()`.
+
+        Returns:
+            (obj:EditReport): edits with their status, regenerated models.
+
+        """
+        client = self.client
+        if not hasattr(client, "_local"):
+            raise TypeError(
+                "DimensionEditor.apply needs a Client, "
+                "use `await editor.apply_async()` with an AsyncClient."
+            )
+        if getattr(client._local, "batch", None) is not None:
+            raise RuntimeError("DimensionEditor.apply cannot be called inside a batch.")
+        report = EditReport(self.edits)
+        active = None
+        if any(edit.file is None for edit in report.edits):
+            active = (client.file_get_active() or {}).get("file")
+        to_list = self._models_to_list(active)
+        if to_list:
+            with client.batch(workers=self.workers):
+                futures = [client.dimension_list(file_=file_) for file_ in to_list]
+            for file_, future in zip(to_list, futures):
+                self._list_result(file_, future.exception() or future.result())
+            report.requests += len(to_list)
+        to_send = self.validate()
+        if to_send:
+            with client.batch(workers=self.workers):
+                futures = [
+                    client.dimension_set(edit.name, edit.value, file_=edit.file)
+                    for edit in to_send
+                ]
+            for edit, future in zip(to_send, futures):
+                self._set_result(edit, future.exception())
+            report.requests += len(to_send)
+        self._regenerate(report, to_send)
+        self.edits = []
+        return report
+
+    def _regenerate(self, report, to_send):
+        models = self._changed_models(to_send)
+        if not self.regenerate or not models:
+            return
+        client = self.client
+        with client.batch(workers=self.workers):
+            futures = [client.file_regenerate(file_=model) for model in models]
+        for model, future in zip(models, futures):
+            self._regen_result(report, model, future.exception())
+        report.requests += len(models)
+
+    def _regen_result(self, report, model, error):
+        if error is None:
+            report.regenerated.append(model)
+        else:
+            report.regen_errors[model] = error
+
+    async def apply_async(self):
+        """Send the pending edits with an AsyncClient, see `apply`.
+
+        Returns:
+            (obj:EditReport): edits with their status, regenerated models.
+
+        """
+        from .aio import gather
+
+        client = self.client
+        limit = self.workers or client.pool_size
+        report = EditReport(self.edits)
+        active = None
+        if any(edit.file is None for edit in report.edits):
+            active = ((await client.file_get_active()) or {}).get("file")
+        to_list = self._models_to_list(active)
+        if to_list:
+            results = await gather(
+                *(client.dimension_list(file_=file_) for file_ in to_list),
+                limit=limit,
+                return_exceptions=True,
+            )
+            for file_, result in zip(to_list, results):
+                self._list_result(file_, result)
+            report.requests += len(to_list)
+        to_send = self.validate()
+        if to_send:
+            results = await gather(
+                *(
+                    client.dimension_set(edit.name, edit.value, file_=edit.file)
+                    for edit in to_send
+                ),
+                limit=limit,
+                return_exceptions=True,
+            )
+            for edit, result in zip(to_send, results):
+                self._set_result(edit, result if isinstance(result, Exception) else None)
+            report.requests += len(to_send)
+        models = self._changed_models(to_send)
+        if self.regenerate and models:
+            results = await gather(
+                *(client.file_regenerate(file_=model) for model in models),
+                limit=limit,
+                return_exceptions=True,
+            )
+            for model, result in zip(models, results):
+                self._regen_result(
+                    report, model, result if isinstance(result, Exception) else None
+                )
+            report.requests += len(models)
+        self.edits = []
+        return report
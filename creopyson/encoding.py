@@ -0,0 +1,132 @@
+"""Encoding module.
+
+CREOSON returns the values which are not plain ASCII (Creo symbols, accents)
+Base64-encoded, and expects them encoded when they are set. With
+`encoding=True`, the client does it::
+
+    c = creopyson.Client(encoding=True)
+    params = c.parameter_list(file_="box.prt")
+    params[0]["value"]          # "Ø12 ±0.1", not "w5gxMiDCsTAuMQ=="
+    c.parameter_set("NOTE", "Ø12 ±0.1", file_="box.prt")   # sent encoded
+
+The listing commands of `DECODED` are sent with `encoded=True`, unless
+`encoded` is given. Their result items are decoded in place as they are
+received, so no decoded copy of the result is built. The string values of
+the commands of `ENCODED` are sent encoded if they are not ASCII.
+"""
+import base64
+
+# {(command, function): how a decoded value is converted}
+# `number`: float if possible; `typed`: by the parameter `type`; `text`: str.
+DECODED = {
+    ("dimension", "list"): "number",
+    ("dimension", "list_detail"): "number",
+    ("parameter", "list"): "typed",
+    ("feature", "list_params"): "typed",
+    ("note", "list"): "text",
+}
+# commands with a `value` to encode
+ENCODED = {
+    ("dimension", "set"),
+    ("feature", "set_param"),
+    ("note", "set"),
+    ("parameter", "set"),
+}
+# commands which do not take an `encoded` argument
+_AUTO_ENCODED = {("note", "list")}
+
+
+def decode(value):
+    """Return the text of a Base64-encoded value."""
+    return base64.b64decode(value).decode("utf-8")
+
+
+def encode(text):
+    """Return a text Base64-encoded."""
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def _convert(text, kind, type_):
+    try:
+        if kind == "number":
+            return float(text)
+        if kind == "typed":
+            if type_ == "DOUBLE":
+                return float(text)
+            if type_ == "INTEGER":
+                return int(text)
+            if type_ == "BOOL":
+                return text.lower() == "true"
+    except ValueError:
+        pass
+    return text
+
+
+def decode_item(item, kind="text"):
+    """Decode in place the value of a result item, if it is encoded.
+
+    Args:
+        item (dict): result item with `value` and `encoded` keys.
+        kind (str, optional):
+            Conversion of the decoded text, see `DECODED`.
+            Defaults is `text`.
+
+    Returns:
+        (dict): the item, with `encoded` False.
+
+    """
+    if item.get("encoded") and isinstance(item.get("value"), str):
+        item["value"] = _convert(decode(item["value"]), kind, item.get("type"))
+        item["encoded"] = False
+    return item
+
+
+class Base64Encoding(object):
+    """Base64 layer of a client, see `encoding` module."""
+
+    commands = frozenset(DECODED) | frozenset(ENCODED)
+
+    def request(self, command, function, data):
+        """Encode the data of a request.
+
+        Returns:
+            (tuple): (data to send, whether the result is to decode).
+
+        """
+        key = (command, function)
+        if key in DECODED:
+            if data is None or "encoded" not in data:
+                if key not in _AUTO_ENCODED:
+                    data = dict(data or {}, encoded=True)
+                return data, True
+            return data, not data["encoded"]
+        if key in ENCODED and data is not None and not data.get("encoded"):
+            value = data.get("value")
+            if isinstance(value, str) and not value.isascii():
+                data = dict(data, value=encode(value), encoded=True)
+        return data, False
+
+    def result(self, command, function, result):
+        """Return the result of a request with decoded values."""
+        if not isinstance(result, list):
+            return result
+        kind = DECODED[(command, function)]
+        for item in result:
+            decode_item(item, kind)
+        return result
+
+    def call(self, command, function, data, send):
+        """Send a request with encoded values, return its decoded result.
+
+        Args:
+            command (str): Command param for creoson.
+            function (str): Function param for creoson.
+            data (dict): data params for creoson request.
+            send (callable): sends the request data, returns the result.
+
+        """
+        data, decode_result = self.request(command, function, data)
+        result = send(data)
+        if decode_result:
+            return self.result(command, function, result)
+        return result
@@ -17,3 +17,30 @@ class ErrorJsonDecode(Error):
     """Raised when creoson result cannot be decoded."""
 
     pass
+
+
+class RequestTimeout(Error, ConnectionError):
+    """Raised when creoson does not answer in time."""
+
+    pass
+
+
+class StatusError(Error, ConnectionError):
+    """Raised when creoson answers with an HTTP error status."""
+
+    def __init__(self, status_code):
+        """Keep the HTTP status code."""
+        super().__init__("Status code : {}".format(status_code))
+        self.status_code = status_code
+
+
+class CircuitOpen(Error, ConnectionError):
+    """Raised when requests are refused after repeated failures."""
+
+    pass
+
+
+class ReplayMismatch(Error):
+    """Raised when a replayed session has no answer for a request."""
+
+    pass
@@ -0,0 +1,891 @@
+"""Fake CREOSON server module.
+
+`FakeCreoson` is a small HTTP server speaking the `/creoson` and `/server`
+JSON protocol, with a simulated Creo session (models, parameters, dimensions,
+assemblies, family tables and features). It allows to run and benchmark
+creopyson without Creo::
+
+    from creopyson.fakeserver import FakeCreoson
+
+    with FakeCreoson(latency=0.002) as server:
+        server.add_model("box.prt", parameters={"COLOR": "red"})
+        c = server.client()
+        c.connect()
+        c.parameter_list(file_="box.prt")
+
+It can also run in its own process::
+
+    python -m creopyson.fakeserver --port 9056 --latency 0.002
+
+Only a subset of the CREOSON commands is simulated, other commands return
+a CREOSON error.
+"""
+import argparse
+import base64
+import copy
+import fnmatch
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .connection import Client
+
+IDENTITY = {
+    "origin": {"x": 0.0, "y": 0.0, "z": 0.0},
+    "x_axis": {"x": 1.0, "y": 0.0, "z": 0.0},
+    "y_axis": {"x": 0.0, "y": 1.0, "z": 0.0},
+    "z_axis": {"x": 0.0, "y": 0.0, "z": 1.0},
+}
+
+PARAM_TYPES = {bool: "BOOL", int: "INTEGER", float: "DOUBLE", str: "STRING"}
+
+HANDLERS = {}
+
+
+class CreosonError(Exception):
+    """Raised by a handler to return a CREOSON error status."""
+
+    pass
+
+
+def handler(command, function):
+    """Register a Session method as the handler of command/function."""
+
+    def decorator(method):
+        HANDLERS[(command, function)] = method
+        return method
+
+    return decorator
+
+
+def _match(pattern, name):
+    """Case insensitive wildcard match, `None` matches everything."""
+    return pattern is None or fnmatch.fnmatch(name.lower(), pattern.lower())
+
+
+def _names(data):
+    """Return the `name`/`names` filters of a request as a list."""
+    if data.get("names") is not None:
+        return data["names"]
+    if data.get("name") is not None:
+        return [data["name"]]
+    return None
+
+
+def _encode(text):
+    """Return a text Base64-encoded, as CREOSON does."""
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+def translation(x=0.0, y=0.0, z=0.0):
+    """Return a JLTransform translating by x, y, z.
+
+    Args:
+        x (float): X translation.
+        y (float): Y translation.
+        z (float): Z translation.
+
+    Returns:
+        (dict): JLTransform.
+
+    """
+    transform = copy.deepcopy(IDENTITY)
+    transform["origin"] = {"x": float(x), "y": float(y), "z": float(z)}
+    return transform
+
+
+def _place(parent, transform):
+    """Return a JLTransform relative to its parent, relative to the top."""
+    axes = [parent[axis] for axis in ("x_axis", "y_axis", "z_axis")]
+
+    def rotate(vector):
+        return {
+            key: sum(axis[key] * vector[name] for axis, name in zip(axes, "xyz"))
+            for key in "xyz"
+        }
+
+    result = {axis: rotate(transform[axis]) for axis in ("x_axis", "y_axis", "z_axis")}
+    origin = rotate(transform["origin"])
+    result["origin"] = {key: origin[key] + parent["origin"][key] for key in "xyz"}
+    return result
+
+
+class Model(object):
+    """A model of the simulated session."""
+
+    def __init__(
+        self,
+        name,
+        parameters=None,
+        dimensions=None,
+        children=None,
+        instances=None,
+        features=None,
+        views=None,
+        dirname="C:/fake/",
+    ):
+        self.name = name
+        self.dirname = dirname
+        self.parameters = {}
+        for param_name, value in (parameters or {}).items():
+            self.set_parameter(param_name, value)
+        self.dimensions = {}
+        # {dimension name: list_detail fields other than name and value}
+        self.dimension_details = {}
+        for dim_name, value in (dimensions or {}).items():
+            if isinstance(value, dict):
+                details = dict(value)
+                value = details.pop("value")
+                self.dimension_details[dim_name] = details
+            self.dimensions[dim_name] = float(value)
+        self.views = [dict(view) for view in (views or [])]
+        # list of (file name, JLTransform) components.
+        self.children = [
+            (child, IDENTITY) if isinstance(child, str) else tuple(child)
+            for child in (children or [])
+        ]
+        self.instances = list(instances or [])
+        self.features = [
+            {"name": feat, "status": "ACTIVE", "type": "PROTRUSION"}
+            if isinstance(feat, str)
+            else dict(feat)
+            for feat in (features or [])
+        ]
+        for number, feat in enumerate(self.features, 1):
+            feat.setdefault("feat_id", number)
+            feat.setdefault("feat_number", number)
+            feat.setdefault("status", "ACTIVE")
+            feat.setdefault("type", "PROTRUSION")
+        self.length_units = "mm"
+        self.mass_units = "kg"
+        self.regenerated = 0
+        self.saved = 0
+
+    def set_parameter(self, name, value, type_=None, designate=False, description=""):
+        """Create or change a parameter."""
+        if type_ is None:
+            type_ = PARAM_TYPES.get(type(value), "STRING")
+        self.parameters[name.upper()] = {
+            "name": name.upper(),
+            "type": type_,
+            "value": value,
+            "designate": designate,
+            "description": description,
+            "encoded": False,
+            "owner_name": self.name,
+        }
+
+
+class Session(object):
+    """Simulated Creo session, answering CREOSON requests."""
+
+    def __init__(self):
+        self.models = {}
+        self.sessions = set()
+        self.active = None
+        self.windows = []
+        self.running = True
+        self.working_dir = "C:/fake/"
+        self.lock = threading.Lock()
+
+    def add_model(self, name, **kwargs):
+        """Add a model to the session, see `Model` for arguments."""
+        model = Model(name, **kwargs)
+        self.models[name.lower()] = model
+        return model
+
+    def model(self, data, required=True):
+        """Return the model named by `file` in request data."""
+        name = data.get("file")
+        if name is None:
+            if self.active is None:
+                raise CreosonError("No active model")
+            name = self.active
+        model = self.models.get(name.lower())
+        if model is None and required:
+            raise CreosonError("Could not find model: {}".format(name))
+        return model
+
+    def handle(self, request):
+        """Return the CREOSON result of a request."""
+        command, function = request.get("command"), request.get("function")
+        method = HANDLERS.get((command, function))
+        if method is None:
+            return self.error("Unsupported command: {}/{}".format(command, function))
+        if command != "connection" and request.get("sessionId") not in self.sessions:
+            return self.error("Invalid session ID")
+        try:
+            with self.lock:
+                result = method(self, request.get("data") or {})
+        except CreosonError as e:
+            return self.error(str(e))
+        if command == "connection" and function == "connect":
+            self.sessions.add(result)
+            return {"status": {"error": False}, "sessionId": result}
+        if command == "connection" and function == "disconnect":
+            self.sessions.discard(request.get("sessionId"))
+        response = {"status": {"error": False}}
+        if result is not None:
+            response["data"] = result
+        return response
+
+    def error(self, message):
+        """Return a CREOSON error result."""
+        return {"status": {"error": True, "message": message}}
+
+    # connection
+
+    @handler("connection", "connect")
+    def connect(self, data):
+        return uuid.uuid4().hex
+
+    @handler("connection", "disconnect")
+    def disconnect(self, data):
+        pass
+
+    @handler("connection", "is_creo_running")
+    def is_creo_running(self, data):
+        return {"running": self.running}
+
+    @handler("connection", "start_creo")
+    def start_creo(self, data):
+        self.running = True
+
+    @handler("connection", "stop_creo")
+    @handler("connection", "kill_creo")
+    def stop_creo(self, data):
+        self.running = False
+        self.active = None
+        self.windows = []
+
+    # creo
+
+    @handler("creo", "pwd")
+    def creo_pwd(self, data):
+        return {"dirname": self.working_dir}
+
+    @handler("creo", "cd")
+    def creo_cd(self, data):
+        self.working_dir = data["dirname"]
+        return {"dirname": self.working_dir}
+
+    @handler("creo", "list_files")
+    def creo_list_files(self, data):
+        return {
+            "filelist": sorted(
+                m.name for m in self.models.values() if _match(data.get("filename"), m.name)
+            )
+        }
+
+    # file
+
+    @handler("file", "open")
+    def file_open(self, data):
+        names = data.get("files") or [data.get("file")]
+        models = [self.models.get(name.lower()) for name in names if name]
+        if not models or None in models:
+            raise CreosonError("Could not find file: {}".format(names))
+        if data.get("display", True) or data.get("activate", True):
+            for model in models:
+                if model.name not in self.windows:
+                    self.windows.append(model.name)
+            self.active = models[-1].name
+        return {
+            "dirname": models[0].dirname,
+            "files": [m.name for m in models],
+            "revision": 1,
+        }
+
+    @handler("file", "exists")
+    def file_exists(self, data):
+        return {"exists": data["file"].lower() in self.models}
+
+    @handler("file", "get_active")
+    def file_get_active(self, data):
+        if self.active is None:
+            return None
+        model = self.models[self.active.lower()]
+        return {"dirname": model.dirname, "file": model.name}
+
+    @handler("file", "list")
+    def file_list(self, data):
+        patterns = data.get("files") or [data.get("file")]
+        return {
+            "files": sorted(
+                m.name
+                for m in self.models.values()
+                if any(_match(p, m.name) for p in patterns)
+            )
+        }
+
+    @handler("file", "display")
+    def file_display(self, data):
+        model = self.model(data)
+        if model.name not in self.windows:
+            self.windows.append(model.name)
+        self.active = model.name
+
+    @handler("file", "close_window")
+    def file_close_window(self, data):
+        model = self.model(data)
+        if model.name in self.windows:
+            self.windows.remove(model.name)
+        if self.active == model.name:
+            self.active = self.windows[-1] if self.windows else None
+
+    @handler("file", "erase")
+    def file_erase(self, data):
+        self.file_close_window(data)
+
+    @handler("file", "save")
+    def file_save(self, data):
+        self.model(data).saved += 1
+
+    @handler("file", "regenerate")
+    def file_regenerate(self, data):
+        self.model(data).regenerated += 1
+
+    @handler("file", "massprops")
+    def file_massprops(self, data):
+        model = self.model(data)
+        volume = 1.0
+        for value in model.dimensions.values():
+            volume *= value
+        return {
+            "volume": volume,
+            "mass": volume * 7.85e-6,
+            "density": 7.85e-6,
+            "surface_area": 0.0,
+        }
+
+    @handler("file", "get_length_units")
+    def file_get_length_units(self, data):
+        return {"units": self.model(data).length_units}
+
+    @handler("file", "set_length_units")
+    def file_set_length_units(self, data):
+        self.model(data).length_units = data["units"]
+
+    @handler("file", "get_mass_units")
+    def file_get_mass_units(self, data):
+        return {"units": self.model(data).mass_units}
+
+    @handler("file", "set_mass_units")
+    def file_set_mass_units(self, data):
+        self.model(data).mass_units = data["units"]
+
+    # geometry
+
+    @handler("geometry", "bound_box")
+    def geometry_bound_box(self, data):
+        model = self.model(data)
+        values = list(model.dimensions.values()) + [0.0, 0.0, 0.0]
+        return {
+            "xmin": 0.0, "xmax": values[0],
+            "ymin": 0.0, "ymax": values[1],
+            "zmin": 0.0, "zmax": values[2],
+        }
+
+    # parameter
+
+    @handler("parameter", "list")
+    def parameter_list(self, data):
+        names = _names(data)
+        result = []
+        for param in self.model(data).parameters.values():
+            if names is not None and not any(_match(n, param["name"]) for n in names):
+                continue
+            if data.get("value") is not None and str(param["value"]) != data["value"]:
+                continue
+            param = dict(param)
+            if isinstance(param["value"], str) and (
+                data.get("encoded") or not param["value"].isascii()
+            ):
+                param["value"] = _encode(param["value"])
+                param["encoded"] = True
+            result.append(param)
+        return {"paramlist": result}
+
+    @handler("parameter", "exists")
+    def parameter_exists(self, data):
+        names = _names(data)
+        params = self.model(data).parameters
+        if names is None:
+            return {"exists": bool(params)}
+        return {"exists": all(n.upper() in params for n in names)}
+
+    @handler("parameter", "set")
+    def parameter_set(self, data):
+        model = self.model(data)
+        name = data["name"].upper()
+        value = data.get("value")
+        if data.get("encoded"):
+            value = base64.b64decode(value).decode("utf-8")
+        param = model.parameters.get(name)
+        if param is None:
+            if data.get("no_create"):
+                raise CreosonError("Parameter not found: {}".format(name))
+            model.set_parameter(name, value, data.get("type"))
+            param = model.parameters[name]
+        else:
+            param["value"] = value
+            if data.get("type") is not None:
+                param["type"] = data["type"]
+        if data.get("designate") is not None:
+            param["designate"] = data["designate"]
+        if data.get("description") is not None:
+            param["description"] = data["description"]
+
+    @handler("parameter", "set_designated")
+    def parameter_set_designated(self, data):
+        model = self.model(data)
+        param = model.parameters.get(data["name"].upper())
+        if param is None:
+            raise CreosonError("Parameter not found: {}".format(data["name"]))
+        param["designate"] = data["designate"]
+
+    @handler("parameter", "delete")
+    def parameter_delete(self, data):
+        params = self.model(data).parameters
+        for name in [n for n in params if _match(data["name"], n)]:
+            del params[name]
+
+    # dimension
+
+    def _dimensions(self, data):
+        names = _names(data)
+        model = self.model(data)
+        for name, value in model.dimensions.items():
+            if names is None or any(_match(n, name) for n in names):
+                yield name, value
+
+    @handler("dimension", "list")
+    def dimension_list(self, data):
+        encoded = bool(data.get("encoded"))
+        return {
+            "dimlist": [
+                {
+                    "name": name,
+                    "value": _encode(str(value)) if encoded else value,
+                    "encoded": encoded,
+                    "dwg_dim": False,
+                }
+                for name, value in self._dimensions(data)
+            ]
+        }
+
+    @handler("dimension", "list_detail")
+    def dimension_list_detail(self, data):
+        model = self.model(data)
+        dims = []
+        for name, value in self._dimensions(data):
+            dim = {
+                "name": name,
+                "value": value,
+                "encoded": False,
+                "dwg_dim": False,
+                "sheet": 1,
+                "view_name": "MAIN",
+                "dim_type": "linear",
+                "text": "@D",
+                "location": {"x": 0.0, "y": 0.0, "z": 0.0},
+                "tolerance_type": "plus_minus",
+                "tol_plus": 0.1,
+                "tol_minus": 0.1,
+            }
+            dim.update(model.dimension_details.get(name, {}))
+            if data.get("dim_type") is not None and dim["dim_type"] != data["dim_type"]:
+                continue
+            if data.get("encoded"):
+                dim["value"] = _encode(str(value))
+                dim["encoded"] = True
+            dims.append(dim)
+        return {"dimlist": dims}
+
+    @handler("dimension", "set")
+    def dimension_set(self, data):
+        model = self.model(data)
+        name = data["name"]
+        if name not in model.dimensions:
+            raise CreosonError("Dimension not found: {}".format(name))
+        value = data["value"]
+        if data.get("encoded"):
+            value = base64.b64decode(value).decode("utf-8")
+        try:
+            model.dimensions[name] = float(value)
+        except (TypeError, ValueError):
+            raise CreosonError("Invalid value for dimension {}".format(name))
+
+    # drawing
+
+    @handler("drawing", "list_view_details")
+    def drawing_list_view_details(self, data):
+        model = self.model({"file": data.get("drawing")})
+        views = []
+        for view in model.views:
+            if _match(data.get("view"), view["name"]):
+                details = {
+                    "sheet": 1,
+                    "location": {"x": 0.0, "y": 0.0, "z": 0.0},
+                    "text_height": 3.5,
+                    "view_model": None,
+                    "simp_rep": None,
+                }
+                details.update(view)
+                views.append(details)
+        return {"views": views}
+
+    # bom
+
+    def _bom_node(self, name, seq_path, path, transform, data, depth):
+        # like CREOSON, transforms are relative to the requested assembly
+        node = {"file": name, "seq_path": seq_path}
+        if data.get("paths") and path:
+            node["path"] = path
+        if data.get("get_transforms"):
+            node["transform"] = transform
+        model = self.models.get(name.lower())
+        if model is not None and model.children and (depth == 0 or not data.get("top_level")):
+            node["children"] = [
+                self._bom_node(
+                    child,
+                    "{}.{}".format(seq_path, index),
+                    path + [index],
+                    _place(transform, child_transform),
+                    data,
+                    depth + 1,
+                )
+                for index, (child, child_transform) in enumerate(model.children, 1)
+            ]
+        return node
+
+    @handler("bom", "get_paths")
+    def bom_get_paths(self, data):
+        model = self.model(data)
+        return {
+            "file": model.name,
+            "generic": "",
+            "has_simprep": False,
+            "children": self._bom_node(model.name, "root", [], IDENTITY, data, 0),
+        }
+
+    # family table
+
+    @handler("familytable", "list")
+    def familytable_list(self, data):
+        model = self.model(data)
+        return {
+            "instances": [
+                row["name"] for row in model.instances if _match(data.get("instance"), row["name"])
+            ]
+        }
+
+    @handler("familytable", "get_header")
+    def familytable_get_header(self, data):
+        model = self.model(data)
+        columns = []
+        for row in model.instances[:1]:
+            for key, value in row.items():
+                if key != "name":
+                    columns.append({"colid": key, "type": PARAM_TYPES.get(type(value), "STRING")})
+        return {"columns": columns}
+
+    @handler("familytable", "get_row")
+    def familytable_get_row(self, data):
+        model = self.model(data)
+        for row in model.instances:
+            if row["name"].lower() == data["instance"].lower():
+                return {
+                    "columns": {
+                        key: {"colid": key, "value": value}
+                        for key, value in row.items()
+                        if key != "name"
+                    }
+                }
+        raise CreosonError("Instance not found: {}".format(data["instance"]))
+
+    # feature
+
+    def _features(self, data):
+        model = self.model(data)
+        return [
+            feat
+            for feat in model.features
+            if _match(data.get("name"), feat["name"])
+            and _match(data.get("status"), feat["status"])
+            and _match(data.get("type"), feat["type"])
+        ]
+
+    @handler("feature", "list")
+    def feature_list(self, data):
+        featlist = []
+        for feat in self._features(data):
+            feat = dict(feat)
+            if not data.get("paths"):
+                feat.pop("feat_id", None)
+                feat.pop("feat_number", None)
+            for key in ("group_name", "pattern_name"):
+                feat.pop(key, None)
+            featlist.append(feat)
+        return {"featlist": featlist}
+
+    @handler("feature", "list_group_features")
+    def feature_list_group_features(self, data):
+        return {
+            "featlist": [
+                {"name": f["name"], "status": f["status"], "type": f["type"]}
+                for f in self.model(data).features
+                if f.get("group_name") == data["group_name"]
+                and _match(data.get("type"), f["type"])
+            ]
+        }
+
+    @handler("feature", "list_pattern_features")
+    def feature_list_pattern_features(self, data):
+        return {
+            "featlist": [
+                {"name": f["name"], "status": f["status"], "type": f["type"]}
+                for f in self.model(data).features
+                if f.get("pattern_name") == data["pattern_name"]
+                and _match(data.get("type"), f["type"])
+            ]
+        }
+
+    @handler("feature", "suppress")
+    def feature_suppress(self, data):
+        for feat in self._features(dict(data, status=None)):
+            feat["status"] = "SUPPRESSED"
+
+    @handler("feature", "resume")
+    def feature_resume(self, data):
+        for feat in self._features(dict(data, status=None)):
+            if feat["status"] == "SUPPRESSED":
+                feat["status"] = "ACTIVE"
+
+    @handler("feature", "delete")
+    def feature_delete(self, data):
+        model = self.model(data)
+        deleted = self._features(dict(data, status=None))
+        model.features = [f for f in model.features if f not in deleted]
+
+    @handler("feature", "rename")
+    def feature_rename(self, data):
+        for feat in self.model(data).features:
+            if feat["name"].lower() == data["name"].lower():
+                feat["name"] = data["new_name"]
+                return
+        raise CreosonError("Feature not found: {}".format(data["name"]))
+
+    # server
+
+    @handler("server", "pwd")
+    def server_pwd(self, data):
+        return {"dirname": "C:/CreosonServer"}
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        fake = self.server.fake
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with fake._lock:
+            fake.requests += 1
+        if self.path not in ("/creoson", "/server"):
+            self.send_error(404)
+            return
+        with fake._lock:
+            fake.in_flight += 1
+            fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            try:
+                request = json.loads(body)
+            except ValueError:
+                response = fake.session.error("Invalid JSON request")
+            else:
+                if fake.latency:
+                    time.sleep(fake.latency)
+                response = fake.session.handle(request)
+                if fake.processing:
+                    with fake.session.lock:
+                        time.sleep(fake.processing)
+        finally:
+            with fake._lock:
+                fake.in_flight -= 1
+        content = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeCreoson(object):
+    """Creates a fake CREOSON HTTP server running in a thread."""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, processing=0.0):
+        """Create the server, call `start()` or use it as context manager.
+
+        Args:
+            host (str, optional):
+                Listening address. Defaults to `127.0.0.1`.
+            port (int, optional):
+                Listening port, 0 picks a free port. Defaults to 0.
+            latency (float, optional):
+                Seconds added to each request, concurrent requests overlap
+                (network time). Defaults to 0.
+            processing (float, optional):
+                Seconds added to each request, one request at a time
+                (Creo is single-threaded). Defaults to 0.
+
+        """
+        self.session = Session()
+        self.latency = latency
+        self.processing = processing
+        self.requests = 0
+        # requests being answered, and the most at once (client concurrency),
+        # updated under `_lock` by the handler threads
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+
+    def __enter__(self):
+        """Start the server."""
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the server."""
+        self.stop()
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self.httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.httpd.server_close()
+
+    def add_model(self, name, **kwargs):
+        """Add a model to the simulated session.
+
+        Args:
+            name (str):
+                File name (ie. `box.prt`).
+            parameters (dict, optional):
+                Parameter name: value.
+            dimensions (dict, optional):
+                Dimension name: value, or a dict with value and other
+                `dimension_list_detail` fields (ie. view_name, sheet).
+            children (list, optional):
+                Component file names, or (file name, JLTransform) tuples,
+                the transform placing the component in this assembly.
+            instances (list:dict, optional):
+                Family table rows, each with a `name` key.
+            features (list, optional):
+                Feature names, or dicts with name, status, type,
+                group_name and pattern_name.
+            views (list:dict, optional):
+                Drawing views, dicts with name and optionally sheet,
+                location, text_height, view_model and simp_rep.
+
+        Returns:
+            (obj): simulated Model.
+
+        """
+        return self.session.add_model(name, **kwargs)
+
+    def add_assembly(self, name, breadth, depth, parameters=None):
+        """Add a generated assembly tree.
+
+        Each assembly has `breadth` components, down to `depth` levels;
+        leaves are parts. The whole tree has `breadth ** depth` parts.
+
+        Args:
+            name (str):
+                Top-level assembly name, without extension.
+            breadth (int):
+                Number of components of each assembly.
+            depth (int):
+                Number of levels.
+            parameters (dict, optional):
+                Parameters added to every model.
+
+        Returns:
+            (list:str): all the file names, the top-level assembly first.
+
+        """
+        names = []
+
+        def build(model_name, level):
+            if level == depth:
+                file_name = model_name + ".prt"
+                self.add_model(
+                    file_name, parameters=parameters, dimensions={"d0": 10.0}
+                )
+                names.append(file_name)
+                return file_name
+            file_name = model_name + ".asm"
+            names.append(file_name)
+            children = [
+                (build("{}_{}".format(model_name, i), level + 1), translation(x=10.0 * i))
+                for i in range(1, breadth + 1)
+            ]
+            self.add_model(file_name, parameters=parameters, children=children)
+            return file_name
+
+        build(name, 0)
+        return names
+
+    def client(self, **kwargs):
+        """Return a creopyson Client for this server."""
+        return Client(self.host, self.port, **kwargs)
+
+
+def main(argv=None):
+    """Run a fake CREOSON server until interrupted."""
+    parser = argparse.ArgumentParser(description="Fake CREOSON server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9056)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--processing", type=float, default=0.0)
+    parser.add_argument(
+        "--assembly",
+        nargs=2,
+        type=int,
+        metavar=("BREADTH", "DEPTH"),
+        help="add a generated `top.asm` assembly",
+    )
+    args = parser.parse_args(argv)
+    server = FakeCreoson(args.host, args.port, args.latency, args.processing)
+    if args.assembly:
+        server.add_assembly("top", *args.assembly)
+    print("Fake CREOSON listening on {}:{}".format(server.host, server.port))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
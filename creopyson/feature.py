@@ -98,6 +98,36 @@ def delete_param(client, name=None, file_=None, param=None):
     return client._creoson_post("feature", "delete_param", data)
 
 
+def index(client, file_=None, groups=(), patterns=(), inc_unnamed=False):
+    """Get the features of a model, indexed for queries without requests.
+
+    See `featuretree` module.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        `file_` (str, optional):
+            File name. Defaults is the currently active model.
+        groups (list:str, optional):
+            Groups listed with the features, for `group` queries.
+            Defaults is none (listed on first query).
+        patterns (list:str, optional):
+            Patterns listed with the features, for `pattern` queries.
+            Defaults is none (listed on first query).
+        inc_unnamed (boolean, optional):
+            Whether to index unnamed features. Defaults is False.
+
+    Returns:
+        (obj:FeatureIndex): the features of the model.
+
+    """
+    from .featuretree import FeatureIndex
+
+    features = FeatureIndex(client, file_, groups, patterns, inc_unnamed)
+    features.update()
+    return features
+
+
 def list_(
     client,
     file_=None,
@@ -345,7 +375,7 @@ def list_pattern_features(client, patter_name, type_=None, file_=None):
 
     """
     data = {
-        "patter_name": patter_name,
+        "pattern_name": patter_name,
     }
     if file_ is not None:
         data["file"] = file_
@@ -355,7 +385,7 @@ def list_pattern_features(client, patter_name, type_=None, file_=None):
             data["file"] = active_file["file"]
     if type_ is not None:
         data["type"] = type_
-    return client._creoson_post("feature", "list_group_features", data, "featlist")
+    return client._creoson_post("feature", "list_pattern_features", data, "featlist")
 
 
 def list_selected(client):
@@ -0,0 +1,418 @@
+"""Feature tree module.
+
+Index the features of a model, listed once, and query them without sending
+a request for each filter::
+
+    index = c.feature_index("box.prt", groups=["HOLES"])
+    index.query(status="SUPPRESSED")
+    index.query(type_="HOLE", group="HOLES")
+    index.names(name="CUT*", status="ACTIVE")
+
+Features are indexed by status, type, name, and by group and pattern once
+these are listed (`groups`, `patterns`, or on first query). Changes sent
+through the index (`suppress`, `resume`, `delete`, `rename`) update it:
+in place when their result is known, else by listing the suppressed
+features only (suppress with `clip` or `with_children`) or every feature
+(delete with `clip`) before the next query.
+"""
+import fnmatch
+import inspect
+
+# pending refreshes
+_SUPPRESSED = "suppressed"
+_ALL = "all"
+_WILDCARDS = frozenset("*?[")
+
+
+def _keys(index, patterns, lowered=False):
+    """Return the keys of an index matching patterns, case insensitive.
+
+    `lowered` tells that the keys are lower case, so names without
+    wildcards are looked up directly.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    keys = []
+    for pattern in patterns:
+        pattern = pattern.lower()
+        if _WILDCARDS.isdisjoint(pattern):
+            if lowered:
+                keys.extend([pattern] if pattern in index else [])
+            else:
+                keys.extend(key for key in index if key.lower() == pattern)
+        else:
+            keys.extend(key for key in index if fnmatch.fnmatch(key.lower(), pattern))
+    return keys
+
+
+class FeatureIndex(object):
+    """Features of a model indexed by status, type, name, group and pattern."""
+
+    def __init__(self, client, file_=None, groups=(), patterns=(), inc_unnamed=False):
+        """Create an index, filled by `update()` or `update_async()`.
+
+        Args:
+            client (obj):
+                creopyson Client or AsyncClient.
+            `file_` (str, optional):
+                Model name. Defaults is the active model when updated.
+            groups (list:str, optional):
+                Groups listed with the features. Defaults is none.
+            patterns (list:str, optional):
+                Patterns listed with the features. Defaults is none.
+            inc_unnamed (bool, optional):
+                Whether unnamed features are indexed. Defaults is False.
+
+        """
+        self.client = client
+        self.file = file_
+        self.inc_unnamed = inc_unnamed
+        # {feat_id: feature}, in the model order
+        self.features = {}
+        self.groups = {}
+        self.patterns = {}
+        self.requests = 0
+        self._position = {}
+        self._by_status = {}
+        self._by_type = {}
+        self._by_name = {}
+        self._pending = {_ALL}
+        self._groups = list(groups)
+        self._patterns = list(patterns)
+
+    def __len__(self):
+        """Return the number of features."""
+        self._refresh()
+        return len(self.features)
+
+    def __repr__(self):
+        """Return the model and the number of features."""
+        return "<FeatureIndex {}: {} features>".format(self.file, len(self.features))
+
+    def __contains__(self, name):
+        """Check whether a feature name or id is in the model."""
+        self._refresh()
+        return self._id(name) is not None
+
+    def __getitem__(self, name):
+        """Return a feature by name or id.
+
+        Raises:
+            KeyError: feature not found.
+
+        """
+        self._refresh()
+        feat_id = self._id(name)
+        if feat_id is None:
+            raise KeyError("Feature {} not found in {}".format(name, self.file))
+        return self.features[feat_id]
+
+    def _id(self, name):
+        if isinstance(name, int):
+            return name if name in self.features else None
+        return self._by_name.get(name.lower())
+
+    # index maintenance
+
+    def _add(self, feat, position):
+        feat_id = feat["feat_id"]
+        self.features[feat_id] = feat
+        self._position[feat_id] = position
+        self._by_status.setdefault(feat["status"], set()).add(feat_id)
+        self._by_type.setdefault(feat["type"], set()).add(feat_id)
+        if feat.get("name"):
+            self._by_name[feat["name"].lower()] = feat_id
+
+    def _remove(self, feat_id):
+        feat = self.features.pop(feat_id)
+        del self._position[feat_id]
+        self._by_status[feat["status"]].discard(feat_id)
+        self._by_type[feat["type"]].discard(feat_id)
+        if feat.get("name"):
+            self._by_name.pop(feat["name"].lower(), None)
+        for members in list(self.groups.values()) + list(self.patterns.values()):
+            members.discard(feat_id)
+
+    def _set_status(self, feat_id, status):
+        feat = self.features[feat_id]
+        if feat["status"] != status:
+            self._by_status[feat["status"]].discard(feat_id)
+            self._by_status.setdefault(status, set()).add(feat_id)
+            feat["status"] = status
+
+    def _load(self, feats):
+        """Index a `feature_list` result, replacing the features."""
+        self.features = {}
+        self._position = {}
+        self._by_status = {}
+        self._by_type = {}
+        self._by_name = {}
+        for position, feat in enumerate(feats):
+            self._add(dict(feat), position)
+        for members in list(self.groups.values()) + list(self.patterns.values()):
+            members.intersection_update(self.features)
+
+    def _load_suppressed(self, feats):
+        """Update the statuses from the list of suppressed features."""
+        suppressed = set()
+        for feat in feats:
+            if feat["feat_id"] in self.features:
+                suppressed.add(feat["feat_id"])
+                self._set_status(feat["feat_id"], feat["status"])
+        for feat_id in list(self._by_status.get("SUPPRESSED", ())):
+            if feat_id not in suppressed:
+                self._set_status(feat_id, "ACTIVE")
+
+    def _members(self, feats):
+        ids = (self._by_name.get((feat.get("name") or "").lower()) for feat in feats)
+        return {feat_id for feat_id in ids if feat_id is not None}
+
+    def _requests(self):
+        """Return the (client method, kwargs) of the pending refreshes."""
+        requests = []
+        if _ALL in self._pending:
+            requests.append(("feature_list", {
+                "file_": self.file, "paths": True, "inc_unnamed": self.inc_unnamed
+            }))
+        elif _SUPPRESSED in self._pending:
+            requests.append(("feature_list", {
+                "file_": self.file,
+                "status": "SUPPRESSED",
+                "paths": True,
+                "inc_unnamed": self.inc_unnamed,
+            }))
+        for group in self._groups:
+            requests.append(("feature_list_group_features", {
+                "group_name": group, "file_": self.file
+            }))
+        for pattern in self._patterns:
+            requests.append(("feature_list_pattern_features", {
+                "patter_name": pattern, "file_": self.file
+            }))
+        return requests
+
+    def _apply(self, results):
+        """Update the index with the results of `_requests()`."""
+        results = list(results)
+        if _ALL in self._pending:
+            self._load(results.pop(0))
+        elif _SUPPRESSED in self._pending:
+            self._load_suppressed(results.pop(0))
+        self._pending = set()
+        for group in self._groups:
+            self.groups[group] = self._members(results.pop(0))
+        for pattern in self._patterns:
+            self.patterns[pattern] = self._members(results.pop(0))
+        self._groups = []
+        self._patterns = []
+
+    # sending
+
+    def update(self):
+        """Send the pending refreshes, in a batch, with a Client."""
+        client = self.client
+        if self.file is None:
+            self.file = (client.file_get_active() or {}).get("file")
+        requests = self._requests()
+        if not requests:
+            return
+        with client.batch():
+            futures = [getattr(client, method)(**kwargs) for method, kwargs in requests]
+        self.requests += len(requests)
+        self._apply(future.result() for future in futures)
+
+    async def update_async(self):
+        """Send the pending refreshes with an AsyncClient."""
+        from .aio import gather
+
+        client = self.client
+        if self.file is None:
+            self.file = ((await client.file_get_active()) or {}).get("file")
+        requests = self._requests()
+        if not requests:
+            return
+        results = await gather(
+            *(getattr(client, method)(**kwargs) for method, kwargs in requests)
+        )
+        self.requests += len(requests)
+        self._apply(results)
+
+    def _refresh(self):
+        if self._pending or self._groups or self._patterns:
+            if not inspect.iscoroutinefunction(self.client.connect):
+                self.update()
+            else:
+                raise RuntimeError(
+                    "FeatureIndex is not up to date, await index.update_async() first."
+                )
+
+    # queries
+
+    def query(self, name=None, status=None, type_=None, group=None, pattern=None):
+        """Return the features matching every given filter, in the model order.
+
+        Args:
+            name (str|list:str, optional):
+                Feature names (wildcards allowed).
+            status (str|list:str, optional):
+                Feature statuses (wildcards allowed), see `feature.STATUS_LIST`.
+            `type_` (str|list:str, optional):
+                Feature types (wildcards allowed).
+            group (str, optional):
+                Group name, listed on first use.
+            pattern (str, optional):
+                Pattern name, listed on first use.
+
+        Returns:
+            (list:dict): features, with name, status, type, feat_id and
+                feat_number. Do not change them.
+
+        """
+        if group is not None and group not in self.groups:
+            self._groups.append(group)
+        if pattern is not None and pattern not in self.patterns:
+            self._patterns.append(pattern)
+        self._refresh()
+        selected = None
+        for index, patterns in (
+            (self._by_status, status),
+            (self._by_type, type_),
+            (self._by_name, name),
+        ):
+            if patterns is None:
+                continue
+            ids = set()
+            if index is self._by_name:
+                ids.update(index[key] for key in _keys(index, patterns, lowered=True))
+            else:
+                for key in _keys(index, patterns):
+                    ids |= index[key]
+            selected = ids if selected is None else selected & ids
+        for members in (
+            self.groups.get(group) if group is not None else None,
+            self.patterns.get(pattern) if pattern is not None else None,
+        ):
+            if members is not None:
+                selected = set(members) if selected is None else selected & members
+        if selected is None:
+            return list(self.features.values())
+        return [self.features[i] for i in sorted(selected, key=self._position.__getitem__)]
+
+    def names(self, **filters):
+        """Return the names of the features matching the filters, see `query`."""
+        return [feat.get("name") for feat in self.query(**filters)]
+
+    def count(self, **filters):
+        """Return the number of features matching the filters, see `query`."""
+        return len(self.query(**filters))
+
+    # changes
+
+    def _targets(self, name, status, type_):
+        if isinstance(name, int):
+            return [name] if name in self.features else []
+        return [feat["feat_id"] for feat in self.query(name=name, status=status, type_=type_)]
+
+    def _changed(self, function, targets, kwargs):
+        """Update the index after a change sent to Creo."""
+        if function == "suppress":
+            for feat_id in targets:
+                self._set_status(feat_id, "SUPPRESSED")
+            if kwargs.get("clip") is not False or kwargs.get("with_children") is not False:
+                self._pending.add(_SUPPRESSED)
+        elif function == "resume":
+            for feat_id in targets:
+                if self.features[feat_id]["status"] == "SUPPRESSED":
+                    self._set_status(feat_id, "ACTIVE")
+            if kwargs.get("with_children"):
+                self._pending.add(_SUPPRESSED)
+        elif function == "delete":
+            for feat_id in targets:
+                self._remove(feat_id)
+            if kwargs.get("clip"):
+                self._pending.add(_ALL)
+        elif function == "rename":
+            feat = self.features[targets[0]]
+            if feat.get("name"):
+                self._by_name.pop(feat["name"].lower(), None)
+            feat["name"] = kwargs["new_name"]
+            self._by_name[feat["name"].lower()] = targets[0]
+
+    def _prepare(self, function, name, status, type_, kwargs):
+        """Return the features changed by a command, and its arguments."""
+        if function == "rename":
+            feat_id = self._id(name)
+            if feat_id is None:
+                raise KeyError("Feature {} not found in {}".format(name, self.file))
+            return [feat_id], dict(kwargs, name=name)
+        targets = self._targets(name, status, type_)
+        return targets, dict(kwargs, name=name, status=status, type_=type_)
+
+    def _change(self, function, name=None, status=None, type_=None, **kwargs):
+        self._refresh()
+        targets, arguments = self._prepare(function, name, status, type_, kwargs)
+        getattr(self.client, "feature_" + function)(file_=self.file, **arguments)
+        self.requests += 1
+        self._changed(function, targets, kwargs)
+
+    async def _change_async(self, function, name=None, status=None, type_=None, **kwargs):
+        await self.update_async()
+        targets, arguments = self._prepare(function, name, status, type_, kwargs)
+        await getattr(self.client, "feature_" + function)(file_=self.file, **arguments)
+        self.requests += 1
+        self._changed(function, targets, kwargs)
+        await self.update_async()
+
+    def suppress(self, name=None, status=None, type_=None, clip=True, with_children=True):
+        """Suppress features and update the index, see `feature.suppress`.
+
+        The statuses are listed again before the next query if `clip` or
+        `with_children` is True (other features may be suppressed).
+        """
+        self._change(
+            "suppress", name, status, type_, clip=clip, with_children=with_children
+        )
+
+    def resume(self, name=None, status=None, type_=None, with_children=False):
+        """Resume features and update the index, see `feature.resume`.
+
+        The statuses are listed again before the next query if
+        `with_children` is True.
+        """
+        self._change("resume", name, status, type_, with_children=with_children)
+
+    def delete(self, name=None, status=None, type_=None, clip=None):
+        """Delete features and update the index, see `feature.delete`.
+
+        Every feature is listed again before the next query if `clip` is True.
+        """
+        self._change("delete", name, status, type_, clip=clip)
+
+    def rename(self, name, new_name):
+        """Rename a feature and update the index, see `feature.rename`.
+
+        Raises:
+            KeyError: feature not found.
+
+        """
+        self._change("rename", name, new_name=new_name)
+
+    async def suppress_async(
+        self, name=None, status=None, type_=None, clip=True, with_children=True
+    ):
+        """Suppress features with an AsyncClient, see `suppress`."""
+        await self._change_async(
+            "suppress", name, status, type_, clip=clip, with_children=with_children
+        )
+
+    async def resume_async(self, name=None, status=None, type_=None, with_children=False):
+        """Resume features with an AsyncClient, see `resume`."""
+        await self._change_async("resume", name, status, type_, with_children=with_children)
+
+    async def delete_async(self, name=None, status=None, type_=None, clip=None):
+        """Delete features with an AsyncClient, see `delete`."""
+        await self._change_async("delete", name, status, type_, clip=clip)
+
+    async def rename_async(self, name, new_name):
+        """Rename a feature with an AsyncClient, see `rename`."""
+        await self._change_async("rename", name, new_name=new_name)
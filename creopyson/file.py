@@ -284,6 +284,9 @@ def get_accuracy(client, file_=None):
 def get_active(client):
     """Get the active model from Creo.
 
+    If `client.cache_active_file` is set, the result is cached until a
+    command which changes the active model is sent.
+
     Args:
         client (obj): creopyson Client.
 
@@ -293,7 +296,12 @@ def get_active(client):
             file (str): File name of current model.
 
     """
-    return client._creoson_post("file", "get_active")
+    if client.cache_active_file and client._active_file:
+        return client._active_file
+    active_file = client._creoson_post("file", "get_active")
+    if client.cache_active_file:
+        client._active_file = active_file
+    return active_file
 
 
 def get_cur_material(client, file_=None):
@@ -0,0 +1,262 @@
+"""Instrument module.
+
+Hooks around each CREOSON request, with sinks to collect the timings::
+
+    from creopyson.instrument import CsvTrace, Histogram
+
+    histogram = Histogram()
+    c.add_hook(post=histogram)
+    c.add_hook(post=CsvTrace("trace.csv"))
+    ...
+    print(histogram.to_prometheus())
+
+A post hook is called with a `CallRecord` after each request, a pre hook with
+`(command, function, data)` before. Without hooks, requests are not timed.
+"""
+import csv
+import threading
+import time
+
+BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class CallRecord(object):
+    """Measures of one CREOSON request."""
+
+    __slots__ = (
+        "command",
+        "function",
+        "start",
+        "request_bytes",
+        "response_bytes",
+        "network_time",
+        "decode_time",
+        "status_code",
+        "error",
+    )
+
+    def __init__(self, command, function):
+        """Create an empty record.
+
+        Attributes:
+            command (str): Command param of the request.
+            function (str): Function param of the request.
+            start (float): Start time (seconds since the epoch).
+            request_bytes (int): Size of the request body.
+            response_bytes (int): Size of the response body.
+            network_time (float): Seconds from sending to response received.
+            decode_time (float): Seconds to decode and check the response.
+            status_code (int): HTTP status code, None without HTTP response
+                (connection error, or sent by a `transport`).
+            error (str): Exception name and message, None if succeeded.
+
+        """
+        self.command = command
+        self.function = function
+        self.start = time.time()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.status_code = None
+        self.error = None
+
+    @property
+    def total_time(self):
+        """float: network and decode time."""
+        return self.network_time + self.decode_time
+
+    def __repr__(self):
+        """Return a short description."""
+        return "<CallRecord {}/{} {:.1f} ms{}>".format(
+            self.command,
+            self.function,
+            self.total_time * 1000,
+            " error" if self.error else "",
+        )
+
+
+class _Stats(object):
+    __slots__ = (
+        "count", "errors", "network_time", "decode_time",
+        "request_bytes", "response_bytes", "buckets",
+    )
+
+    def __init__(self, size):
+        self.count = 0
+        self.errors = 0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.buckets = [0] * size
+
+
+class Histogram(object):
+    """In-memory sink: counts, sizes and time histogram per command."""
+
+    def __init__(self, buckets=BUCKETS):
+        """Create an empty histogram.
+
+        Args:
+            buckets (tuple:float, optional):
+                Upper bounds (seconds) of the time buckets.
+
+        """
+        self.buckets = tuple(buckets)
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        """Add a record."""
+        key = (record.command, record.function)
+        total = record.total_time
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = _Stats(len(self.buckets) + 1)
+            stats.count += 1
+            if record.error is not None:
+                stats.errors += 1
+            stats.network_time += record.network_time
+            stats.decode_time += record.decode_time
+            stats.request_bytes += record.request_bytes
+            stats.response_bytes += record.response_bytes
+            for index, bound in enumerate(self.buckets):
+                if total <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            stats.buckets[index] += 1
+
+    def clear(self):
+        """Forget every record."""
+        with self._lock:
+            self.stats = {}
+
+    def summary(self):
+        """Return the statistics per command, most time consuming first.
+
+        Returns:
+            (list:dict):
+                command, function, count, errors, network_time,
+                decode_time, request_bytes, response_bytes.
+
+        """
+        with self._lock:
+            rows = [
+                {
+                    "command": command,
+                    "function": function,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "network_time": stats.network_time,
+                    "decode_time": stats.decode_time,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                }
+                for (command, function), stats in self.stats.items()
+            ]
+        rows.sort(key=lambda row: row["network_time"] + row["decode_time"], reverse=True)
+        return rows
+
+    def to_prometheus(self, prefix="creopyson"):
+        """Return the statistics in Prometheus text exposition format.
+
+        Args:
+            prefix (str, optional): Metric names prefix.
+
+        Returns:
+            (str): metrics.
+
+        """
+        lines = [
+            "# TYPE {}_request_seconds histogram".format(prefix),
+        ]
+        counters = {
+            "request_errors_total": "errors",
+            "request_bytes_total": "request_bytes",
+            "response_bytes_total": "response_bytes",
+            "network_seconds_total": "network_time",
+            "decode_seconds_total": "decode_time",
+        }
+        with self._lock:
+            items = sorted(self.stats.items())
+            for (command, function), stats in items:
+                labels = 'command="{}",function="{}"'.format(command, function)
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    lines.append('{}_request_seconds_bucket{{{},le="{}"}} {}'.format(
+                        prefix, labels, bound, cumulative
+                    ))
+                lines.append("{}_request_seconds_sum{{{}}} {}".format(
+                    prefix, labels, stats.network_time + stats.decode_time
+                ))
+                lines.append("{}_request_seconds_count{{{}}} {}".format(
+                    prefix, labels, stats.count
+                ))
+            for name, attribute in counters.items():
+                lines.append("# TYPE {}_{} counter".format(prefix, name))
+                for (command, function), stats in items:
+                    lines.append('{}_{}{{command="{}",function="{}"}} {}'.format(
+                        prefix, name, command, function, getattr(stats, attribute)
+                    ))
+        return "\n".join(lines) + "\n"
+
+
+class CsvTrace(object):
+    """CSV sink: one row per request."""
+
+    FIELDS = (
+        "start",
+        "command",
+        "function",
+        "request_bytes",
+        "response_bytes",
+        "network_time",
+        "decode_time",
+        "status_code",
+        "error",
+    )
+
+    def __init__(self, file_):
+        """Open the trace and write the header.
+
+        Args:
+            `file_` (str|file object): CSV file path or text file object.
+
+        """
+        if hasattr(file_, "write"):
+            self._file = file_
+            self._owned = False
+        else:
+            self._file = open(file_, "w", newline="")
+            self._owned = True
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.FIELDS)
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        """Write a record."""
+        row = [getattr(record, field) for field in self.FIELDS]
+        with self._lock:
+            self._writer.writerow(row)
+
+    def __enter__(self):
+        """Return the trace itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the trace."""
+        self.close()
+
+    def close(self):
+        """Flush the trace, close the file if opened by the trace."""
+        with self._lock:
+            if self._owned:
+                self._file.close()
+            else:
+                self._file.flush()
@@ -1,5 +1,7 @@
 """Parameter module."""
 
+from collections import deque
+
 
 def copy(client, name, to_name, file_=None, to_file=None, designate=None):
     """Copy parameter to another in the same model or another model.
@@ -240,3 +242,186 @@ def set_designated(
         if active_file:
             data["file"] = active_file["file"]
     return client._creoson_post("parameter", "set_designated", data)
+
+
+def iter_many(
+    client,
+    files,
+    name=None,
+    encoded=None,
+    value=None,
+    workers=None,
+    return_exceptions=False,
+):
+    """Get the parameters of many models, fetched concurrently.
+
+    The models are read over the pooled connections, `workers` at a time,
+    and yielded in the order of `files` as soon as they are received. `files`
+    can be a generator (ie. of `bom_iter_paths`), it is read as needed.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        files (iterable:str):
+            Model names.
+        name (str|list:str, optional):
+            Parameter name; List of parameter names. Defaults is all.
+        encoded (boolean, optional):
+            Whether to return the values Base64-encoded. Defaults is False.
+        value (str, optional):
+            Parameter value filter. Defaults is `no filter`.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+        return_exceptions (boolean, optional):
+            Whether an error is yielded in place of the parameters of its
+            model instead of being raised. Defaults is False.
+
+    Yields:
+        (tuple): (file name, list of parameters, see `list_`).
+
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = workers or client.pool_size
+    files = iter(files)
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def submit():
+        for file_ in files:
+            window.append((file_, executor.submit(
+                list_, client, name=name, file_=file_, encoded=encoded, value=value
+            )))
+            return True
+        return False
+
+    try:
+        while len(window) < workers * 2 and submit():
+            pass
+        while window:
+            file_, future = window.popleft()
+            submit()
+            error = future.exception()
+            if error is None:
+                yield file_, future.result()
+            elif return_exceptions:
+                yield file_, error
+            else:
+                raise error
+    finally:
+        for _, future in window:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def list_many(client, files, name=None, encoded=None, value=None, workers=None):
+    """Get the parameters of many models, fetched concurrently.
+
+    See `iter_many`.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        files (iterable:str):
+            Model names.
+        name (str|list:str, optional):
+            Parameter name; List of parameter names. Defaults is all.
+        encoded (boolean, optional):
+            Whether to return the values Base64-encoded. Defaults is False.
+        value (str, optional):
+            Parameter value filter. Defaults is `no filter`.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+
+    Raises:
+        RuntimeError: error message from creoson (ie. model not found).
+
+    Returns:
+        (dict): {(file name, parameter name): parameter, see `list_`}.
+
+    """
+    return {
+        (file_, param["name"]): param
+        for file_, params in iter_many(
+            client, files, name=name, encoded=encoded, value=value, workers=workers
+        )
+        for param in params
+    }
+
+
+def list_table(client, files, name=None, encoded=None, value=None, workers=None):
+    """Get the parameters of many models as a table.
+
+    See `iter_many`.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        files (iterable:str):
+            Model names.
+        name (str|list:str, optional):
+            Parameter name; List of parameter names. Defaults is all.
+        encoded (boolean, optional):
+            Whether to return the values Base64-encoded. Defaults is False.
+        value (str, optional):
+            Parameter value filter. Defaults is `no filter`.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+
+    Raises:
+        RuntimeError: error message from creoson (ie. model not found).
+
+    Returns:
+        (obj:ParameterTable): one row per parameter, see `table` module.
+
+    """
+    from .table import ParameterTable
+
+    return ParameterTable.from_many(
+        iter_many(client, files, name=name, encoded=encoded, value=value, workers=workers)
+    )
+
+
+def sync(client, desired, dry_run=False, workers=None):
+    """Bring the parameters of many models to a desired state.
+
+    The parameters are read with one request per model, then only the
+    parameters to create, update, (un)designate or delete are sent, in a
+    batch. See `sync` module.
+
+    Args:
+        client (obj):
+            creopyson Client.
+        desired (dict):
+            {file: {parameter name: value}}. A value can be a dict with
+            `value`, `type`, `designate` and `description` keys (missing
+            keys are left as they are), or None to delete the parameter.
+        dry_run (boolean, optional):
+            Whether the changes are only planned, not sent. Defaults is False.
+        workers (int, optional):
+            Maximum concurrent requests. Defaults is the client's `pool_size`.
+
+    Raises:
+        RuntimeError: called inside `Client.batch()`.
+
+    Returns:
+        (obj:SyncReport): planned, applied and failed changes, and the
+            number of requests saved.
+
+    """
+    from .sync import desired_names, prepare
+
+    if getattr(client._local, "batch", None) is not None:
+        raise RuntimeError("parameter_sync cannot be called inside a batch.")
+    files, names = desired_names(desired)
+    report = prepare(
+        desired,
+        iter_many(client, files, name=names, workers=workers, return_exceptions=True),
+        dry_run,
+    )
+    if dry_run or not report.changes:
+        return report
+    with client.batch(workers=workers):
+        futures = [change.send(client) for change in report.changes]
+    report.record([future.exception() for future in futures])
+    return report
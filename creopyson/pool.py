@@ -0,0 +1,337 @@
+"""Pool module.
+
+A `ClientPool` drives many Creo sessions (one per CREOSON host/port) and
+spreads jobs over them::
+
+    hosts = [("cad1", 9056), ("cad2", 9056), ("cad3", 9056)]
+    with creopyson.ClientPool(hosts) as pool:
+        results = pool.map(
+            model_job(mutate=set_color, export=export_step),
+            ["part_1.prt", "part_2.prt", "part_3.prt"],
+        )
+
+"""
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .connection import Client
+from .exceptions import CircuitOpen
+
+lg = logging.getLogger(__name__)
+
+
+def model_job(mutate=None, save=True, export=None, display=None):
+    """Return a job opening a model, changing, saving and exporting it.
+
+    The job is called with a Client and a file name, see `ClientPool.map`.
+
+    Args:
+        mutate (callable, optional):
+            `mutate(client, file_)` changes the model. Defaults to None.
+        save (bool, optional):
+            Whether to save the model after `mutate`. Defaults is True.
+        export (callable, optional):
+            `export(client, file_)` exports the model, its result is the
+            job result. Defaults to None.
+        display (bool, optional):
+            Display the model after opening. Defaults is Creo's default.
+
+    Returns:
+        (callable): job(client, file_).
+
+    """
+
+    def job(client, file_):
+        client.file_open(file_, display=display)
+        if mutate is not None:
+            mutate(client, file_)
+        if save:
+            client.file_save(file_=file_)
+        if export is not None:
+            return export(client, file_)
+        return None
+
+    return job
+
+
+class ClientPool(object):
+    """Creates a pool of Clients, one per Creo session.
+
+    Each session runs one job at a time. A session which fails with a
+    `ConnectionError` is checked with `is_creo_running`; if Creo is gone, the
+    session is replaced by a new connection to the same host. The job is run
+    again on another session only if none of its requests were sent (ie.
+    refused by an open circuit breaker), since a job sent twice could save
+    or export twice. Sessions whose circuit breaker is open are not checked:
+    they get jobs only when no other session is idle. `check()` connects
+    again the hosts which were unreachable.
+    """
+
+    def __init__(self, hosts, start_command=None, job_retries=1, **client_kwargs):
+        """Create the pool and connect to every session.
+
+        Args:
+            hosts (list:tuple):
+                List of (ip_adress, port) of the CREOSON servers.
+            start_command (str, optional):
+                Full path to `nitro_proe_remote.bat`, used to start Creo
+                again when a dead session is replaced. Defaults is no restart.
+            job_retries (int, optional):
+                How many times a job is run again after a connection error
+                raised before any of its requests was sent. Defaults is 1.
+            client_kwargs:
+                Other Client arguments (ie. `pool_size`, `timeout`, `retries`
+                of read-only requests, or `circuit_breaker` to route jobs
+                around failing sessions).
+
+        Raises:
+            ConnectionError: no session could be connected.
+
+        """
+        self.hosts = [tuple(host) for host in hosts]
+        self.start_command = start_command
+        self.job_retries = job_retries
+        self.client_kwargs = client_kwargs
+        self.clients = []
+        self._hosts = {}
+        self._idle = deque()
+        self._condition = threading.Condition()
+        for host in self.hosts:
+            client = self._new_client(host)
+            if client is not None:
+                self.clients.append(client)
+                self._idle.append(client)
+        if not self.clients:
+            raise ConnectionError("No CREOSON session available")
+
+    def __enter__(self):
+        """Return the pool itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Disconnect every session."""
+        self.close()
+
+    def __len__(self):
+        """Return the number of live sessions."""
+        return len(self.clients)
+
+    def _new_client(self, host):
+        """Return a connected Client for `host`, None if unreachable."""
+        client = Client(host[0], host[1], **self.client_kwargs)
+        try:
+            client.connect()
+            if self.start_command is not None and not client.is_creo_running():
+                client.start_creo(self.start_command, retries=3)
+        except (ConnectionError, RuntimeError) as e:
+            lg.warning("session %s:%s unavailable: %s", host[0], host[1], e)
+            client.close()
+            return None
+        self._hosts[client] = host
+        return client
+
+    def is_alive(self, client):
+        """Check whether the Creo session of `client` is running.
+
+        Args:
+            client (obj): creopyson Client of the pool.
+
+        Returns:
+            (boolean): True if Creo is running, False instead.
+
+        """
+        try:
+            return bool(client.is_creo_running())
+        except (ConnectionError, RuntimeError):
+            return False
+
+    def _is_circuit_open(self, client):
+        breaker = client.circuit_breaker
+        return breaker is not None and breaker.is_open
+
+    def _swap(self, client):
+        """Replace a dead client by a new one on the same host."""
+        new_client = self._new_client(self._hosts[client])
+        client.close()
+        with self._condition:
+            self.clients.remove(client)
+            del self._hosts[client]
+            if new_client is not None:
+                self.clients.append(new_client)
+                self._idle.append(new_client)
+            self._condition.notify_all()
+        return new_client
+
+    def check(self):
+        """Check every idle session and replace the dead ones.
+
+        Sessions whose circuit breaker is open are left as they are. Hosts
+        without a session (unreachable so far) are connected again.
+
+        Returns:
+            (int): number of replaced sessions.
+
+        """
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+        swapped = 0
+        for client in idle:
+            if self._is_circuit_open(client) or self.is_alive(client):
+                self.release(client)
+            else:
+                swapped += 1
+                self._swap(client)
+        with self._condition:
+            missing = list(self.hosts)
+            for host in self._hosts.values():
+                missing.remove(host)
+        for host in missing:
+            client = self._new_client(host)
+            if client is not None:
+                with self._condition:
+                    self.clients.append(client)
+                    self._idle.append(client)
+                    self._condition.notify()
+        return swapped
+
+    def acquire(self, timeout=None):
+        """Get an idle Client, waiting for one to be released.
+
+        Sessions whose circuit breaker is open are given last.
+
+        Args:
+            timeout (float, optional):
+                Seconds to wait. Defaults is no limit.
+
+        Raises:
+            ConnectionError: no session is alive, or timeout.
+
+        Returns:
+            (obj): creopyson Client.
+
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._idle or not self.clients, timeout=timeout
+            )
+            if not self._idle:
+                raise ConnectionError("No CREOSON session available")
+            for client in self._idle:
+                breaker = client.circuit_breaker
+                if breaker is None or not breaker.is_open:
+                    self._idle.remove(client)
+                    return client
+            return self._idle.popleft()
+
+    def release(self, client):
+        """Give a Client back to the pool."""
+        with self._condition:
+            self._idle.append(client)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Lease a Client for the duration of a `with` block.
+
+        If the block raises a `ConnectionError`, the session is checked and
+        replaced if Creo is not running anymore, unless its circuit breaker
+        is open.
+        """
+        client = self.acquire(timeout)
+        try:
+            yield client
+        except ConnectionError:
+            if self._is_circuit_open(client) or self.is_alive(client):
+                self.release(client)
+            else:
+                lg.warning("session %s:%s is dead", *self._hosts[client])
+                self._swap(client)
+            raise
+        except BaseException:
+            self.release(client)
+            raise
+        self.release(client)
+
+    def _run_job(self, job, args):
+        for attempt in range(self.job_retries + 1):
+            sent = []
+
+            def count(command, function, data):
+                sent.append((command, function))
+
+            try:
+                with self.lease() as client:
+                    client.add_hook(pre=count)
+                    try:
+                        return job(client, *args)
+                    finally:
+                        client.remove_hook(count)
+            except ConnectionError as e:
+                # the request refused by an open circuit was not sent
+                if isinstance(e, CircuitOpen) and sent:
+                    sent.pop()
+                if sent or attempt == self.job_retries or not self.clients:
+                    raise
+
+    def run(self, jobs, return_exceptions=False):
+        """Run jobs spread over the sessions.
+
+        Args:
+            jobs (list:callable):
+                `job(client)` functions.
+            return_exceptions (bool, optional):
+                Whether exceptions are returned as results instead of being
+                raised. Defaults is False.
+
+        Returns:
+            (list): job results, in the same order as `jobs`.
+
+        """
+        return self._map([(job, ()) for job in jobs], return_exceptions)
+
+    def map(self, job, items, return_exceptions=False):
+        """Run `job(client, item)` for each item, spread over the sessions.
+
+        Args:
+            job (callable):
+                `job(client, item)` function (ie. `model_job()`).
+            items (iterable):
+                Items given to the job (ie. file names).
+            return_exceptions (bool, optional):
+                Whether exceptions are returned as results instead of being
+                raised. Defaults is False.
+
+        Returns:
+            (list): job results, in the same order as `items`.
+
+        """
+        return self._map([(job, (item,)) for item in items], return_exceptions)
+
+    def _map(self, calls, return_exceptions):
+        with ThreadPoolExecutor(max_workers=max(len(self.hosts), 1)) as executor:
+            futures = [executor.submit(self._run_job, job, args) for job, args in calls]
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(error)
+            else:
+                raise error
+        return results
+
+    def close(self):
+        """Disconnect and close every session."""
+        with self._condition:
+            clients = list(self.clients)
+        for client in clients:
+            try:
+                client.disconnect()
+            except (ConnectionError, RuntimeError) as e:
+                lg.warning("disconnect failed: %s", e)
+            client.close()
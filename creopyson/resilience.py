@@ -0,0 +1,166 @@
+"""Resilience module.
+
+Timeouts, retry of read-only commands and circuit breaker, used by `Client`
+and `AsyncClient`::
+
+    c = creopyson.Client(
+        timeout=30,
+        timeouts={("file", "open"): 300, "interface": 600},
+        retries=3,
+        circuit_breaker=5,
+    )
+
+Only read-only commands (see `is_read_only`) are sent again after a network
+error: a command changing the model may have been run by Creo before the
+connection was lost.
+"""
+import threading
+import time
+
+from .exceptions import CircuitOpen
+
+# Read-only commands which names do not tell it.
+READ_ONLY = {
+    ("creo", "pwd"),
+    ("file", "massprops"),
+    ("geometry", "bound_box"),
+    ("server", "pwd"),
+}
+
+
+def is_read_only(command, function):
+    """Check whether a command only reads data from Creo.
+
+    Functions named `list*`, `*_list`, `exists`, `*_exists`, `get_*`, `is_*`
+    and `has_*` are read-only, with the ones of `READ_ONLY`.
+
+    Args:
+        command (str): Command param of the request.
+        function (str): Function param of the request.
+
+    Returns:
+        (boolean): True if the command can be sent again safely.
+
+    """
+    if command == "connection" and function in ("connect", "disconnect"):
+        return False
+    return (
+        function.startswith(("list", "get_", "is_", "has_"))
+        or function.endswith(("_list", "exists"))
+        or (command, function) in READ_ONLY
+    )
+
+
+def command_timeout(command, function, timeout=None, timeouts=None):
+    """Return the timeout of a command.
+
+    Args:
+        command (str): Command param of the request.
+        function (str): Function param of the request.
+        timeout (float|tuple, optional): Default timeout. Defaults is None.
+        timeouts (dict, optional):
+            Timeouts keyed by (command, function) or command.
+            Defaults is `timeout` for every command.
+
+    Returns:
+        (float|tuple): the timeout, None if no limit.
+
+    """
+    if not timeouts:
+        return timeout
+    return timeouts.get((command, function), timeouts.get(command, timeout))
+
+
+class CircuitBreaker(object):
+    """Fail fast after repeated connection failures.
+
+    After `threshold` failures in a row the circuit is open: requests raise
+    `CircuitOpen` without being sent. After `reset_timeout` seconds one
+    request is let through (half-open); the circuit closes if it succeeds and
+    opens again if it fails.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, threshold=5, reset_timeout=30.0):
+        """Create a closed circuit.
+
+        Args:
+            threshold (int, optional):
+                Failures in a row opening the circuit. Defaults to 5.
+            reset_timeout (float, optional):
+                Seconds before a request is tried again. Defaults to 30.
+
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Return the state."""
+        return "<CircuitBreaker {} ({} failures)>".format(self.state, self.failures)
+
+    @property
+    def state(self):
+        """str: `closed`, `open` or `half-open`."""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def is_open(self):
+        """bool: whether requests are refused now."""
+        state = self.state
+        return state == self.OPEN or (state == self.HALF_OPEN and self._trial)
+
+    def before(self):
+        """Check a request can be sent.
+
+        Raises:
+            CircuitOpen: the circuit is open.
+
+        """
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self._trial:
+                self._trial = True
+                return
+        raise CircuitOpen(
+            "Circuit open after {} failures, retry later.".format(self.failures)
+        )
+
+    def success(self):
+        """Record a successful request: close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def failure(self):
+        """Record a failed request."""
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self._opened_at is not None or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """End a request that neither succeeded nor failed, e.g. cancelled.
+
+        A half-open circuit lets the next request through.
+        """
+        with self._lock:
+            self._trial = False
+
+    def reset(self):
+        """Close the circuit."""
+        self.success()
@@ -0,0 +1,340 @@
+"""Sync module.
+
+Bring the parameters of many models to a desired state, sending only the
+requests changing something::
+
+    desired = {
+        "box.prt": {"MATERIAL": "STEEL", "MASS": {"value": 1.5, "type": "DOUBLE"}},
+        "plate.prt": {"MATERIAL": "ALU", "OLD_CODE": None},  # None deletes
+    }
+    report = c.parameter_sync(desired)
+    for change in report.applied:
+        print(change.file, change.action, change.name, change.old, change.value)
+    print(report.saved, "requests saved")
+
+The current parameters are read with one `parameter_list` per model, the
+changes are computed by `plan` and sent in a `Client.batch()`: concurrently
+across models, and concurrently for the same command on one model.
+"""
+import math
+
+CREATE = "create"
+UPDATE = "update"
+DESIGNATE = "designate"
+DELETE = "delete"
+
+# Changes of a model are sent grouped by action, so that each group is a run
+# of the same command that `Batch` sends concurrently.
+_ORDER = {CREATE: 0, UPDATE: 1, DESIGNATE: 2, DELETE: 3}
+
+_TYPES = {bool: "BOOL", int: "INTEGER", float: "DOUBLE"}
+
+# Value of a desired parameter given as a dict without `value`.
+_KEEP = object()
+
+
+class ParameterChange(object):
+    """A parameter request computed by `plan`.
+
+    Attributes:
+        file (str): model name.
+        name (str): parameter name.
+        action (str): `create`, `update`, `designate` or `delete`.
+        value: new value (None if deleted).
+        type (str): parameter type sent with the value.
+        designate (bool): new designated state, None if unchanged.
+        description (str): new description, None if unchanged.
+        old (dict): current parameter (see `parameter_list`), None if created.
+
+    """
+
+    __slots__ = ("file", "name", "action", "value", "type", "designate", "description", "old")
+
+    def __init__(
+        self,
+        file_,
+        name,
+        action,
+        value=None,
+        type_=None,
+        designate=None,
+        description=None,
+        old=None,
+    ):
+        """Create a change."""
+        self.file = file_
+        self.name = name
+        self.action = action
+        self.value = value
+        self.type = type_
+        self.designate = designate
+        self.description = description
+        self.old = old
+
+    def __repr__(self):
+        """Return the action, model and parameter."""
+        return "<ParameterChange {} {} {}>".format(self.action, self.file, self.name)
+
+    def send(self, client):
+        """Send the request of the change.
+
+        Args:
+            client (obj): creopyson Client.
+
+        Returns:
+            None, or a Future inside `Client.batch()`.
+
+        """
+        if self.action == DELETE:
+            return client.parameter_delete(self.name, file_=self.file)
+        if self.action == DESIGNATE:
+            return client.parameter_set_designated(
+                self.name, self.designate, file_=self.file
+            )
+        return client.parameter_set(
+            self.name,
+            value=self.value,
+            file_=self.file,
+            type_=self.type,
+            designate=self.designate,
+            description=self.description,
+        )
+
+
+class SyncReport(object):
+    """Result of a synchronization, see `parameter.sync`.
+
+    Attributes:
+        changes (list:ParameterChange): planned changes.
+        applied (list:ParameterChange): changes sent successfully.
+        failed (list:tuple): (change, exception) of the failed requests.
+        read_errors (dict): {file: exception} of the models not read.
+        unchanged (int): desired parameters already up to date.
+        requests (int): requests sent, reads included.
+        naive_requests (int): one request per desired parameter.
+        dry_run (bool): whether the changes were only planned.
+
+    """
+
+    def __init__(self, changes=(), unchanged=0, naive_requests=0, dry_run=False):
+        """Create a report of planned changes."""
+        self.changes = list(changes)
+        self.applied = []
+        self.failed = []
+        self.read_errors = {}
+        self.unchanged = unchanged
+        self.requests = 0
+        self.naive_requests = naive_requests
+        self.dry_run = dry_run
+
+    def __repr__(self):
+        """Return the number of changes and requests."""
+        return "<SyncReport {} changes, {} applied, {} failed, {} requests saved>".format(
+            len(self.changes), len(self.applied), len(self.failed), self.saved
+        )
+
+    def __bool__(self):
+        """Check whether everything was read and applied."""
+        return not self.failed and not self.read_errors
+
+    @property
+    def saved(self):
+        """int: requests saved compared to setting every desired parameter."""
+        return self.naive_requests - self.requests
+
+    @property
+    def changed_files(self):
+        """list:str: models with at least one applied change."""
+        return list(dict.fromkeys(change.file for change in self.applied))
+
+    def record(self, outcomes):
+        """Record the outcome of the requests of the changes.
+
+        Args:
+            outcomes (list): None or the exception raised, for each change.
+
+        """
+        self.requests += len(self.changes)
+        for change, error in zip(self.changes, outcomes):
+            if error is None:
+                self.applied.append(change)
+            else:
+                self.failed.append((change, error))
+
+    def by_action(self):
+        """Count the planned changes of each action.
+
+        Returns:
+            (dict): {action: number of changes}.
+
+        """
+        counts = {}
+        for change in self.changes:
+            counts[change.action] = counts.get(change.action, 0) + 1
+        return counts
+
+
+def _spec(value):
+    """Return (value, type, designate, description) of a desired parameter."""
+    if isinstance(value, dict):
+        return (
+            value.get("value", _KEEP),
+            value.get("type"),
+            value.get("designate"),
+            value.get("description"),
+        )
+    return value, None, None, None
+
+
+def same_value(type_, current, desired):
+    """Check whether a desired value equals the current one.
+
+    Values are compared as the parameter type: `DOUBLE` with a relative
+    tolerance of 1e-9, `INTEGER` and `BOOL` after conversion, others as
+    strings.
+
+    Args:
+        type_ (str): current parameter type.
+        current: current value.
+        desired: desired value.
+
+    Returns:
+        (bool): True if no request is needed.
+
+    """
+    if current is None or desired is None:
+        return current is None and desired is None
+    try:
+        if type_ == "DOUBLE":
+            return math.isclose(float(current), float(desired), rel_tol=1e-9, abs_tol=1e-12)
+        if type_ == "INTEGER":
+            return int(current) == int(desired)
+        if type_ == "BOOL":
+            if isinstance(desired, str):
+                return str(current).lower() == desired.lower()
+            return bool(current) == bool(desired)
+    except (TypeError, ValueError):
+        return False
+    return str(current) == str(desired)
+
+
+def plan(desired, current):
+    """Compute the requests bringing parameters to a desired state.
+
+    Args:
+        desired (dict):
+            {file: {parameter name: value}}. A value can be a dict with
+            `value`, `type`, `designate` and `description` keys (missing
+            keys are left as they are), or None to delete the parameter.
+        current (dict):
+            {file: list of parameters, see `parameter_list`}. Models
+            missing here are skipped.
+
+    Returns:
+        (tuple): (list of ParameterChange, number of unchanged parameters).
+
+    """
+    changes = []
+    unchanged = 0
+    for file_, params in desired.items():
+        if file_ not in current:
+            continue
+        existing = {param["name"].upper(): param for param in current[file_]}
+        file_changes = []
+        for name, spec in params.items():
+            old = existing.get(name.upper())
+            if spec is None:
+                if old is not None:
+                    file_changes.append(ParameterChange(file_, name, DELETE, old=old))
+                else:
+                    unchanged += 1
+                continue
+            value, type_, designate, description = _spec(spec)
+            if value is _KEEP:
+                value = old.get("value") if old is not None else None
+            if old is None:
+                file_changes.append(ParameterChange(
+                    file_,
+                    name,
+                    CREATE,
+                    value,
+                    type_ or _TYPES.get(type(value), "STRING"),
+                    designate,
+                    description,
+                ))
+                continue
+            old_type = old.get("type")
+            if designate is not None and bool(designate) == bool(old.get("designate")):
+                designate = None
+            if description is not None and description == old.get("description"):
+                description = None
+            if (
+                (type_ is not None and type_.upper() != old_type)
+                or not same_value(old_type, old.get("value"), value)
+                or description is not None
+            ):
+                file_changes.append(ParameterChange(
+                    file_,
+                    name,
+                    UPDATE,
+                    value,
+                    type_ or old_type,
+                    designate,
+                    description,
+                    old,
+                ))
+            elif designate is not None:
+                file_changes.append(ParameterChange(
+                    file_, name, DESIGNATE, old.get("value"), old_type, designate, old=old
+                ))
+            else:
+                unchanged += 1
+        file_changes.sort(key=lambda change: _ORDER[change.action])
+        changes.extend(file_changes)
+    return changes, unchanged
+
+
+def naive_requests(desired):
+    """Return the requests of setting every desired parameter, one by one."""
+    return sum(len(params) for params in desired.values())
+
+
+def desired_names(desired):
+    """Return the models to read and the parameter names to read.
+
+    Returns:
+        (tuple): (list of files, sorted list of names).
+
+    """
+    files = [file_ for file_, params in desired.items() if params]
+    names = sorted({name for file_ in files for name in desired[file_]})
+    return files, names
+
+
+def prepare(desired, reads, dry_run=False):
+    """Plan the changes from the parameters read on each model.
+
+    Args:
+        desired (dict): see `plan`.
+        reads (iterable):
+            (file, parameters or exception) pairs,
+            see `parameter_iter_many(return_exceptions=True)`.
+        dry_run (bool, optional):
+            Whether the changes will not be applied. Defaults is False.
+
+    Returns:
+        (obj:SyncReport): planned changes.
+
+    """
+    current = {}
+    read_errors = {}
+    for file_, params in reads:
+        if isinstance(params, Exception):
+            read_errors[file_] = params
+        else:
+            current[file_] = params
+    changes, unchanged = plan(desired, current)
+    report = SyncReport(changes, unchanged, naive_requests(desired), dry_run)
+    report.read_errors = read_errors
+    report.requests = len(current) + len(read_errors)
+    return report
@@ -0,0 +1,344 @@
+"""Table module.
+
+Column oriented results, exported without building a dict per row::
+
+    table = c.parameter_list_table(files)
+    table.to_csv("params.csv")
+    table.to_parquet("params.parquet")  # requires pyarrow
+    df = table.to_pandas()               # requires pandas
+
+Columns typed `bool`, `int` or `float` are stored in `array.array` and handed
+to Arrow and pandas as buffers; other columns, and nullable ones, are lists.
+"""
+import csv
+import importlib
+import math
+from array import array
+
+TYPECODES = {"bool": "b", "int": "q", "float": "d"}
+_NUMPY_TYPES = {"b": "int8", "q": "int64", "d": "float64"}
+_PANDAS_TYPES = {"bool": "boolean", "int": "Int64", "float": "Float64"}
+# ParameterTable value column by (parameter type, value type)
+_VALUE_COLUMNS = {
+    ("DOUBLE", float): "value_double",
+    ("INTEGER", int): "value_int",
+    ("BOOL", bool): "value_bool",
+    ("STRING", str): "value_str",
+    ("NOTE", str): "value_str",
+}
+
+
+def _require(module, feature):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(
+            "{} is required for {}: pip install {}".format(
+                module.split(".")[0], feature, module.split(".")[0]
+            )
+        )
+
+
+class ColumnTable(object):
+    """Table stored by columns."""
+
+    def __init__(self, names, types=None, nullable=()):
+        """Create an empty table.
+
+        Args:
+            names (list:str):
+                Column names.
+            types (dict, optional):
+                {column name: `bool`, `int`, `float` or `str`}. Typed columns
+                are stored in arrays: None is NaN in a `float` column, and
+                is not allowed in `int` and `bool` columns.
+                Defaults is lists for every column.
+            nullable (list:str, optional):
+                Typed columns stored in lists, which may hold None. They are
+                exported with their type, None as null. Defaults is none.
+
+        """
+        types = types or {}
+        self.names = list(names)
+        self.types = {name: types.get(name) for name in self.names}
+        self.nullable = frozenset(nullable)
+        self.columns = {
+            name: array(TYPECODES[self.types[name]])
+            if self.types[name] in TYPECODES and name not in self.nullable
+            else []
+            for name in self.names
+        }
+
+    def __len__(self):
+        """Return the number of rows."""
+        if not self.names:
+            return 0
+        return len(self.columns[self.names[0]])
+
+    def __getitem__(self, name):
+        """Return a column."""
+        return self.columns[name]
+
+    def __repr__(self):
+        """Return the columns and the size."""
+        return "<{} {} rows: {}>".format(
+            type(self).__name__, len(self), ", ".join(self.names)
+        )
+
+    def _convert(self, name, value):
+        if value is None and self.types[name] == "float" and name not in self.nullable:
+            return math.nan
+        return value
+
+    def append(self, row):
+        """Add a row.
+
+        Args:
+            row (dict|sequence):
+                {column name: value}, missing columns are None;
+                or values in the column order.
+
+        """
+        if isinstance(row, dict):
+            values = [row.get(name) for name in self.names]
+        else:
+            values = list(row)
+            if len(values) != len(self.names):
+                raise ValueError(
+                    "{} values for {} columns".format(len(values), len(self.names))
+                )
+        for name, value in zip(self.names, values):
+            self.columns[name].append(self._convert(name, value))
+
+    def extend_column(self, name, values):
+        """Add values at the end of a column.
+
+        Call it for every column with the same number of values.
+        """
+        column = self.columns[name]
+        if self.types[name] == "float" and name not in self.nullable:
+            column.extend(math.nan if value is None else value for value in values)
+        else:
+            column.extend(values)
+
+    def rows(self):
+        """Iterate over the rows, as tuples in the column order."""
+        return zip(*(self.columns[name] for name in self.names))
+
+    def to_csv(self, file_, **fmtparams):
+        """Write the table as CSV, with a header.
+
+        Args:
+            `file_` (str|file object): CSV file path or text file object.
+            fmtparams: `csv.writer` options (ie. `delimiter=";"`).
+
+        """
+        if hasattr(file_, "write"):
+            self._write_csv(file_, fmtparams)
+        else:
+            with open(file_, "w", newline="", encoding="utf-8") as stream:
+                self._write_csv(stream, fmtparams)
+
+    def _write_csv(self, stream, fmtparams):
+        writer = csv.writer(stream, **fmtparams)
+        writer.writerow(self.names)
+        bools = [
+            self.types[name] == "bool" and name not in self.nullable for name in self.names
+        ]
+        if any(bools):
+            columns = [
+                map(bool, self.columns[name]) if is_bool else self.columns[name]
+                for name, is_bool in zip(self.names, bools)
+            ]
+            writer.writerows(zip(*columns))
+        else:
+            writer.writerows(self.rows())
+
+    def to_arrow(self):
+        """Return the table as a `pyarrow.Table`. Requires `pyarrow`.
+
+        An untyped column of mixed value types is converted to strings.
+        """
+        pa = _require("pyarrow", "Arrow export")
+        arrow_types = {
+            "bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(), "str": pa.string()
+        }
+        arrays = []
+        for name in self.names:
+            column = self.columns[name]
+            kind = self.types[name]
+            if kind in arrow_types and not isinstance(column, array):
+                values = pa.array(column, type=arrow_types[kind])
+            elif kind in TYPECODES:
+                buffer = pa.py_buffer(column)
+                arrow_type = {"bool": pa.int8(), "int": pa.int64(), "float": pa.float64()}
+                values = pa.Array.from_buffers(
+                    arrow_type[kind], len(column), [None, buffer]
+                )
+                if kind == "bool":
+                    values = values.cast(pa.bool_())
+            else:
+                try:
+                    values = pa.array(column)
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    values = pa.array(
+                        [None if value is None else str(value) for value in column]
+                    )
+            arrays.append(values)
+        return pa.Table.from_arrays(arrays, names=self.names)
+
+    def to_parquet(self, path, **kwargs):
+        """Write the table as Parquet. Requires `pyarrow`.
+
+        Args:
+            path (str): Parquet file path.
+            kwargs: `pyarrow.parquet.write_table` options.
+
+        """
+        parquet = _require("pyarrow.parquet", "Parquet export")
+        parquet.write_table(self.to_arrow(), path, **kwargs)
+
+    def to_pandas(self, categories=()):
+        """Return the table as a `pandas.DataFrame`. Requires `pandas`.
+
+        Args:
+            categories (list:str, optional):
+                Columns converted to the `category` dtype (ie. file names
+                repeated on many rows). Defaults is none.
+
+        """
+        pd = _require("pandas", "pandas export")
+        import numpy as np
+
+        data = {}
+        for name in self.names:
+            column = self.columns[name]
+            kind = self.types[name]
+            if name in self.nullable and kind in TYPECODES:
+                data[name] = _masked_array(pd, np, column, kind)
+            elif kind in TYPECODES:
+                values = np.frombuffer(column, dtype=_NUMPY_TYPES[column.typecode])
+                data[name] = values.astype(bool) if kind == "bool" else values.copy()
+            elif name in categories:
+                data[name] = pd.Categorical(column)
+            else:
+                data[name] = column
+        return pd.DataFrame(data, columns=self.names)
+
+
+def _masked_array(pd, np, column, kind):
+    """Return a nullable column as a pandas masked array."""
+    size = len(column)
+    nulls = column.count(None)
+    if 0 < nulls < size:
+        return pd.array(column, dtype=_PANDAS_TYPES[kind])
+    # no conversion of each value when the column is full or empty
+    dtype = _NUMPY_TYPES[TYPECODES[kind]]
+    if nulls:
+        values, mask = np.zeros(size, dtype=dtype), np.ones(size, dtype=bool)
+    else:
+        values, mask = np.array(column, dtype=dtype), np.zeros(size, dtype=bool)
+    if kind == "bool":
+        return pd.arrays.BooleanArray(values.astype(bool), mask)
+    if kind == "int":
+        return pd.arrays.IntegerArray(values, mask)
+    return pd.arrays.FloatingArray(values, mask)
+
+
+class ParameterTable(ColumnTable):
+    """Parameters of many models, one row per parameter.
+
+    Columns: file, name, type, value_double, value_int, value_bool,
+    value_str, designate, description, encoded. The value is in the column of
+    the parameter type (`value_str` for STRING, NOTE and values not matching
+    their type), the other value columns are None.
+    """
+
+    COLUMNS = (
+        "file",
+        "name",
+        "type",
+        "value_double",
+        "value_int",
+        "value_bool",
+        "value_str",
+        "designate",
+        "description",
+        "encoded",
+    )
+    TYPES = {
+        "value_double": "float",
+        "value_int": "int",
+        "value_bool": "bool",
+        "value_str": "str",
+        "designate": "bool",
+        "encoded": "bool",
+    }
+    NULLABLE = ("value_double", "value_int", "value_bool", "value_str")
+
+    def __init__(self):
+        """Create an empty table."""
+        super().__init__(self.COLUMNS, self.TYPES, self.NULLABLE)
+
+    @classmethod
+    def from_many(cls, results):
+        """Create a table from `parameter_list_many` or `parameter_iter_many`.
+
+        Args:
+            results (dict|iterable):
+                {(file, name): parameter}, or (file, parameters) pairs.
+
+        Returns:
+            (obj:ParameterTable): the table.
+
+        """
+        table = cls()
+        if isinstance(results, dict):
+            files = [file_ for file_, _ in results]
+            table.add(list(results.values()), files)
+        else:
+            for file_, params in results:
+                table.add(params, file_)
+        return table
+
+    def add(self, params, file_=None):
+        """Add the parameters of a model.
+
+        Args:
+            params (list:dict): `parameter_list` result.
+            `file_` (str|list:str, optional):
+                Model name, or one name per parameter.
+                Defaults is the `owner_name` of each parameter.
+
+        """
+        if file_ is None:
+            files = [param.get("owner_name") for param in params]
+        elif isinstance(file_, str):
+            files = [file_] * len(params)
+        else:
+            files = file_
+        self.extend_column("file", files)
+        for name in ("name", "type", "description"):
+            self.extend_column(name, [param.get(name) for param in params])
+        values = {name: [None] * len(params) for name in self.NULLABLE}
+        column = _VALUE_COLUMNS.get
+        for row, param in enumerate(params):
+            value = param.get("value")
+            if value is None:
+                continue
+            type_ = param.get("type")
+            name = column((type_, type(value)))
+            if name is None:
+                name, value = _value_column(type_, value)
+            values[name][row] = value
+        for name in self.NULLABLE:
+            self.extend_column(name, values[name])
+        for name in ("designate", "encoded"):
+            self.extend_column(name, [bool(param.get(name)) for param in params])
+
+
+def _value_column(type_, value):
+    """Return the value column of a parameter and the value, converted."""
+    if type_ == "DOUBLE" and type(value) is int:
+        return "value_double", float(value)
+    return "value_str", str(value)
@@ -0,0 +1,241 @@
+"""Transport module.
+
+Record the requests of a real CREOSON session, then replay them without
+Creo (ie. to profile the client or test a workflow on CI)::
+
+    with RecordingTransport("session.jsonl") as recorder:
+        c = creopyson.Client(transport=recorder)
+        run_workflow(c)
+
+    c = creopyson.Client(transport=ReplayTransport("session.jsonl", speed=None))
+    run_workflow(c)
+
+A recording is a JSON lines file (a msgpack stream if the name ends with
+`.msgpack`, gzipped if it ends with `.gz`): a header, then one line per
+request with its data, response and duration. Answers are replayed by
+(command, function, data), in the recorded order for the same request, so
+concurrent requests (`batch`, `parameter_list_many`) replay correctly.
+"""
+import gzip
+import importlib
+import threading
+import time
+from collections import deque
+
+from .cache import freeze
+from .codec import get_codec
+from .exceptions import ReplayMismatch, RequestTimeout
+
+FORMAT_VERSION = 1
+
+
+def _msgpack():
+    try:
+        return importlib.import_module("msgpack")
+    except ImportError:
+        raise ImportError("msgpack is required for .msgpack recordings: pip install msgpack")
+
+
+def _open(path, mode):
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, compresslevel=5)
+    return open(path, mode)
+
+
+def _is_msgpack(path):
+    name = str(path)
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return name.endswith(".msgpack")
+
+
+class HttpTransport(object):
+    """Send requests with the HTTP session of the client (default)."""
+
+    def post(self, client, body, timeout=None, url=None):
+        """Post an encoded request to `url`, return the response body.
+
+        Raises:
+            RequestTimeout: creoson did not answer in `timeout` seconds.
+            ConnectionError: creoson not reachable or HTTP error.
+
+        """
+        return client._post(body, timeout, url).content
+
+
+class RecordingTransport(object):
+    """Send requests with another transport and record them to a file."""
+
+    def __init__(self, path, transport=None):
+        """Open the recording file.
+
+        Args:
+            path (str|Path):
+                Recording file: `.jsonl` or `.msgpack`, optionally `.gz`.
+            transport (obj, optional):
+                Transport sending the requests. Defaults is HTTP.
+
+        """
+        self.path = path
+        self.transport = transport or HttpTransport()
+        self.count = 0
+        self.codec = get_codec()
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._stream = _open(path, "wb")
+        self._packer = _msgpack().Packer() if _is_msgpack(path) else None
+        self._write({"version": FORMAT_VERSION, "started": time.time()})
+
+    def __enter__(self):
+        """Return the transport itself."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the recording file."""
+        self.close()
+
+    def _write(self, document):
+        if self._packer is not None:
+            self._stream.write(self._packer.pack(document))
+        else:
+            self._stream.write(self.codec.dumps(document) + b"\n")
+
+    def post(self, client, body, timeout=None, url=None):
+        """Post an encoded request, record it, return the response body."""
+        start = time.monotonic()
+        content = error = None
+        try:
+            content = self.transport.post(client, body, timeout, url)
+            return content
+        except ConnectionError as e:
+            error = [type(e).__name__, str(e)]
+            raise
+        finally:
+            if content is not None or error is not None:
+                self._record(client, body, start, content, error)
+
+    def _record(self, client, body, start, content, error):
+        """Write a request and its response or error."""
+        duration = time.monotonic() - start
+        request = client.codec.loads(body)
+        entry = {
+            "command": request.get("command"),
+            "function": request.get("function"),
+            "data": request.get("data"),
+            "at": round(start - self._start, 6),
+            "duration": round(duration, 6),
+        }
+        if error is not None:
+            entry["error"] = error
+        else:
+            entry["response"] = client.codec.loads(content)
+        with self._lock:
+            if not self._stream.closed:
+                self._write(entry)
+                self.count += 1
+
+    def close(self):
+        """Close the recording file."""
+        with self._lock:
+            self._stream.close()
+
+
+def read_recording(path):
+    """Read a recording.
+
+    Args:
+        path (str|Path): file written by `RecordingTransport`.
+
+    Raises:
+        ValueError: unknown recording format.
+
+    Returns:
+        (tuple): (header dict, list of request dicts).
+
+    """
+    with _open(path, "rb") as stream:
+        if _is_msgpack(path):
+            documents = list(_msgpack().Unpacker(stream, raw=False))
+        else:
+            codec = get_codec()
+            documents = [codec.loads(line) for line in stream if line.strip()]
+    if not documents or documents[0].get("version") != FORMAT_VERSION:
+        raise ValueError("Unknown recording format in {}".format(path))
+    return documents[0], documents[1:]
+
+
+class ReplayTransport(object):
+    """Answer requests from a recording, without CREOSON."""
+
+    def __init__(self, path, speed=1.0, strict=True):
+        """Load a recording.
+
+        Args:
+            path (str|Path): file written by `RecordingTransport`.
+            speed (float, optional):
+                Replay speed: 1 waits the recorded duration of each request,
+                10 is ten times faster, None (or 0) answers at once.
+                Defaults to 1.
+            strict (bool, optional):
+                Whether a request sent more times than recorded raises
+                `ReplayMismatch`; else the last answer is sent again.
+                Defaults to True.
+
+        """
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.count = 0
+        _, entries = read_recording(path)
+        codec = get_codec()
+        self._answers = {}
+        self._last = {}
+        for entry in entries:
+            if "error" in entry:
+                answer = (None, entry["error"], entry["duration"])
+            else:
+                answer = (codec.dumps(entry.get("response")), None, entry["duration"])
+            key = (entry["command"], entry["function"], freeze(entry.get("data")))
+            self._answers.setdefault(key, deque()).append(answer)
+        self._lock = threading.Lock()
+
+    @property
+    def unused(self):
+        """int: recorded requests not replayed yet."""
+        return sum(len(answers) for answers in self._answers.values())
+
+    def post(self, client, body, timeout=None, url=None):
+        """Return the recorded response body of an encoded request.
+
+        Raises:
+            ReplayMismatch: the request was not recorded.
+            RequestTimeout: the request timed out when recorded.
+            ConnectionError: the request failed when recorded.
+
+        """
+        request = client.codec.loads(body)
+        command, function = request.get("command"), request.get("function")
+        key = (command, function, freeze(request.get("data")))
+        with self._lock:
+            answers = self._answers.get(key)
+            if answers:
+                answer = answers.popleft()
+                self._last[key] = answer
+            elif not self.strict and key in self._last:
+                answer = self._last[key]
+            else:
+                raise ReplayMismatch(
+                    "No recorded answer for {} {} {}".format(
+                        command, function, request.get("data")
+                    )
+                )
+            self.count += 1
+        content, error, duration = answer
+        if self.speed:
+            time.sleep(duration / self.speed)
+        if error is not None:
+            if error[0] == "RequestTimeout":
+                raise RequestTimeout(error[1])
+            raise ConnectionError(error[1])
+        return content
@@ -0,0 +1,361 @@
+"""Asyncio client testing."""
+import asyncio
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import creopyson
+from creopyson.aio import gather
+from creopyson.resilience import CircuitBreaker
+from creopyson.exceptions import CircuitOpen, MissingKey, RequestTimeout
+from creopyson.fakeserver import FakeCreoson
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answer creoson requests with canned data."""
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(request)
+        command, function = request.get("command"), request.get("function")
+        result = {"status": {"error": False}}
+        if function == "connect":
+            result["sessionId"] = "123456"
+        elif function == "get_active":
+            result["data"] = {"dirname": "dirname", "file": "active.prt"}
+        elif command == "parameter" and function == "list":
+            result["data"] = {"paramlist": [{"name": "A", "value": 1}]}
+        elif function == "list_dirs":
+            result["data"] = {}
+        elif function == "pwd":
+            result["data"] = {"dirname": "C:/creoson"}
+        elif function == "fail":
+            result["status"] = {"error": True, "message": "error message"}
+        body = json.dumps(result).encode()
+        self.send_response(200)
+        if function == "list_dirs":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run a local creoson stand-in."""
+    Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_aio_commands_generated():
+    """Test each Client command has its coroutine."""
+    for name in ("file_open", "parameter_list", "bom_get_paths", "is_creo_running"):
+        assert asyncio.iscoroutinefunction(getattr(creopyson.AsyncClient, name))
+    for name in ("batch", "add_hook", "remove_hook"):
+        assert not hasattr(creopyson.AsyncClient, name)
+
+
+def test_aio_connect_and_commands(server):
+    """Test connect, active file fallback and data extraction."""
+    async def main():
+        async with creopyson.AsyncClient(port=server.server_port) as c:
+            await c.connect()
+            assert c.sessionId == "123456"
+            first = await c.parameter_list()
+            second = await c.parameter_list()
+            dirs = await c.creo_list_dirs()
+            pwd = await c.server_pwd()
+        return first, second, dirs, pwd
+
+    first, second, dirs, pwd = run(main())
+    assert first == second == [{"name": "A", "value": 1}]
+    assert dirs == []
+    assert pwd == "C:/creoson"
+    functions = [r["function"] for r in Handler.requests]
+    assert functions == [
+        "connect", "get_active", "list", "list", "list_dirs", "pwd", "disconnect"
+    ]
+    assert Handler.requests[2]["data"] == {"file": "active.prt"}
+    assert Handler.requests[2]["sessionId"] == "123456"
+
+
+def test_aio_error(server):
+    """Test creoson errors are raised."""
+    c = creopyson.AsyncClient(port=server.server_port)
+    with pytest.raises(RuntimeError) as pytest_wrapped_e:
+        run(c._creoson_post("fake", "fail"))
+    assert pytest_wrapped_e.value.args[0] == "error message"
+    with pytest.raises(MissingKey):
+        run(c._creoson_post("fake", "method", key_data="fakedata"))
+
+
+def test_aio_connection_error():
+    """Test unreachable server raises ConnectionError."""
+    c = creopyson.AsyncClient(port=1)
+    with pytest.raises(ConnectionError):
+        run(c.connect())
+
+
+def test_aio_gather_limit(server):
+    """Test gather keeps results order and concurrency limit."""
+    running = []
+    peak = []
+
+    async def job(i):
+        running.append(i)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(i)
+        return i
+
+    results = run(gather(*(job(i) for i in range(10)), limit=3))
+    assert results == list(range(10))
+    assert max(peak) == 3
+
+    async def main():
+        c = creopyson.AsyncClient(port=server.server_port, pool_size=2)
+        results = await gather(
+            *(c.parameter_list(file_="f{}.prt".format(i)) for i in range(6)),
+            limit=4,
+        )
+        await c.close()
+        return results
+
+    assert run(main()) == [[{"name": "A", "value": 1}]] * 6
+
+
+def test_aio_parameter_list_many():
+    """Test parameter_list_many and parameter_iter_many coroutines."""
+    with FakeCreoson() as fake:
+        files = ["part_{}.prt".format(i) for i in range(12)]
+        for i, name in enumerate(files):
+            fake.add_model(name, parameters={"INDEX": i})
+
+        async def main():
+            async with creopyson.AsyncClient(port=fake.port) as c:
+                await c.connect()
+                table = await c.parameter_list_many(files, workers=4)
+                names = [
+                    name async for name, _ in c.parameter_iter_many(
+                        files + ["missing.prt"], return_exceptions=True
+                    )
+                ]
+            return table, names
+
+        table, names = run(main())
+    assert table[("part_5.prt", "INDEX")]["value"] == 5
+    assert names == files + ["missing.prt"]
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_aio_bom_iter_paths(workers):
+    """Test bom_iter_paths asynchronous generator."""
+    with FakeCreoson() as fake:
+        fake.add_assembly("top", breadth=3, depth=3)
+        options = dict(paths=True, get_transforms=True, workers=workers)
+        c = fake.client()
+        c.connect()
+        expected = list(c.bom_iter_paths("top.asm", **options))
+        c.close()
+
+        async def main():
+            async with creopyson.AsyncClient(port=fake.port) as c:
+                await c.connect()
+                items = [item async for item in c.bom_iter_paths("top.asm", **options)]
+                breadth = [
+                    item["depth"]
+                    async for item in c.bom_iter_paths("top.asm", breadth_first=True)
+                ]
+                async for first in c.bom_iter_paths("top.asm", workers=workers):
+                    break
+            return items, breadth, first
+
+        items, breadth, first = run(main())
+    assert items == expected
+    assert breadth == sorted(breadth)
+    assert first == {"file": "top.asm", "seq_path": "root", "depth": 0}
+
+
+def test_aio_active_file_invalidated_concurrently():
+    """Test a call does not keep an active model another call changed."""
+    with FakeCreoson(latency=0.05) as fake:
+        fake.add_model("x.prt", parameters={"X": 1})
+        fake.add_model("y.prt", parameters={"Y": 1})
+
+        async def main():
+            async with creopyson.AsyncClient(port=fake.port) as c:
+                await c.connect()
+                await c.file_open("x.prt")
+                listed = asyncio.ensure_future(c.parameter_list())
+                await asyncio.sleep(0.01)  # parameter_list asks the active model
+                await c.file_open("y.prt")
+                assert [param["name"] for param in await listed] == ["X"]
+                assert c._active_file is None
+                return await c.parameter_list()
+
+        params = run(main())
+    assert [param["name"] for param in params] == ["Y"]
+
+
+def test_aio_parameter_sync():
+    """Test parameter_sync coroutine."""
+    with FakeCreoson() as fake:
+        for name in ("a.prt", "b.prt"):
+            fake.add_model(name, parameters={"COLOR": "red", "OLD": 1})
+
+        async def main():
+            async with creopyson.AsyncClient(port=fake.port) as c:
+                await c.connect()
+                return await c.parameter_sync(
+                    {"a.prt": {"COLOR": "blue", "OLD": None}, "b.prt": {"COLOR": "red"}}
+                )
+
+        report = run(main())
+        assert fake.session.models["a.prt"].parameters["COLOR"]["value"] == "blue"
+        assert "OLD" not in fake.session.models["a.prt"].parameters
+    assert [change.action for change in report.applied] == ["update", "delete"]
+    assert report.requests == 4
+
+
+def test_aio_cache():
+    """Test AsyncClient with a result cache."""
+    with FakeCreoson() as fake:
+        fake.add_model("box.prt", parameters={"COLOR": "red"})
+
+        async def main():
+            async with creopyson.AsyncClient(port=fake.port, cache=True) as c:
+                await c.connect()
+                first = await c.parameter_list(file_="box.prt")
+                await c.parameter_list(file_="box.prt")
+                await c.parameter_set("COLOR", "blue", file_="box.prt")
+                second = await c.parameter_list(file_="box.prt")
+                return first, second, c.cache.stats()
+
+        first, second, stats = run(main())
+    assert first[0]["value"] == "red"
+    assert second[0]["value"] == "blue"
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+@pytest.fixture
+def silent_server():
+    """Accept connections and never answer."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    accepted = []
+
+    def accept():
+        while True:
+            try:
+                accepted.append(sock.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield sock.getsockname()[1], accepted
+    sock.close()
+    for conn in accepted:
+        conn.close()
+
+
+def test_aio_timeout_retries_and_circuit(silent_server, caplog):
+    """Test requests to a server which never answers time out."""
+    port, accepted = silent_server
+
+    async def main():
+        c = creopyson.AsyncClient(
+            port=port, timeout=0.05, retries=2, backoff=0.01, circuit_breaker=4
+        )
+        with pytest.raises(RequestTimeout):
+            await c.creo_pwd()
+        # a mutating command is not sent again
+        with pytest.raises(RequestTimeout):
+            await c.file_open("box.prt")
+        with pytest.raises(CircuitOpen):
+            await c.creo_pwd()
+        await c.close()
+
+    with caplog.at_level("WARNING", logger="creopyson.aio"):
+        run(main())
+    # (attempt, retries, backoff delay) of each retry
+    assert [record.args[3:] for record in caplog.records] == [(1, 2, 0.01), (2, 2, 0.02)]
+    assert len(accepted) == 4
+
+
+def test_aio_cancelled_trial(silent_server):
+    """Test a cancelled half-open request lets the next one through."""
+    port, accepted = silent_server
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0.01)
+    breaker.failure()
+
+    async def main():
+        c = creopyson.AsyncClient(port=port, circuit_breaker=breaker)
+        await asyncio.sleep(0.02)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(c.creo_pwd(), 0.05)
+        assert breaker.state == "half-open"
+        assert not breaker.is_open
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(c.creo_pwd(), 0.05)
+        await c.close()
+
+    run(main())
+    assert len(accepted) == 2
+
+
+@pytest.mark.parametrize("response", [
+    b"garbage\r\n\r\n",
+    b"HTTP/1.1 OK\r\n\r\n",
+    b"HTTP/1.1 200 OK\r\nContent-Length: ten\r\n\r\n",
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+    b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n",
+])
+def test_aio_invalid_response(response):
+    """Test a malformed or truncated response raises ConnectionError."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(4)
+
+    def answer():
+        while True:
+            try:
+                conn = sock.accept()[0]
+            except OSError:
+                return
+            conn.recv(65536)
+            conn.sendall(response)
+            conn.close()
+
+    threading.Thread(target=answer, daemon=True).start()
+
+    async def main():
+        c = creopyson.AsyncClient(port=sock.getsockname()[1])
+        with pytest.raises(ConnectionError):
+            await c.creo_pwd()
+        await c.close()
+
+    try:
+        run(main())
+    finally:
+        sock.close()
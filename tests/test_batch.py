@@ -0,0 +1,97 @@
+"""Batch testing."""
+from concurrent.futures import Future
+
+import pytest
+import creopyson
+from creopyson.batch import Batch
+from creopyson.fakeserver import FakeCreoson
+
+
+@pytest.fixture
+def client():
+    """Connected client of a fake server with two models."""
+    with FakeCreoson() as server:
+        server.add_model("box.prt", dimensions={"d0": 1})
+        server.add_model("plate.prt")
+        c = server.client()
+        c.connect()
+        c.file_open("box.prt")
+        yield c
+        c.close()
+
+
+def test_batch_futures(client):
+    """Test commands return futures, resolved at exit."""
+    with client.batch() as batch:
+        futures = [
+            client.parameter_set("P{}".format(i), i, type_="INTEGER")
+            for i in range(20)
+        ]
+        futures.append(client.parameter_set("P0", "x", file_="plate.prt"))
+        regen = client.file_regenerate()
+        params = client.parameter_list()
+        bad = client.dimension_set("nope", 1)
+        assert len(batch) == 24
+        assert not params.done()
+    assert all(isinstance(f, Future) and f.result() is None for f in futures)
+    assert regen.result() is None
+    assert len(params.result()) == 20
+    assert isinstance(bad.exception(), RuntimeError)
+    assert client.parameter_list(file_="plate.prt")[0]["value"] == "x"
+
+
+def test_batch_cancel_on_error(client):
+    """Test queued commands are cancelled if the block raises."""
+    with pytest.raises(ValueError):
+        with client.batch():
+            future = client.parameter_set("P", 1)
+            raise ValueError
+    assert future.cancelled()
+    assert client.parameter_list() == []
+
+
+def test_batch_nested(client):
+    """Test nested batches join the outer one."""
+    with client.batch() as outer:
+        with client.batch() as inner:
+            future = client.parameter_set("P", 1)
+        assert inner is outer
+        assert not future.done()
+    assert future.done()
+
+
+def test_batch_plan():
+    """Test lanes, barriers and waves."""
+    c = creopyson.Client()
+    batch = Batch(c)
+    for i in range(3):
+        batch.add("parameter", "set", {"file": "a.prt", "name": "P{}".format(i)})
+    batch.add("parameter", "set", {"file": "a.prt", "name": "P0"})
+    batch.add("file", "regenerate", {"file": "a.prt"})
+    batch.add("parameter", "set", {"file": "B.prt", "name": "P0"})
+    batch.add("creo", "cd", {"dirname": "here"})
+    batch.add("file", "regenerate", {"file": "b.prt"})
+    segments = list(batch._segments())
+    assert [[len(lane) for lane in lanes] for lanes in segments] == [[5, 1], [1], [1]]
+    waves = Batch._waves(segments[0][0])
+    assert [len(wave) for wave in waves] == [3, 1, 1]
+
+    batch.ordered = True
+    assert len(list(batch._segments())) == 8
+
+
+def test_batch_immediate(monkeypatch):
+    """Test commands needed to build requests are not queued."""
+    calls = []
+
+    def fake_send(client, command, function, data=None, key_data=None):
+        calls.append(function)
+        return {"file": "active.prt"}
+
+    monkeypatch.setattr(creopyson.connection.Client, "_send", fake_send)
+    c = creopyson.Client()
+    with c.batch():
+        future = c.parameter_delete("P")
+        assert calls == ["get_active"]
+    assert calls == ["get_active", "delete"]
+    assert future.result() == {"file": "active.prt"}
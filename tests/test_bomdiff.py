@@ -0,0 +1,81 @@
+"""BOM diff testing."""
+import pytest
+from creopyson.bomdiff import BomSnapshot, diff
+from creopyson.fakeserver import FakeCreoson, translation
+
+
+@pytest.fixture
+def server():
+    """Fake server with top.asm: sub.asm (2 bolts) and 2 nuts."""
+    with FakeCreoson() as server:
+        for name in ("bolt.prt", "nut.prt", "washer.prt"):
+            server.add_model(name)
+        server.add_model("sub.asm", children=["bolt.prt", "bolt.prt"])
+        server.add_model("top.asm", children=[
+            "sub.asm", ("nut.prt", translation(x=1)), "nut.prt"
+        ])
+        yield server
+
+
+def _snapshot(client, paths=True):
+    return BomSnapshot(
+        client.bom_get_tree(file_="top.asm", paths=paths, get_transforms=True)
+    )
+
+
+def test_bomdiff_changes(server):
+    """Test added, removed, replaced and moved components."""
+    c = server.client()
+    c.connect()
+    before = _snapshot(c)
+    assert len(before) == 6
+    assert not diff(before, _snapshot(c))
+    assert before == _snapshot(c)
+    assert before.digest == _snapshot(c).digest
+
+    models = server.session.models
+    models["top.asm"].children[1] = ("nut.prt", translation(x=4, y=-1))
+    models["top.asm"].children[2] = ("washer.prt", translation())
+    models["sub.asm"].children.pop()
+    models["top.asm"].children.append(("bolt.prt", translation()))
+    after = _snapshot(c)
+    c.close()
+
+    changes = diff(before, after)
+    assert repr(changes) == "<BomDiff +1 -1 ~1 >1>"
+    assert len(changes) == 4
+    assert [(ch.seq_path, ch.file) for ch in changes.added] == [("root.4", "bolt.prt")]
+    assert [(ch.seq_path, ch.file) for ch in changes.removed] == [
+        ("root.1.2", "bolt.prt")
+    ]
+    replaced, = changes.replaced
+    assert (replaced.old_file, replaced.file, replaced.key) == (
+        "nut.prt", "washer.prt", (3,)
+    )
+    moved, = changes.moved
+    assert moved.seq_path == "root.2"
+    assert moved.translation == (3.0, -1.0, 0.0)
+    assert moved.rotated is False
+    assert {change.kind for change in changes} == {
+        "added", "removed", "replaced", "moved"
+    }
+    assert before.digest != after.digest
+
+
+def test_bomdiff_save_load(server, tmp_path):
+    """Test snapshots round trip through a gzipped file."""
+    c = server.client()
+    c.connect()
+    snapshot = _snapshot(c)
+    by_seq_path = _snapshot(c, paths=False)
+    c.close()
+    path = tmp_path / "top.bom.gz"
+    snapshot.save(path)
+    loaded = BomSnapshot.load(path)
+    assert loaded == snapshot
+    assert loaded.file == "top.asm"
+    assert loaded.key_type == "path"
+    assert not diff(loaded, snapshot)
+    assert by_seq_path.key_type == "seq_path"
+    with pytest.raises(ValueError):
+        diff(snapshot, by_seq_path)
@@ -0,0 +1,213 @@
+"""BOM tree testing."""
+import pytest
+import creopyson
+from creopyson.bomtree import BomNode, BomTree
+from creopyson.fakeserver import FakeCreoson, translation
+
+
+@pytest.fixture
+def tree():
+    """Tree of top.asm: sub.asm twice (2 bolts each) and a bolt."""
+    def node(file_, seq_path, path, children=None, **extra):
+        result = {"file": file_, "seq_path": seq_path, "path": path}
+        if children:
+            result["children"] = children
+        result.update(extra)
+        return result
+
+    def sub(seq_path, path):
+        return node("SUB.ASM", seq_path, path, [
+            node("BOLT.PRT", seq_path + ".1", path + [1]),
+            node("BOLT.PRT", seq_path + ".2", path + [2], simpreps=["A"]),
+        ])
+
+    return BomTree({
+        "file": "TOP.ASM",
+        "generic": "",
+        "has_simprep": False,
+        "children": node("TOP.ASM", "root", [], [
+            sub("root.1", [10]),
+            sub("root.2", [11]),
+            node("BOLT.PRT", "root.3", [12]),
+        ]),
+    })
+
+
+def test_bomtree_structure(tree):
+    """Test depth-first storage and navigation."""
+    assert len(tree) == 8
+    assert [node.seq_path for node in tree] == [
+        "root", "root.1", "root.1.1", "root.1.2",
+        "root.2", "root.2.1", "root.2.2", "root.3",
+    ]
+    assert list(tree.depths) == [0, 1, 2, 2, 1, 2, 2, 1]
+    assert list(tree.parents) == [-1, 0, 1, 1, 0, 4, 4, 0]
+    assert list(tree.ends) == [8, 4, 3, 4, 7, 6, 7, 8]
+    root = tree.root
+    assert [child.seq_path for child in root.children] == ["root.1", "root.2", "root.3"]
+    node = tree["root.2.1"]
+    assert isinstance(node, BomNode)
+    assert node.file == "BOLT.PRT"
+    assert node.parent == tree["root.2"]
+    assert [n.file for n in node.ancestors()] == ["SUB.ASM", "TOP.ASM"]
+    assert tree["root.2"].is_assembly and not node.is_assembly
+    assert len(tree["root.1"].descendants()) == 2
+    assert tree["root.1.2"].data == {"simpreps": ["A"]}
+    assert tree[-1].seq_path == "root.3"
+    assert "root.9" not in tree and tree.get("root.9") is None
+    with pytest.raises(KeyError):
+        tree["root.9"]
+
+
+def test_bomtree_lookups(tree):
+    """Test lookups by path and file, where used and quantities."""
+    assert tree.by_path([11, 2]).seq_path == "root.2.2"
+    assert tree.by_path(()).seq_path == "root"
+    assert [n.seq_path for n in tree.find("bolt.prt")] == [
+        "root.1.1", "root.1.2", "root.2.1", "root.2.2", "root.3"
+    ]
+    assert tree.where_used("bolt.prt") == {"SUB.ASM": 4, "TOP.ASM": 1}
+    assert tree.where_used("top.asm") == {}
+    assert tree.quantity("bolt.prt") == 5
+    assert tree.quantity("bolt.prt", under="root.2") == 2
+    assert tree.quantity("top.asm") == 0
+    assert tree.quantities() == {"SUB.ASM": 2, "BOLT.PRT": 5}
+    assert tree.quantities(under=tree["root.1"]) == {"BOLT.PRT": 2}
+    assert tree.transform(0) is None
+
+
+def test_bomtree_empty():
+    """Test a result without children."""
+    tree = BomTree({"file": "empty.asm"})
+    assert len(tree) == 0
+    assert tree.quantities() == {}
+    with pytest.raises(ValueError):
+        tree.by_path([1])
+
+
+def test_bomtree_get_tree():
+    """Test bom_get_tree with the fake server."""
+    with FakeCreoson() as server:
+        server.add_model("bolt.prt")
+        server.add_model("top.asm", children=[
+            ("bolt.prt", translation(x=5)), "bolt.prt"
+        ])
+        server.add_assembly("big", breadth=4, depth=3)
+        c = server.client()
+        c.connect()
+        tree = c.bom_get_tree(file_="top.asm", paths=True, get_transforms=True)
+        assert tree.file == "top.asm"
+        assert tree["root.1"].transform["origin"] == {"x": 5.0, "y": 0.0, "z": 0.0}
+        assert tree.by_path([2]).transform["x_axis"]["x"] == 1.0
+        assert tree.quantity("BOLT.PRT") == 2
+        big = c.bom_get_tree(file_="big.asm")
+        assert len(big) == 1 + 4 + 16 + 64
+        assert big.quantities(under="root.1")["big_1_1_1.prt"] == 1
+        assert big.paths is None and big.transforms is None
+        c.close()
+    assert creopyson.Client.bom_get_tree is creopyson.bom.get_tree
+
+
+def _rotation_z(x=0.0):
+    """JLTransform rotating 90 degrees around Z, translated by x."""
+    return {
+        "origin": {"x": x, "y": 0.0, "z": 0.0},
+        "x_axis": {"x": 0.0, "y": 1.0, "z": 0.0},
+        "y_axis": {"x": -1.0, "y": 0.0, "z": 0.0},
+        "z_axis": {"x": 0.0, "y": 0.0, "z": 1.0},
+    }
+
+
+def test_bomtree_transform_array():
+    """Test transforms as (N, 4, 4) matrices, relative to the top or the parent."""
+    np = pytest.importorskip("numpy")
+    from creopyson.bomtree import compose, decompose, to_transform
+
+    with FakeCreoson() as server:
+        server.add_model("bolt.prt")
+        server.add_model("sub.asm", children=[("bolt.prt", translation(x=5))])
+        server.add_model("top.asm", children=[
+            ("sub.asm", _rotation_z(x=100)), ("bolt.prt", translation(y=1))
+        ])
+        c = server.client()
+        c.connect()
+        tree = c.bom_get_tree(file_="top.asm", get_transforms=True)
+        sub = c.bom_get_tree(file_="sub.asm", get_transforms=True)
+        c.close()
+    world = tree.transform_array()
+    assert world.shape == (4, 4, 4)
+    assert np.allclose(world[1][:3, 0], [0, 1, 0])
+    assert np.allclose(world[1][:3, 3], [100, 0, 0])
+    assert to_transform(world[1]) == _rotation_z(x=100)
+    bolt = tree["root.1.1"].index
+    # bolt at x=5 in sub, sub rotated 90 degrees around Z at x=100
+    assert np.allclose(world[bolt][:3, 3], [100, 5, 0])
+    assert np.allclose(world[bolt][:3, 0], [0, 1, 0])
+
+    local = tree.local_transforms()
+    assert np.allclose(local[bolt], sub.transform_array()[1])
+    assert np.allclose(local[tree["root.2"].index][:3, 3], [0, 1, 0])
+    assert np.allclose(compose(local, tree.parents, tree.depths), world)
+
+    # same result as multiplying along each path
+    for node in tree:
+        expected = np.eye(4)
+        for ancestor in reversed(node.ancestors()):
+            expected = expected @ local[ancestor.index]
+        assert np.allclose(world[node.index], expected @ local[node.index])
+
+    assert compose(np.zeros((0, 4, 4)), [], []).shape == (0, 4, 4)
+    assert decompose(np.zeros((0, 4, 4)), []).shape == (0, 4, 4)
+    with pytest.raises(ValueError):
+        BomTree({"children": {"file": "a.prt", "seq_path": "root"}}).transform_array()
+
+
+def _walk(node, depth=0):
+    yield node, depth
+    for child in node.get("children", []):
+        yield from _walk(child, depth + 1)
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_bom_iter_paths(workers):
+    """Test the lazy traversal yields the same components as get_paths."""
+    with FakeCreoson() as server:
+        server.add_assembly("top", breadth=3, depth=3)
+        server.add_model("shared.asm", children=["top_1_1.asm"] * 2)
+        c = server.client()
+        c.connect()
+        options = dict(file_="top.asm", paths=True, get_transforms=True)
+        full = c.bom_get_paths(**options)["children"]
+        expected = [
+            (node["seq_path"], node["file"], node.get("path", []), depth)
+            for node, depth in _walk(full)
+        ]
+        items = list(c.bom_iter_paths(workers=workers, **options))
+        assert [
+            (item["seq_path"], item["file"], item.get("path", []), item["depth"])
+            for item in items
+        ] == expected
+        assert items[1]["transform"] == full["children"][0]["transform"]
+
+        breadth = list(c.bom_iter_paths("top.asm", breadth_first=True, workers=workers))
+        assert [item["depth"] for item in breadth] == sorted(
+            depth for _, _, _, depth in expected
+        )
+        assert {item["seq_path"] for item in breadth} == {seq for seq, *_ in expected}
+
+        records = []
+        c.add_hook(post=records.append)
+        shared = list(c.bom_iter_paths("shared.asm", workers=workers))
+        assert len(shared) == 1 + 2 * 4
+        assert len(records) == 2  # shared.asm and top_1_1.asm once
+
+        records.clear()
+        first = next(iter(c.bom_iter_paths("top.asm", workers=workers)))
+        assert first == {"file": "top.asm", "seq_path": "root", "depth": 0}
+
+        pruned = list(c.bom_iter_paths(
+            "top.asm", expand=lambda item: item["depth"] < 2, workers=workers
+        ))
+        assert max(item["depth"] for item in pruned) == 2
+        assert len(pruned) == 1 + 3 + 9
+        c.close()
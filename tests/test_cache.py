@@ -0,0 +1,124 @@
+"""Cache testing."""
+import time
+
+import creopyson
+from creopyson.cache import ResultCache, freeze, request_files
+from creopyson.fakeserver import FakeCreoson
+
+
+def _put(cache, command, function, file_=None, value="x"):
+    data = {"file": file_} if file_ else None
+    key = cache.key(command, function, data)
+    cache.put(key, value)
+    return key
+
+
+def test_cache_request_files():
+    """Test model names of a request."""
+    assert request_files(None) == []
+    assert request_files({"file": "Box.prt", "to_file": "plate.prt"}) == [
+        "box.prt", "plate.prt"
+    ]
+    assert request_files({"files": ["a.prt", "*.asm"]}) == ["a.prt", None]
+
+
+def test_cache_freeze():
+    """Test request data made hashable, independent of the key order."""
+    data = {"file": "box.prt", "names": ["A", "B"], "options": {"x": 1, "y": [2]}}
+    frozen = freeze(data)
+    assert hash(frozen) == hash(freeze(dict(reversed(list(data.items())))))
+    assert frozen == (
+        ("file", "box.prt"), ("names", ("A", "B")), ("options", (("x", 1), ("y", (2,))))
+    )
+    assert freeze(None) is None
+
+
+def test_cache_lru_ttl():
+    """Test size limit, expiry and copies."""
+    cache = ResultCache(maxsize=2, ttl=0.05)
+    assert cache.key("parameter", "set", {"file": "a.prt"}) is None
+    key_a = _put(cache, "parameter", "list", "a.prt", [{"name": "A"}])
+    key_b = _put(cache, "parameter", "list", "b.prt")
+    found, value = cache.get(key_a)
+    assert found and value == [{"name": "A"}]
+    value.append("changed")
+    assert cache.get(key_a)[1] == [{"name": "A"}]
+    _put(cache, "parameter", "list", "c.prt")
+    assert cache.get(key_b) == (False, None)
+    assert len(cache) == 2 and cache.evictions == 1
+    time.sleep(0.06)
+    assert cache.get(key_a) == (False, None)
+    assert cache.expirations == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_invalidation_rules():
+    """Test the declarative invalidation table."""
+    cache = ResultCache()
+    params = _put(cache, "parameter", "list", "a.prt")
+    layers = _put(cache, "layer", "list", "a.prt")
+    other = _put(cache, "parameter", "list", "b.prt")
+    active = _put(cache, "parameter", "list")
+    mass = _put(cache, "file", "massprops", "top.asm")
+
+    cache.notify("parameter", "set", {"file": "A.prt", "name": "X"})
+    assert cache.get(params)[0] is False
+    assert cache.get(active)[0] is False
+    assert cache.get(layers)[0] and cache.get(other)[0] and cache.get(mass)[0]
+
+    # not in the table: every result of the model, aggregates of all models
+    cache.notify("file", "regenerate", {"file": "a.prt"})
+    assert cache.get(layers)[0] is False
+    assert cache.get(mass)[0] is False
+    assert cache.get(other)[0]
+
+    # read-only and neutral commands evict nothing
+    cache.notify("file", "exists", {"file": "b.prt"})
+    cache.notify("file", "save", {"file": "b.prt"})
+    assert cache.get(other)[0]
+
+    # no model: everything
+    cache.notify("file", "erase_not_displayed")
+    assert len(cache) == 0
+
+
+def test_cache_generation():
+    """Test a result received after a change is not cached."""
+    cache = ResultCache()
+    key = cache.key("parameter", "list", {"file": "a.prt"})
+    generation = cache.generation
+    cache.invalidate("a.prt", ("parameter",))
+    cache.put(key, "stale", generation)
+    assert cache.get(key)[0] is False
+
+
+def test_cache_client():
+    """Test a client with a cache and the fake server."""
+    with FakeCreoson() as server:
+        server.add_model("box.prt", parameters={"COLOR": "red"})
+        c = server.client(cache=True)
+        c.connect()
+        before = server.requests
+        assert c.file_get_length_units(file_="box.prt") == "mm"
+        assert c.file_get_length_units(file_="box.prt") == "mm"
+        assert c.parameter_list(file_="box.prt")[0]["value"] == "red"
+        assert server.requests - before == 2
+
+        c.file_set_length_units("in", file_="box.prt")
+        assert c.file_get_length_units(file_="box.prt") == "in"
+        c.parameter_set("COLOR", "blue", file_="box.prt")
+        assert c.parameter_list(file_="box.prt")[0]["value"] == "blue"
+        assert server.requests - before == 6
+
+        with c.batch():
+            future = c.parameter_list(file_="box.prt")
+        assert future.result()[0]["value"] == "blue"
+        assert server.requests - before == 6
+        assert c.cache.hits == 2
+        c.close()
+
+    assert creopyson.Client(cache=False).cache is None
+    shared = ResultCache()
+    assert creopyson.Client(cache=shared).cache is shared
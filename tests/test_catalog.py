@@ -0,0 +1,202 @@
+"""Dimension catalog testing."""
+import asyncio
+import base64
+import math
+
+import pytest
+import creopyson
+from creopyson import catalog as catalog_module
+from creopyson.catalog import DimensionCatalog, decode_value
+from creopyson.fakeserver import FakeCreoson, translation
+
+DIMS = [
+    {
+        "name": "d0",
+        "value": 10.0,
+        "encoded": False,
+        "dwg_dim": False,
+        "sheet": 1,
+        "view_name": "FRONT",
+        "dim_type": "linear",
+        "text": "@D",
+        "location": {"x": 1.0, "y": 2.0, "z": 0.0},
+        "tolerance_type": "plus_minus",
+        "tol_plus": 0.1,
+        "tol_minus": 0.1,
+    },
+    {
+        "name": "d1",
+        "value": base64.b64encode("Ø12".encode()).decode(),
+        "encoded": True,
+        "dwg_dim": True,
+        "sheet": 2,
+        "view_name": "SECTION_A",
+        "dim_type": "diameter",
+        "text": "@D",
+    },
+    {
+        "name": "d2",
+        "value": 45.0,
+        "sheet": 2,
+        "view_name": "SECTION_A",
+        "dim_type": "angular",
+        "tolerance_type": "plus_minus",
+        "tol_plus": 0.5,
+        "tol_minus": 0.25,
+    },
+]
+
+
+def _catalog():
+    return DimensionCatalog.from_many({
+        "box.drw": DIMS,
+        "plate.drw": [dict(DIMS[0], value=base64.b64encode(b"3.5").decode(), encoded=True)],
+    })
+
+
+def test_decode_value():
+    """Test values decoded to a number, or kept as text."""
+    assert decode_value(2.5) == (2.5, None)
+    assert decode_value(base64.b64encode(b"7").decode(), encoded=True) == (7.0, None)
+    number, text = decode_value("abc")
+    assert math.isnan(number) and text == "abc"
+    assert math.isnan(decode_value(None)[0])
+
+
+def test_catalog_columns():
+    """Test dimensions stored by columns, strings as codes."""
+    catalog = _catalog()
+    assert len(catalog) == 4
+    assert repr(catalog) == "<DimensionCatalog 4 dimensions of 2 models>"
+    assert catalog["file"] == ["box.drw"] * 3 + ["plate.drw"]
+    assert catalog.categories["view_name"] == ["FRONT", "SECTION_A"]
+    assert list(catalog.codes["view_name"]) == [0, 1, 1, 0]
+    values = catalog["value"]
+    assert values.typecode == "d"
+    assert values[0] == 10.0 and math.isnan(values[1]) and values[3] == 3.5
+    assert catalog["value_text"] == [None, "Ø12", None, None]
+    assert list(catalog["sheet"]) == [1, 2, 2, 1]
+    assert list(catalog["dwg_dim"]) == [0, 1, 0, 0]
+    assert list(catalog["x"])[0] == 1.0 and math.isnan(catalog["x"][1])
+    assert catalog["tolerance_type"] == ["plus_minus", None, "plus_minus", "plus_minus"]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_catalog_filters(monkeypatch, numpy):
+    """Test filters, with and without NumPy."""
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(catalog_module, "_numpy", lambda: None)
+    catalog = _catalog()
+    assert list(catalog.indices()) == [0, 1, 2, 3]
+    assert list(catalog.indices(dim_type="linear")) == [0, 3]
+    assert list(catalog.indices(dim_type=["diameter", "angular"])) == [1, 2]
+    assert list(catalog.indices(view="section_*", sheet=2)) == [1, 2]
+    assert list(catalog.indices(sheet=[1])) == [0, 3]
+    assert list(catalog.indices(file_="plate.drw")) == [3]
+    assert list(catalog.indices(dwg_dim=True)) == [1]
+    assert list(catalog.indices(tolerance=(0.5, None))) == [2]
+    assert list(catalog.indices(tolerance=(None, 0.3))) == [0, 3]
+    assert list(catalog.indices(tolerance_type="plus_minus", view="FRONT")) == [0, 3]
+    assert list(catalog.indices(view="NOPE")) == []
+
+    section = catalog.where(view="SECTION_A")
+    assert isinstance(section, DimensionCatalog)
+    assert section["name"] == ["d1", "d2"]
+    assert list(section["sheet"]) == [2, 2]
+    assert section["dim_type"] == ["diameter", "angular"]
+    assert list(section.where(dim_type="angular")["tol_plus"]) == [0.5]
+    assert len(catalog.where(file_="nope.drw")) == 0
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_catalog_join_views(monkeypatch, numpy):
+    """Test dimensions joined to the view details of their drawing."""
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(catalog_module, "_numpy", lambda: None)
+    catalog = _catalog()
+    table = catalog.join_views({
+        "BOX.DRW": [
+            {"name": "FRONT", "sheet": 1, "location": {"x": 10.0, "y": 20.0},
+             "text_height": 3.5, "view_model": "box.prt", "simp_rep": None},
+            {"name": "SECTION_A", "sheet": 2, "location": {"x": 5.0, "y": 6.0},
+             "text_height": 5.0, "view_model": "box.prt"},
+        ],
+    })
+    assert table.names[-6:] == [
+        "view_sheet", "view_x", "view_y", "text_height", "view_model", "simp_rep"
+    ]
+    assert len(table) == 4
+    assert list(table["view_sheet"]) == [1, 2, 2, 0]
+    assert list(table["view_x"])[:3] == [10.0, 5.0, 5.0]
+    assert math.isnan(table["view_x"][3])
+    assert table["view_model"] == ["box.prt"] * 3 + [None]
+    assert table["file"] == ["box.drw"] * 3 + ["plate.drw"]
+
+
+def test_catalog_to_pandas():
+    """Test pandas export with coded columns as categories."""
+    pytest.importorskip("pandas")
+    df = _catalog().to_pandas()
+    assert list(df.columns) == list(catalog_module.COLUMNS)
+    assert df["view_name"].dtype == "category"
+    assert df["dwg_dim"].tolist() == [False, True, False, False]
+
+
+def _server():
+    server = FakeCreoson()
+    server.add_model("box.prt", dimensions={"d0": 10.0, "d1": 20.0})
+    server.add_model(
+        "box.drw",
+        dimensions={
+            "d0": {"value": 10.0, "view_name": "TOP", "sheet": 2, "dwg_dim": True},
+            "d1": {"value": 5.0, "dim_type": "radial", "tol_plus": 0.5},
+        },
+        views=[
+            {"name": "MAIN", "view_model": "box.prt"},
+            {"name": "TOP", "sheet": 2, "location": translation(50, 60)["origin"]},
+        ],
+    )
+    return server
+
+
+def test_dimension_list_catalog():
+    """Test the dimensions and views of many models listed in a batch."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        before = server.requests
+        catalog = c.dimension_list_catalog(["box.prt", "box.drw"], views=True)
+        assert server.requests - before == 3
+        assert catalog["file"] == ["box.prt", "box.prt", "box.drw", "box.drw"]
+        assert list(catalog.indices(dim_type="radial")) == [3]
+        assert list(catalog.indices(tolerance=(0.55, None))) == [3]
+        table = catalog.where(file_="*.drw").join_views()
+        assert list(table["view_x"]) == [50.0, 0.0]
+        assert table["view_model"] == [None, "box.prt"]
+
+        assert len(c.dimension_list_catalog(["box.drw"], dim_type="radial")) == 1
+        with pytest.raises(RuntimeError):
+            c.dimension_list_catalog(["missing.prt"])
+        with c.batch():
+            with pytest.raises(RuntimeError):
+                c.dimension_list_catalog(["box.prt"])
+        c.close()
+
+
+def test_async_dimension_list_catalog():
+    """Test the catalog listed with an AsyncClient."""
+
+    async def run(port):
+        async with creopyson.AsyncClient(port=port) as c:
+            await c.connect()
+            return await c.dimension_list_catalog(["box.prt", "box.drw"], views=True)
+
+    with _server() as server:
+        catalog = asyncio.run(run(server.port))
+    assert len(catalog) == 4
+    assert list(catalog.views) == ["box.drw"]
+    assert catalog.join_views()["view_sheet"][2] == 2
@@ -0,0 +1,87 @@
+"""Codec testing."""
+import json
+
+import pytest
+import creopyson
+from creopyson.codec import Codec, get_codec
+from creopyson.fakeserver import FakeCreoson
+
+
+def test_codec_json():
+    """Test the standard library codec works on bytes."""
+    codec = get_codec("json")
+    assert codec.name == "json"
+    body = codec.dumps({"data": {"value": "é"}})
+    assert isinstance(body, bytes)
+    assert codec.loads(body) == {"data": {"value": "é"}}
+    with pytest.raises(ValueError):
+        codec.loads(b"<html>")
+
+
+def test_codec_default():
+    """Test the default codec is the fastest installed one."""
+    codec = get_codec()
+    assert codec is get_codec()
+    assert codec.name in ("orjson", "ujson", "json")
+    assert codec.loads(codec.dumps({"a": [1, 2.5, None, True]})) == {
+        "a": [1, 2.5, None, True]
+    }
+
+
+def test_codec_orjson():
+    """Test orjson codec, if installed."""
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+    assert codec.loads(codec.dumps({"a": 1})) == {"a": 1}
+
+
+def test_codec_unknown():
+    """Test unknown codec name."""
+    with pytest.raises(ValueError):
+        get_codec("pickle")
+
+
+def test_codec_client():
+    """Test Client codec argument."""
+    custom = Codec("custom", lambda obj: b"{}", lambda data: {})
+    assert creopyson.Client(codec=custom).codec is custom
+    assert creopyson.Client(codec="json").codec.name == "json"
+    assert repr(custom) == "Codec('custom')"
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "ujson"])
+def test_codec_dumps_numpy_and_wide_values(name):
+    """Test NumPy values, int keys and wide ints encoded by every codec."""
+    np = pytest.importorskip("numpy")
+    if name != "json":
+        pytest.importorskip(name)
+    codec = get_codec(name)
+    body = codec.dumps({
+        "value": np.float64(2.5),
+        "count": np.int64(3),
+        "flag": np.bool_(True),
+        "levels": np.array([1.0, 2.0]),
+        "big": 2 ** 70,
+        "keys": {1: "a"},
+    })
+    assert json.loads(body) == {
+        "value": 2.5,
+        "count": 3,
+        "flag": True,
+        "levels": [1.0, 2.0],
+        "big": 2 ** 70,
+        "keys": {"1": "a"},
+    }
+    with pytest.raises(TypeError):
+        codec.dumps({"value": object()})
+
+
+def test_codec_client_numpy_value():
+    """Test a set command with a NumPy value sent with the default codec."""
+    np = pytest.importorskip("numpy")
+    with FakeCreoson() as server:
+        server.add_model("box.prt", dimensions={"d0": 1.0})
+        with server.client() as c:
+            c.connect()
+            c.dimension_set("d0", np.float64(2.5), file_="box.prt")
+            assert server.session.models["box.prt"].dimensions["d0"] == 2.5
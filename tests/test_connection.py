@@ -2,6 +2,8 @@
 
 import requests
 import json
+import subprocess
+import sys
 import pytest
 import creopyson
 from creopyson.exceptions import MissingKey, ErrorJsonDecode
@@ -41,7 +43,7 @@ def test_connection_connect_fails(monkeypatch):
         def __init__(self, *args, **kwargs):
             raise requests.exceptions.RequestException
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(ConnectionError) as pytest_wrapped_e:
         c.connect()
@@ -59,11 +61,12 @@ def test_connection_creoson_post_error_connection(monkeypatch):
         def status_code(self):
             return 500
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(ConnectionError) as pytest_wrapped_e:
         c._creoson_post("function", "method", {})
     assert pytest_wrapped_e.value.args[0] == "Status code : 500"
+    assert pytest_wrapped_e.value.status_code == 500
 
 
 def test_connection_creoson_post_json_error(monkeypatch):
@@ -72,13 +75,14 @@ def test_connection_creoson_post_json_error(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
-            raise TypeError
+        @property
+        def content(self):
+            return b"<html>Not JSON</html>"
 
         @property
         def status_code(self):
             return 200
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(ErrorJsonDecode) as pytest_wrapped_e:
         c._creoson_post("function", "method", {})
@@ -92,20 +96,21 @@ def test_connection_creoson_post_raise_RuntimeError(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": True,
                     "message": "error message"
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(RuntimeError) as pytest_wrapped_e:
         c._creoson_post("function", "method", {})
@@ -118,7 +123,8 @@ def test_connection_creoson_post_return_data(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False,
@@ -126,13 +132,13 @@ def test_connection_creoson_post_return_data(monkeypatch):
                 },
                 "data": "creoson result"
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     result = c._creoson_post("function", "method", {})
     assert result == "creoson result"
@@ -144,20 +150,21 @@ def test_connection_creoson_post_return_None(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False,
                     "message": "error message"
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     result = c._creoson_post("function", "method", {})
     assert result is None
@@ -169,15 +176,16 @@ def test_connection_creoson_post_no_status(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {"status": {}}
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(MissingKey) as pytest_wrapped_e:
         c._creoson_post("function", "method", {})
@@ -191,15 +199,16 @@ def test_connection_creoson_post_no_error(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {}
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(MissingKey) as pytest_wrapped_e:
         c._creoson_post("function", "method", {})
@@ -213,19 +222,20 @@ def test_connection_creoson_post_no_sessionId(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(MissingKey) as pytest_wrapped_e:
         c._creoson_post("connection", "connect", {})
@@ -239,20 +249,21 @@ def test_connection_creoson_post_sessionId(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False
                 },
                 "sessionId": 12345
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     result = c._creoson_post("connection", "connect", {})
     assert result == 12345
@@ -264,19 +275,20 @@ def test_connection_creoson_post_no_data(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(MissingKey) as pytest_wrapped_e:
         c._creoson_post("function", "method", {}, key_data="fakedata")
@@ -290,20 +302,21 @@ def test_connection_creoson_post_no_datakey(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False
                 },
                 "data": {}
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(MissingKey) as pytest_wrapped_e:
         c._creoson_post("function", "method", {}, key_data="fakedata")
@@ -317,7 +330,8 @@ def test_connection_creoson_post_datakey(monkeypatch):
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False
@@ -326,13 +340,13 @@ def test_connection_creoson_post_datakey(monkeypatch):
                     "fakedata": "fakevalue"
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
         @property
         def status_code(self):
             return 200
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     result = c._creoson_post("function", "method", {}, key_data="fakedata")
     assert result == "fakevalue"
@@ -372,3 +386,123 @@ def test_connection_stop_creo_ok(mk_creoson_post_None):
     c = creopyson.Client()
     result = c.stop_creo()
     assert result is None
+
+
+def test_connection_session_reused():
+    """Test the pooled session is created once and reused."""
+    c = creopyson.Client(pool_size=4)
+    session = c.session
+    assert isinstance(session, requests.Session)
+    assert c.session is session
+    assert session.get_adapter(c.server)._pool_maxsize == 4
+
+
+def test_connection_close():
+    """Test close releases the session and a new one is opened on demand."""
+    c = creopyson.Client()
+    session = c.session
+    c.close()
+    assert c._session is None
+    assert c.session is not session
+    c.close()
+    c.close()
+
+
+def test_connection_context_manager(monkeypatch):
+    """Test context manager disconnects and closes the session."""
+    calls = []
+
+    def fake_func(client, command, function, data=None, key_data=None):
+        calls.append((command, function))
+        if function == "connect":
+            return "123456"
+        return None
+
+    monkeypatch.setattr(creopyson.connection.Client, "_creoson_post", fake_func)
+    with creopyson.Client() as c:
+        c.connect()
+        c.session
+        assert c.sessionId == "123456"
+    assert calls == [("connection", "connect"), ("connection", "disconnect")]
+    assert c.sessionId == ""
+    assert c._session is None
+
+
+def test_connection_context_manager_not_connected(mk_creoson_post_None):
+    """Test context manager does not disconnect an unconnected client."""
+    with creopyson.Client() as c:
+        c.session
+    assert c._session is None
+
+
+def test_connection_disconnect_close_session(mk_creoson_post_None):
+    """Test disconnect closes the pooled session."""
+    c = creopyson.Client()
+    c.sessionId = "12345"
+    c.session
+    c.disconnect()
+    assert c._session is None
+
+
+def test_connection_creoson_post_invalidate_active_file(monkeypatch):
+    """Test commands changing the active model drop the cached one."""
+    class Mk_post():
+        def __init__(self, *args, **kwargs):
+            pass
+
+        @property
+        def content(self):
+            return b'{"status": {"error": false}, "data": {}}'
+
+        @property
+        def status_code(self):
+            return 200
+
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
+    c = creopyson.Client()
+    c._active_file = {"file": "file.prt"}
+    c._creoson_post("parameter", "list", {})
+    assert c._active_file == {"file": "file.prt"}
+    c._creoson_post("file", "open", {})
+    assert c._active_file is None
+
+
+def test_connection_lazy_import():
+    """Test `import creopyson` imports no command module nor requests."""
+    code = (
+        "import sys, creopyson\n"
+        "assert 'requests' not in sys.modules\n"
+        "assert 'creopyson.file' not in sys.modules\n"
+        "assert 'creopyson.aio' not in sys.modules\n"
+        "creopyson.Client().file_open\n"
+        "assert 'creopyson.file' in sys.modules\n"
+        "assert 'creopyson.parameter' not in sys.modules\n"
+        "assert creopyson.AsyncClient.__module__ == 'creopyson.aio'\n"
+        "assert creopyson.bom.get_paths is creopyson.Client.bom_get_paths\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_connection_lazy_command():
+    """Test a lazy command is replaced by its function on first access."""
+    class Lazy(object):
+        pass
+
+    creopyson.connection.bind_commands(Lazy, {"file_exists": ("file", "exists")})
+    assert isinstance(vars(Lazy)["file_exists"], creopyson.connection.LazyCommand)
+    bound = Lazy().file_exists
+    assert bound.__func__ is creopyson.file.exists
+    assert vars(Lazy)["file_exists"] is creopyson.file.exists
+    with pytest.raises(AttributeError):
+        creopyson.not_a_module
+
+
+def test_connection_top_level_commands():
+    """Test the command functions are available as package attributes."""
+    assert creopyson.creo_cd is creopyson.creo.cd
+    assert creopyson.bom_get_paths is creopyson.bom.get_paths
+    assert creopyson.dimension_set is creopyson.dimension.set_
+    assert "creo_cd" in dir(creopyson) and "file_open" in dir(creopyson)
+    from creopyson import parameter_list
+
+    assert parameter_list is creopyson.parameter.list_
@@ -0,0 +1,114 @@
+"""Design of experiments testing."""
+import pytest
+import creopyson
+from creopyson import doe
+from creopyson.fakeserver import FakeCreoson
+
+
+def test_doe_plans():
+    """Test full factorial and sampling plans."""
+    plan = doe.full_factorial({"d0": [1, 2, 3], doe.parameter("MAT"): ["A", "B"]})
+    assert len(plan) == 6
+    assert plan[1] == {doe.dimension("d0"): 1, doe.parameter("MAT"): "B"}
+    assert doe.dimension("d0", "Box.prt") == doe.dimension("d0", "box.prt")
+    assert doe.dimension("d0", "box.prt").column == "box.prt:d0"
+    with pytest.raises(ValueError):
+        doe.Input("feature", "x")
+
+    plan = doe.latin_hypercube({"d0": (0.0, 10.0), "d1": (5.0, 6.0)}, 10, seed=1)
+    assert len(plan) == 10
+    strata = sorted(int(variant[doe.dimension("d0")]) for variant in plan)
+    assert strata == list(range(10))
+    assert all(5.0 <= v[doe.dimension("d1")] < 6.0 for v in plan)
+    assert plan == doe.latin_hypercube({"d0": (0.0, 10.0), "d1": (5.0, 6.0)}, 10, seed=1)
+
+    plan = doe.random_sampling({"d0": (1.0, 2.0)}, 5, seed=2)
+    assert len(plan) == 5 and all(1.0 <= v[doe.dimension("d0")] <= 2.0 for v in plan)
+
+
+def _box(server):
+    server.add_model("box.prt", dimensions={"d0": 1.0, "d1": 2.0}, parameters={"MAT": "A"})
+
+
+def test_doe_run_client():
+    """Test variants run on one session, with custom readers."""
+    plan = doe.full_factorial({"d0": [2, 3], doe.parameter("MAT"): ["STEEL", "ALU"]})
+    plan.append({doe.dimension("nope"): 1})
+    with FakeCreoson() as server:
+        _box(server)
+        c = server.client()
+        c.connect()
+        runner = doe.DoeRunner(
+            "box.prt",
+            plan,
+            readers={
+                "massprops": doe.READERS["massprops"],
+                "mat": lambda client, file_: client.parameter_list(
+                    "MAT", file_=file_
+                )[0]["value"],
+            },
+        )
+        table = runner.run(c)
+        c.close()
+    assert table.names[:5] == ["variant", "d0", "MAT", "nope", "mass"]
+    assert list(table["variant"]) == [0, 1, 2, 3, 4]
+    assert table["mat"][:4] == ["STEEL", "ALU", "STEEL", "ALU"]
+    assert list(table["volume"][:4]) == [4.0, 4.0, 6.0, 6.0]
+    assert table["error"][:4] == [None] * 4
+    assert "Dimension nope not found" in table["error"][4]
+    assert table.types["volume"] == "float" and table.types["MAT"] is None
+
+
+def test_doe_checkpoint_resume(tmp_path):
+    """Test a stopped study resumes from its checkpoint."""
+    path = tmp_path / "doe.jsonl"
+    plan = doe.full_factorial({"d0": [1, 2, 3, 4, 5]})
+    calls = []
+
+    def reader(client, file_):
+        calls.append(file_)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return len(calls)
+
+    with FakeCreoson() as server:
+        _box(server)
+        c = server.client()
+        c.connect()
+        runner = doe.DoeRunner("box.prt", plan, readers={"n": reader}, checkpoint=path)
+        with pytest.raises(KeyboardInterrupt):
+            runner.run(c)
+        header, records = doe.read_checkpoint(path)
+        assert header["variants"] == 5 and sorted(records) == [0, 1]
+        # a line cut by the crash
+        with open(path, "ab") as stream:
+            stream.write(b'{"variant": 4, "outp')
+
+        runner = doe.DoeRunner("box.prt", plan, readers={"n": reader}, checkpoint=path)
+        assert list(runner.run(c)["n"]) == [1, 2, 4, 5, 6]
+        assert len(calls) == 6
+        assert runner.pending == []
+        assert sorted(doe.read_checkpoint(path)[1]) == [0, 1, 2, 3, 4]
+
+        other = doe.DoeRunner("box.prt", plan[:2], checkpoint=path)
+        with pytest.raises(ValueError):
+            other.run(c)
+        c.close()
+
+
+def test_doe_run_pool():
+    """Test variants spread over many sessions."""
+    servers = [FakeCreoson().start() for _ in range(3)]
+    try:
+        for server in servers:
+            _box(server)
+        plan = doe.full_factorial({"d0": [1, 2, 3], "d1": [1, 2]})
+        with creopyson.ClientPool([("localhost", s.port) for s in servers]) as pool:
+            table = doe.DoeRunner("box.prt", plan, readers=["massprops", "bound_box"]).run(pool)
+    finally:
+        for server in servers:
+            server.stop()
+    assert len(table) == 6
+    assert list(table["volume"]) == [1.0, 2.0, 2.0, 4.0, 3.0, 6.0]
+    assert "xmax" in table.names
+    assert sum(server.requests > 1 for server in servers) >= 2
@@ -0,0 +1,109 @@
+"""Dimension editor testing."""
+import asyncio
+
+import pytest
+import creopyson
+from creopyson.editor import DimensionEditor
+from creopyson.fakeserver import FakeCreoson
+
+
+def _server():
+    server = FakeCreoson()
+    server.add_model("box.prt", dimensions={"d0": 10.0, "d1": 20.0, "d2": 30.0})
+    server.add_model("plate.prt", dimensions={"d0": 1.0})
+    return server
+
+
+def test_editor_apply():
+    """Test edits validated, sent and regenerated once per model."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        regenerated = []
+        c.add_hook(pre=lambda command, function, data: function == "regenerate"
+                   and regenerated.append(data["file"]))
+        editor = c.dimension_editor()
+        assert isinstance(editor, DimensionEditor)
+        editor.set("d0", 11, file_="box.prt")
+        editor.update({"d1": 20.0, "d2": "abc", "nope": 1}, file_="box.prt")
+        editor.update([("plate.prt", "d0", 2.5), ("plate.prt", "d0", 3.5)])
+        editor.set("d0", 1, file_="missing.prt")
+        assert len(editor) == 7
+        before = server.requests
+        report = editor.apply()
+
+        assert [e.name for e in report.set] == ["d0", "d0"]
+        assert report.set[1].value == 3.5 and report.set[1].old == 1.0
+        assert [e.name for e in report.unchanged] == ["d1", "d0"]
+        assert {e.name: type(e.error) for e in report.invalid} == {
+            "d2": ValueError, "nope": KeyError, "d0": RuntimeError
+        }
+        assert sorted(regenerated) == ["box.prt", "plate.prt"]
+        assert report.regenerated == ["box.prt", "plate.prt"]
+        # 3 lists, 2 sets, 2 regenerations
+        assert report.requests == server.requests - before == 7
+        assert not report
+        models = server.session.models
+        assert models["box.prt"].dimensions["d0"] == 11
+        assert models["plate.prt"].dimensions["d0"] == 3.5
+
+        # dimensions are listed again at each apply, names are case insensitive
+        before = server.requests
+        editor.set("D0", 12, file_="box.prt")
+        report = editor.apply()
+        assert report and report.requests == server.requests - before == 3
+        assert report.set[0].old == 11
+        editor.set("d0", 12, file_="box.prt")
+        report = editor.apply()
+        assert report.requests == 1 and len(report.unchanged) == 1
+
+        # changed outside the editor: the edit is not skipped
+        c.dimension_set("d0", 5, file_="box.prt")
+        editor.set("d0", 12, file_="box.prt")
+        report = editor.apply()
+        assert len(report.set) == 1 and report.set[0].old == 5
+        assert models["box.prt"].dimensions["d0"] == 12
+        c.close()
+
+
+def test_editor_context_active_model():
+    """Test the context manager and the active model."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        c.file_open("plate.prt")
+        with c.dimension_editor(regenerate=False) as editor:
+            editor.set("d0", 4)
+        assert editor.report.set[0].file == "plate.prt"
+        assert editor.report.regenerated == []
+        with pytest.raises(ZeroDivisionError):
+            with c.dimension_editor() as other:
+                other.set("d0", 5)
+                1 / 0
+        assert other.report is None
+        with c.batch():
+            editor.set("d0", 6)
+            with pytest.raises(RuntimeError):
+                editor.apply()
+        c.close()
+    assert server.session.models["plate.prt"].dimensions["d0"] == 4
+
+
+def test_editor_async():
+    """Test apply_async with an AsyncClient."""
+    with _server() as server:
+
+        async def main():
+            async with creopyson.AsyncClient(port=server.port) as c:
+                await c.connect()
+                editor = c.dimension_editor()
+                editor.update({"d0": 1.5, "d1": "x"}, file_="box.prt")
+                with pytest.raises(TypeError, match="apply_async"):
+                    editor.apply()
+                return await editor.apply_async()
+
+        report = asyncio.run(main())
+        assert server.session.models["box.prt"].dimensions["d0"] == 1.5
+    assert [e.name for e in report.set] == ["d0"]
+    assert [e.name for e in report.invalid] == ["d1"]
+    assert report.regenerated == ["box.prt"]
@@ -0,0 +1,126 @@
+"""Base64 encoding testing."""
+import asyncio
+
+import creopyson
+from creopyson.encoding import Base64Encoding, decode, decode_item, encode
+from creopyson.fakeserver import FakeCreoson
+
+TEXT = "Ø12 ±0.1"
+
+
+def test_encode_decode():
+    """Test texts encoded and decoded as UTF-8."""
+    assert encode(TEXT) == "w5gxMiDCsTAuMQ=="
+    assert decode(encode(TEXT)) == TEXT
+
+
+def test_decode_item():
+    """Test values decoded in place, converted by kind."""
+    item = {"value": encode("12.5"), "encoded": True}
+    assert decode_item(item, "number") is item
+    assert item == {"value": 12.5, "encoded": False}
+    assert decode_item({"value": encode("7"), "encoded": True, "type": "INTEGER"},
+                       "typed")["value"] == 7
+    assert decode_item({"value": encode("true"), "encoded": True, "type": "BOOL"},
+                       "typed")["value"] is True
+    assert decode_item({"value": encode("12"), "encoded": True, "type": "STRING"},
+                       "typed")["value"] == "12"
+    assert decode_item({"value": encode(TEXT), "encoded": True}, "number")["value"] == TEXT
+    assert decode_item({"value": "abc", "encoded": False})["value"] == "abc"
+
+
+def test_encoding_result():
+    """Test result items decoded in place, the result a plain list."""
+    items = [{"value": encode(str(i)), "encoded": True} for i in range(3)]
+    result = Base64Encoding().result("dimension", "list", items)
+    assert type(result) is list and result is items
+    assert items == [{"value": float(i), "encoded": False} for i in range(3)]
+    assert Base64Encoding().result("dimension", "list", None) is None
+
+
+def test_encoding_request():
+    """Test listing commands sent encoded, values to set encoded if needed."""
+    encoding = Base64Encoding()
+    assert encoding.request("parameter", "list", {"file": "a"}) == (
+        {"file": "a", "encoded": True}, True
+    )
+    assert encoding.request("parameter", "list", {"encoded": True}) == (
+        {"encoded": True}, False
+    )
+    assert encoding.request("parameter", "list", {"encoded": False})[1] is True
+    assert encoding.request("note", "list", {}) == ({}, True)
+    assert encoding.request("parameter", "set", {"value": TEXT}) == (
+        {"value": encode(TEXT), "encoded": True}, False
+    )
+    assert encoding.request("parameter", "set", {"value": "abc"}) == ({"value": "abc"}, False)
+    assert encoding.request("dimension", "set", {"value": 2.0}) == ({"value": 2.0}, False)
+
+
+def _server():
+    server = FakeCreoson()
+    server.add_model(
+        "box.prt",
+        parameters={"NOTE": TEXT, "COUNT": 3, "NAME": "box"},
+        dimensions={"d0": 10.0},
+    )
+    return server
+
+
+def test_client_encoding():
+    """Test a client with encoding: values read and set decoded."""
+    with _server() as server:
+        with server.client() as raw:
+            raw.connect()
+            params = {p["name"]: p for p in raw.parameter_list(file_="box.prt")}
+            assert params["NOTE"] == dict(params["NOTE"], value=encode(TEXT), encoded=True)
+            assert params["NAME"]["value"] == "box"
+
+        with server.client(encoding=True) as c:
+            c.connect()
+            params = c.parameter_list(file_="box.prt")
+            assert type(params) is list
+            values = {p["name"]: p["value"] for p in params}
+            assert values == {"NOTE": TEXT, "COUNT": 3, "NAME": "box"}
+            assert c.dimension_list(file_="box.prt")[0]["value"] == 10.0
+
+            c.parameter_set("NAME", "boîte", file_="box.prt")
+            model = server.session.models["box.prt"]
+            assert model.parameters["NAME"]["value"] == "boîte"
+            c.dimension_set("d0", 12, file_="box.prt")
+            assert model.dimensions["d0"] == 12.0
+
+            # explicit encoded values are left as is
+            encoded = c.parameter_list(name="NAME", file_="box.prt", encoded=True)
+            assert type(encoded) is list and encoded[0]["value"] == encode("boîte")
+
+            with c.batch():
+                future = c.parameter_list(name="NOTE", file_="box.prt")
+            assert future.result()[0]["value"] == TEXT
+            table = c.parameter_list_table(["box.prt"])
+            assert TEXT in table["value_str"]
+
+
+def test_client_encoding_cache():
+    """Test cached results decoded each time."""
+    with _server() as server:
+        with server.client(encoding=Base64Encoding(), cache=True) as c:
+            c.connect()
+            params = c.parameter_list(name="NOTE", file_="box.prt")
+            assert params[0]["value"] == TEXT
+            assert c.parameter_list(name="NOTE", file_="box.prt")[0]["value"] == TEXT
+            assert c.cache.stats()["hits"] == 1
+
+
+def test_async_client_encoding():
+    """Test an AsyncClient with encoding."""
+
+    async def run(port):
+        async with creopyson.AsyncClient(port=port, encoding=True) as c:
+            await c.connect()
+            await c.parameter_set("NAME", TEXT, file_="box.prt")
+            return await c.parameter_list(name="NAME", file_="box.prt")
+
+    with _server() as server:
+        params = asyncio.run(run(server.port))
+        assert params[0]["value"] == TEXT
+        assert server.session.models["box.prt"].parameters["NAME"]["value"] == TEXT
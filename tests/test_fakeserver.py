@@ -0,0 +1,114 @@
+"""Fake CREOSON server testing."""
+import pytest
+from creopyson.fakeserver import FakeCreoson, main, translation
+
+
+@pytest.fixture
+def server():
+    """Run a fake CREOSON server with a few models."""
+    with FakeCreoson() as server:
+        server.add_model(
+            "box.prt",
+            parameters={"COLOR": "red", "MASS": 1.5},
+            dimensions={"d0": 10, "d1": 20},
+            instances=[{"name": "BOX_1", "d0": 5.0}],
+            features=["PROTRUSION_1", {"name": "CUT_1", "type": "CUT"}],
+        )
+        server.add_model("top.asm", children=[("box.prt", translation(x=5)), "box.prt"])
+        yield server
+
+
+def test_fakeserver_session(server):
+    """Test connection and session checks."""
+    c = server.client()
+    with pytest.raises(RuntimeError) as pytest_wrapped_e:
+        c.creo_pwd()
+    assert pytest_wrapped_e.value.args[0] == "Invalid session ID"
+    c.connect()
+    assert c.is_creo_running()
+    assert c.creo_pwd() == "C:/fake/"
+    assert c.server_pwd() == "C:/CreosonServer"
+    with pytest.raises(RuntimeError):
+        c.drawing_list_models()
+    c.disconnect()
+
+
+def test_fakeserver_file_parameter_dimension(server):
+    """Test model commands."""
+    c = server.client()
+    c.connect()
+    assert c.file_exists("BOX.PRT")
+    assert c.file_get_active() is None
+    c.file_open("box.prt")
+    assert c.file_get_active()["file"] == "box.prt"
+    assert [p["name"] for p in c.parameter_list()] == ["COLOR", "MASS"]
+    c.parameter_set("COLOR", "blue", type_="STRING")
+    c.parameter_set("NEW", 3, type_="INTEGER")
+    assert c.parameter_list(name="COLOR")[0]["value"] == "blue"
+    assert c.parameter_exists(name=["COLOR", "NEW"])
+    c.parameter_delete("NEW")
+    assert not c.parameter_exists(name="NEW")
+    c.dimension_set("d0", 11)
+    assert c.dimension_list(name="d0")[0]["value"] == 11.0
+    assert c.dimension_list_detail()[1]["tol_plus"] == 0.1
+    with pytest.raises(RuntimeError):
+        c.dimension_set("nope", 1)
+    c.file_regenerate()
+    assert c.file_massprops()["volume"] == 220.0
+    assert c.familytable_list() == ["BOX_1"]
+    assert [f["name"] for f in c.feature_list(type_="CUT")] == ["CUT_1"]
+    c.feature_suppress(name="CUT_1")
+    assert c.feature_list(status="SUPPRESSED")[0]["name"] == "CUT_1"
+    c.file_close_window()
+    assert c.file_get_active() is None
+
+
+def test_fakeserver_bom(server):
+    """Test bom.get_paths simulation."""
+    c = server.client()
+    c.connect()
+    bom = c.bom_get_paths(file_="top.asm", paths=True, get_transforms=True)
+    root = bom["children"]
+    assert root["seq_path"] == "root"
+    assert [child["seq_path"] for child in root["children"]] == ["root.1", "root.2"]
+    assert root["children"][1]["path"] == [2]
+    assert root["children"][0]["transform"]["origin"]["x"] == 5.0
+
+
+def test_fakeserver_bom_transforms():
+    """Test bom.get_paths transforms are relative to the top-level assembly."""
+    with FakeCreoson() as server:
+        server.add_assembly("top", breadth=2, depth=2)
+        c = server.client()
+        c.connect()
+        top = c.bom_get_paths(file_="top.asm", get_transforms=True)["children"]
+        sub = c.bom_get_paths(file_="top_2.asm", get_transforms=True)["children"]
+        c.close()
+    # top_2.asm at x=20 in top.asm, top_2_2.prt at x=20 in top_2.asm
+    assert top["children"][1]["children"][1]["transform"]["origin"]["x"] == 40.0
+    assert sub["children"][1]["transform"]["origin"]["x"] == 20.0
+
+
+def test_fakeserver_assembly_latency():
+    """Test generated assemblies and latency."""
+    with FakeCreoson(latency=0.001, processing=0.001) as server:
+        names = server.add_assembly("top", 3, 2)
+        assert len(names) == 1 + 3 + 9
+        assert names[0] == "top.asm"
+        c = server.client()
+        c.connect()
+        bom = c.bom_get_paths(file_="top.asm", top_level=True)
+        assert len(bom["children"]["children"]) == 3
+        assert "children" not in bom["children"]["children"][0]
+        assert server.requests == 2
+
+
+def test_fakeserver_main(monkeypatch):
+    """Test command line entry point."""
+    def serve_forever(self):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(
+        "http.server.ThreadingHTTPServer.serve_forever", serve_forever
+    )
+    main(["--port", "0", "--assembly", "2", "2"])
@@ -0,0 +1,134 @@
+"""Feature index testing."""
+import asyncio
+
+import pytest
+import creopyson
+from creopyson.fakeserver import FakeCreoson
+from creopyson.featuretree import FeatureIndex
+
+FEATURES = [
+    {"name": "DTM1", "type": "DATUM_PLANE"},
+    {"name": "EXTRUDE_1", "type": "PROTRUSION"},
+    {"name": "CUT_1", "type": "CUT", "group_name": "POCKET"},
+    {"name": "HOLE_1", "type": "HOLE", "group_name": "POCKET", "pattern_name": "P1"},
+    {"name": "HOLE_2", "type": "HOLE", "pattern_name": "P1"},
+    {"name": "CUT_2", "type": "CUT", "status": "SUPPRESSED"},
+]
+
+
+def _server():
+    server = FakeCreoson()
+    server.add_model("box.prt", features=FEATURES)
+    return server
+
+
+def test_feature_index_queries():
+    """Test features listed once, queries answered from the index."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        before = server.requests
+        index = c.feature_index("box.prt", groups=["POCKET"])
+        assert isinstance(index, FeatureIndex)
+        assert server.requests - before == index.requests == 2
+        assert len(index) == 6
+        assert index.names(status="SUPPRESSED") == ["CUT_2"]
+        assert index.names(type_="HOLE") == ["HOLE_1", "HOLE_2"]
+        assert index.names(type_=["CUT", "hole"], status="ACTIVE") == [
+            "CUT_1", "HOLE_1", "HOLE_2"
+        ]
+        assert index.names(name="cut_*") == ["CUT_1", "CUT_2"]
+        assert index.names(name="CUT_1") == ["CUT_1"]
+        assert index.names(group="POCKET", type_="CUT") == ["CUT_1"]
+        assert index.count(status="*SUPPRESSED") == 1
+        assert index["hole_1"]["feat_id"] == 4
+        assert 4 in index and "NOPE" not in index
+        with pytest.raises(KeyError):
+            index["NOPE"]
+        assert server.requests - before == 2
+
+        # patterns are listed on first query
+        assert index.names(pattern="P1") == ["HOLE_1", "HOLE_2"]
+        assert index.names(pattern="P1", group="POCKET") == ["HOLE_1"]
+        assert server.requests - before == 3
+        c.close()
+
+
+def test_feature_index_changes():
+    """Test the index updated after changes sent through it."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        index = c.feature_index("box.prt")
+        feats = {f["name"]: f for f in server.session.models["box.prt"].features}
+
+        before = server.requests
+        index.suppress("HOLE_*", clip=False, with_children=False)
+        assert feats["HOLE_1"]["status"] == feats["HOLE_2"]["status"] == "SUPPRESSED"
+        assert index.names(status="SUPPRESSED") == ["HOLE_1", "HOLE_2", "CUT_2"]
+        assert server.requests - before == 1
+
+        # clip and children may suppress other features: statuses listed again
+        feats["DTM1"]["status"] = "SUPPRESSED"
+        index.suppress("EXTRUDE_1")
+        assert server.requests - before == 2
+        assert index.names(status="SUPPRESSED") == [
+            "DTM1", "EXTRUDE_1", "HOLE_1", "HOLE_2", "CUT_2"
+        ]
+        assert server.requests - before == 3
+
+        index.resume(name="HOLE_1")
+        assert index["HOLE_1"]["status"] == "ACTIVE" == feats["HOLE_1"]["status"]
+        index.resume(status="SUPPRESSED", with_children=True)
+        assert index.names(status="SUPPRESSED") == []
+        assert server.requests - before == 6
+
+        index.rename("CUT_1", "POCKET_CUT")
+        assert "POCKET_CUT" in index and "CUT_1" not in index
+        assert index.names(type_="CUT") == ["POCKET_CUT", "CUT_2"]
+        assert feats["CUT_1"]["name"] == "POCKET_CUT"
+        with pytest.raises(KeyError):
+            index.rename("NOPE", "OTHER")
+
+        index.delete(name="CUT_2")
+        assert index.names(type_="CUT") == ["POCKET_CUT"]
+        assert len(server.session.models["box.prt"].features) == 5
+        assert server.requests - before == 8
+
+        index.delete(name="HOLE_2", clip=True)
+        assert len(index) == 4
+        assert server.requests - before == 10
+        c.close()
+
+
+def test_feature_list_pattern_features():
+    """Test list_pattern_features sends list_pattern_features."""
+    with _server() as server:
+        c = server.client()
+        c.connect()
+        feats = c.feature_list_pattern_features("P1", file_="box.prt")
+        assert [f["name"] for f in feats] == ["HOLE_1", "HOLE_2"]
+        c.close()
+
+
+def test_async_feature_index():
+    """Test the index built and changed with an AsyncClient."""
+
+    async def run(port):
+        async with creopyson.AsyncClient(port=port) as c:
+            await c.connect()
+            await c.file_open("box.prt")
+            index = await c.feature_index(groups=["POCKET"])
+            assert index.file == "box.prt"
+            assert index.names(group="POCKET") == ["CUT_1", "HOLE_1"]
+            await index.suppress_async("CUT_1")
+            assert index.names(status="SUPPRESSED") == ["CUT_1", "CUT_2"]
+            await index.rename_async("HOLE_1", "H1")
+            await index.delete_async(name="HOLE_2")
+            with pytest.raises(RuntimeError):
+                index.names(pattern="P1")
+            await index.update_async()
+            return index.names(pattern="P1")
+
+    with _server() as server:
+        assert asyncio.run(run(server.port)) == ["H1"]
@@ -104,6 +104,43 @@ def test_file_get_active(mk_creoson_post_dict):
     assert isinstance(result, (dict))
 
 
+def _count_get_active(monkeypatch):
+    calls = []
+
+    def fake_func(client, command, function, data=None, key_data=None):
+        calls.append((command, function))
+        return {"dirname": "dirname", "file": "file.prt"}
+
+    monkeypatch.setattr(creopyson.connection.Client, "_creoson_post", fake_func)
+    return calls
+
+
+def test_file_get_active_cached(monkeypatch):
+    """Test get_active result is cached."""
+    calls = _count_get_active(monkeypatch)
+    c = creopyson.Client()
+    assert c.file_get_active() == {"dirname": "dirname", "file": "file.prt"}
+    c.parameter_list()
+    c.file_regenerate()
+    assert calls == [
+        ("file", "get_active"),
+        ("parameter", "list"),
+        ("file", "regenerate"),
+    ]
+    c.invalidate_active_file()
+    c.file_get_active()
+    assert calls[-1] == ("file", "get_active")
+
+
+def test_file_get_active_not_cached(monkeypatch):
+    """Test get_active is always requested when cache is disabled."""
+    calls = _count_get_active(monkeypatch)
+    c = creopyson.Client(cache_active_file=False)
+    c.file_get_active()
+    c.file_get_active()
+    assert calls == [("file", "get_active"), ("file", "get_active")]
+
+
 def test_file_get_cur_material(mk_creoson_post_dict, mk_getactivefile):
     """Test get_cur_material."""
     c = creopyson.Client()
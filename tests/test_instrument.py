@@ -0,0 +1,133 @@
+"""Instrument testing."""
+import io
+import time
+
+import pytest
+import requests
+import creopyson
+from creopyson.fakeserver import FakeCreoson
+from creopyson.instrument import CallRecord, CsvTrace, Histogram
+
+
+@pytest.fixture
+def client():
+    """Connected client of a fake server with a model."""
+    with FakeCreoson() as server:
+        server.add_model("box.prt", parameters={"COLOR": "red"})
+        c = server.client()
+        c.connect()
+        yield c
+        c.close()
+
+
+def test_instrument_hooks(client):
+    """Test pre and post hooks are called around each request."""
+    calls = []
+    records = []
+    client.add_hook(post=records.append, pre=lambda *args: calls.append(args))
+    client.parameter_list(file_="box.prt")
+    with pytest.raises(RuntimeError):
+        client.dimension_set("nope", 1, file_="box.prt")
+    assert calls[0] == ("parameter", "list", {"file": "box.prt"})
+    ok, error = records
+    assert (ok.command, ok.function) == ("parameter", "list")
+    assert ok.request_bytes > 0 and ok.response_bytes > 0
+    assert ok.status_code == 200
+    assert ok.network_time > 0 and ok.decode_time > 0
+    assert ok.error is None
+    assert error.error.startswith("RuntimeError")
+    assert "error" in repr(error)
+
+    client.remove_hook(records.append)
+    client.parameter_list(file_="box.prt")
+    assert len(records) == 2
+    assert len(calls) == 3
+
+
+def test_instrument_histogram(client):
+    """Test the histogram and its Prometheus export."""
+    histogram = Histogram()
+    client.add_hook(post=histogram)
+    for _ in range(3):
+        client.parameter_list(file_="box.prt")
+    with pytest.raises(RuntimeError):
+        client.file_open("missing.prt")
+    rows = histogram.summary()
+    assert {(row["command"], row["function"]): row["count"] for row in rows} == {
+        ("parameter", "list"): 3,
+        ("file", "open"): 1,
+    }
+    assert sum(row["errors"] for row in rows) == 1
+    text = histogram.to_prometheus()
+    assert (
+        'creopyson_request_seconds_bucket{command="parameter",'
+        'function="list",le="+Inf"} 3'
+    ) in text
+    assert 'creopyson_request_errors_total{command="file",function="open"} 1' in text
+    histogram.clear()
+    assert histogram.summary() == []
+
+
+def test_instrument_histogram_buckets():
+    """Test records are counted in the first bucket above their time."""
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for network_time in (0.005, 0.05, 0.5):
+        record = CallRecord("file", "list")
+        record.network_time = network_time
+        histogram(record)
+    assert histogram.stats[("file", "list")].buckets == [1, 1, 1]
+    assert 'le="0.1"} 2' in histogram.to_prometheus()
+
+
+def test_instrument_csv(client, tmp_path):
+    """Test the CSV trace writes one row per request."""
+    path = tmp_path / "trace.csv"
+    with CsvTrace(str(path)) as trace:
+        client.add_hook(post=trace)
+        client.parameter_list(file_="box.prt")
+        client.parameter_exists("COLOR", file_="box.prt")
+    lines = path.read_text().splitlines()
+    assert lines[0] == ",".join(CsvTrace.FIELDS)
+    assert len(lines) == 3
+    assert ",parameter,exists," in lines[2]
+
+    stream = io.StringIO()
+    CsvTrace(stream).close()
+    assert stream.getvalue().startswith("start,command")
+
+
+def test_instrument_status_code_transport():
+    """Test no HTTP status code is recorded for a transport."""
+
+    class Transport(object):
+        def post(self, client, body, timeout=None, url=None):
+            return b'{"status": {"error": false}, "data": {"exists": true}}'
+
+    c = creopyson.Client(transport=Transport())
+    records = []
+    c.add_hook(post=records.append)
+    assert c.file_exists("box.prt") is True
+    assert records[0].status_code is None
+
+
+def test_instrument_failed_request(monkeypatch):
+    """Test a failed request is recorded with its time and status code."""
+
+    class Response(object):
+        status_code = 500
+        content = b""
+
+    def post(*args, **kwargs):
+        time.sleep(0.01)
+        return Response()
+
+    monkeypatch.setattr(requests.Session, "post", post)
+    c = creopyson.Client()
+    records = []
+    c.add_hook(post=records.append)
+    with pytest.raises(ConnectionError):
+        c.file_exists("box.prt")
+    record, = records
+    assert record.status_code == 500
+    assert record.network_time >= 0.01
+    assert record.error.startswith("StatusError")
@@ -1,5 +1,9 @@
 """Parameters testing."""
+import time
+
+import pytest
 import creopyson
+from creopyson.fakeserver import FakeCreoson
 from .fixtures import mk_creoson_post_dict, mk_creoson_post_None, mk_getactivefile
 
 
@@ -66,3 +70,45 @@ def test_parameter_set_designated(mk_creoson_post_None, mk_getactivefile):
     assert result is None
     result = c.parameter_set_designated("name", True)
     assert result is None
+
+
+def test_parameter_list_many():
+    """Test list_many and iter_many with the fake server."""
+    with FakeCreoson(latency=0.01) as server:
+        files = ["part_{}.prt".format(i) for i in range(20)]
+        for i, name in enumerate(files):
+            server.add_model(name, parameters={"INDEX": i, "COLOR": "red"})
+        c = server.client()
+        c.connect()
+        server.max_in_flight = 0
+        table = c.parameter_list_many(files, workers=10)
+        assert 1 < server.max_in_flight <= 10
+        assert len(table) == 40
+        assert table[("part_3.prt", "INDEX")]["value"] == 3
+        assert c.parameter_list_many(files[:2], name="COLOR") == {
+            ("part_0.prt", "COLOR"): c.parameter_list("COLOR", file_="part_0.prt")[0],
+            ("part_1.prt", "COLOR"): c.parameter_list("COLOR", file_="part_1.prt")[0],
+        }
+
+        items = c.parameter_iter_many(iter(files), workers=2)
+        assert [name for name, _ in items] == files
+
+        results = dict(c.parameter_iter_many(
+            ["part_0.prt", "missing.prt"], return_exceptions=True
+        ))
+        assert isinstance(results["missing.prt"], RuntimeError)
+        with pytest.raises(RuntimeError):
+            c.parameter_list_many(["missing.prt"] + files)
+
+        first = next(c.parameter_iter_many(files))
+        assert first[0] == "part_0.prt"
+
+        # closed early: the queued requests are cancelled
+        time.sleep(0.05)
+        items = c.parameter_iter_many(files, workers=2)
+        before = server.requests
+        next(items)
+        items.close()
+        time.sleep(0.05)
+        assert server.requests - before < 5
+        c.close()
@@ -0,0 +1,159 @@
+"""Pool testing."""
+import threading
+
+import pytest
+import creopyson
+from creopyson.exceptions import CircuitOpen
+from creopyson.fakeserver import FakeCreoson
+from creopyson.pool import model_job
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    """Mock _creoson_post, `dead` servers raise ConnectionError."""
+    state = {"dead": set(), "calls": [], "lock": threading.Lock()}
+
+    def fake_func(client, command, function, data=None, key_data=None):
+        if client.server in state["dead"]:
+            raise ConnectionError("dead")
+        with state["lock"]:
+            state["calls"].append((client.server, command, function, data))
+        if function == "connect":
+            return "123456"
+        if function == "is_creo_running":
+            return True
+        return None
+
+    monkeypatch.setattr(creopyson.connection.Client, "_creoson_post", fake_func)
+    return state
+
+
+HOSTS = [("host1", 9056), ("host2", 9056), ("host3", 9056)]
+
+
+def test_pool_connect(sessions):
+    """Test every session is connected."""
+    pool = creopyson.ClientPool(HOSTS, job_retries=0, retries=3)
+    assert len(pool) == 3
+    assert all(c.sessionId == "123456" for c in pool.clients)
+    assert pool.job_retries == 0
+    assert all(c.retries == 3 for c in pool.clients)
+
+
+def test_pool_connect_skip_dead(sessions):
+    """Test unreachable sessions are skipped, and none raises."""
+    sessions["dead"].add("http://host2:9056/creoson")
+    pool = creopyson.ClientPool(HOSTS)
+    assert len(pool) == 2
+    # connected again once reachable
+    sessions["dead"].clear()
+    assert pool.check() == 0
+    assert len(pool) == 3
+    sessions["dead"].update(c.server for c in pool.clients)
+    with pytest.raises(ConnectionError):
+        creopyson.ClientPool(HOSTS)
+
+
+def test_pool_map_model_job(sessions):
+    """Test model jobs are run on every session and results ordered."""
+    files = ["part_{}.prt".format(i) for i in range(12)]
+    job = model_job(
+        mutate=lambda c, f: c.parameter_set("COLOR", "red", file_=f),
+        export=lambda c, f: f.upper(),
+    )
+    with creopyson.ClientPool(HOSTS) as pool:
+        results = pool.map(job, files)
+    assert results == [f.upper() for f in files]
+    functions = [call[2] for call in sessions["calls"] if call[1] != "connection"]
+    assert functions.count("open") == 12
+    assert functions.count("set") == 12
+    assert functions.count("save") == 12
+    assert functions[-1] == "save"
+
+
+def test_pool_run_errors(sessions):
+    """Test job errors are raised or returned, and session released."""
+    def fails(client):
+        raise RuntimeError("error message")
+
+    pool = creopyson.ClientPool(HOSTS)
+    with pytest.raises(RuntimeError):
+        pool.run([fails])
+    results = pool.run([fails, lambda c: 1], return_exceptions=True)
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] == 1
+    assert len(pool._idle) == 3
+
+
+def test_pool_swap_dead_session(sessions):
+    """Test a dead session is replaced and its job run on another one."""
+    pool = creopyson.ClientPool(HOSTS[:1] + [("host2", 9056)], job_retries=2)
+    dead = pool.clients[0].server
+    seen = []
+
+    def job(client):
+        seen.append(client.server)
+        if client.server == dead:
+            sessions["dead"].add(dead)
+            raise ConnectionError("dead")
+        return client.server
+
+    results = pool.run([job])
+    assert results == ["http://host2:9056/creoson"]
+    assert len(pool) == 1
+    assert pool.clients[0].server == "http://host2:9056/creoson"
+
+
+def test_pool_check(sessions):
+    """Test check replaces dead idle sessions."""
+    pool = creopyson.ClientPool(HOSTS)
+    sessions["dead"].add("http://host3:9056/creoson")
+    assert pool.check() == 1
+    assert len(pool) == 2
+    sessions["dead"].clear()
+    assert pool.check() == 0
+    assert len(pool) == 3
+
+
+def test_pool_job_not_run_twice():
+    """Test a job is not run again once one of its requests was sent."""
+    with FakeCreoson() as first, FakeCreoson() as second:
+        for server in (first, second):
+            server.add_model("box.prt")
+        hosts = [("127.0.0.1", first.port), ("127.0.0.1", second.port)]
+        runs = []
+
+        def job(client):
+            runs.append(client.server)
+            client.file_save(file_="box.prt")
+            raise ConnectionError("lost after save")
+
+        with creopyson.ClientPool(hosts, job_retries=2) as pool:
+            with pytest.raises(ConnectionError):
+                pool.run([job])
+            assert len(runs) == 1
+            assert len(pool) == 2
+
+
+def test_pool_open_circuit_not_swapped():
+    """Test a session with an open circuit is kept, its refused job rerun."""
+    with FakeCreoson() as first, FakeCreoson() as second:
+        hosts = [("127.0.0.1", first.port), ("127.0.0.1", second.port)]
+        with creopyson.ClientPool(hosts, circuit_breaker=1, job_retries=1) as pool:
+            sick, healthy = pool.clients
+            sick.circuit_breaker.failure()
+            before = first.requests
+
+            def job(client):
+                return client.server if client.creo_pwd() else None
+
+            leased = pool.acquire()
+            assert leased is healthy
+            with pytest.raises(CircuitOpen):
+                pool.run([job])
+            assert first.requests == before
+            assert pool.clients == [sick, healthy]
+            assert pool.check() == 0 and len(pool) == 2
+
+            pool.release(leased)
+            assert pool.run([job]) == [healthy.server]
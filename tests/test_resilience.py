@@ -0,0 +1,161 @@
+"""Resilience testing."""
+import json
+import time
+
+import pytest
+import requests
+import creopyson
+from creopyson.exceptions import CircuitOpen, RequestTimeout
+from creopyson.fakeserver import FakeCreoson
+from creopyson.resilience import CircuitBreaker, is_read_only
+
+
+class Flaky(object):
+    """Session.post failing `failures` times, then answering."""
+
+    def __init__(self, failures, error=requests.exceptions.ConnectionError):
+        self.failures = failures
+        self.error = error
+        self.calls = []
+
+    def __call__(self, url, data=None, **kwargs):
+        self.calls.append(kwargs.get("timeout"))
+        if len(self.calls) <= self.failures:
+            raise self.error("down")
+        response = requests.models.Response()
+        response.status_code = 200
+        response._content = json.dumps(
+            {"status": {"error": False}, "data": {"exists": True}}
+        ).encode()
+        return response
+
+
+def test_resilience_is_read_only():
+    """Test read-only commands detection."""
+    assert is_read_only("parameter", "list")
+    assert is_read_only("dimension", "list_detail")
+    assert is_read_only("file", "exists")
+    assert is_read_only("file", "get_active")
+    assert is_read_only("connection", "is_creo_running")
+    assert is_read_only("geometry", "bound_box")
+    assert not is_read_only("parameter", "set")
+    assert not is_read_only("file", "open")
+    assert not is_read_only("connection", "connect")
+
+
+def test_resilience_retry_read_only(monkeypatch):
+    """Test read-only commands are sent again."""
+    flaky = Flaky(2)
+    monkeypatch.setattr(requests.Session, "post", flaky)
+    c = creopyson.Client(retries=2, backoff=0, timeout=3)
+    assert c._creoson_post("file", "exists", {}, "exists") is True
+    assert flaky.calls == [3, 3, 3]
+
+
+def test_resilience_retry_limit(monkeypatch):
+    """Test errors are raised after the last retry."""
+    monkeypatch.setattr(requests.Session, "post", Flaky(3))
+    c = creopyson.Client(retries=2, backoff=0)
+    with pytest.raises(ConnectionError):
+        c._creoson_post("file", "exists", {}, "exists")
+
+
+def test_resilience_no_retry_mutating(monkeypatch):
+    """Test commands changing models are not sent again."""
+    flaky = Flaky(1)
+    monkeypatch.setattr(requests.Session, "post", flaky)
+    c = creopyson.Client(retries=2, backoff=0)
+    with pytest.raises(ConnectionError):
+        c._creoson_post("parameter", "set", {})
+    assert len(flaky.calls) == 1
+
+
+def test_resilience_timeouts(monkeypatch):
+    """Test timeouts per command."""
+    flaky = Flaky(1, requests.exceptions.ReadTimeout)
+    monkeypatch.setattr(requests.Session, "post", flaky)
+    c = creopyson.Client(
+        timeout=5, timeouts={("file", "open"): 300, "interface": 600}
+    )
+    with pytest.raises(RequestTimeout):
+        c._creoson_post("file", "open", {})
+    c._creoson_post("file", "open", {})
+    c._creoson_post("interface", "export_file", {})
+    c._creoson_post("file", "exists", {})
+    assert flaky.calls == [300, 300, 600, 5]
+
+
+def test_resilience_timeout_fakeserver():
+    """Test a slow CREOSON raises RequestTimeout."""
+    with FakeCreoson(latency=0.2) as server:
+        c = server.client(timeout=0.05)
+        with pytest.raises(RequestTimeout):
+            c.connect()
+        c.close()
+
+
+def test_resilience_circuit_breaker():
+    """Test circuit breaker states."""
+    breaker = CircuitBreaker(threshold=2, reset_timeout=0.05)
+    breaker.before()
+    breaker.failure()
+    assert breaker.state == "closed"
+    breaker.failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+    breaker.before()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpen):
+        breaker.before()
+    breaker.failure()
+    assert breaker.state == "open"
+    time.sleep(0.06)
+    breaker.before()
+    breaker.release()
+    assert not breaker.is_open
+    breaker.before()
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_resilience_client_circuit(monkeypatch):
+    """Test the client fails fast when the circuit is open."""
+    flaky = Flaky(10)
+    monkeypatch.setattr(requests.Session, "post", flaky)
+    c = creopyson.Client(circuit_breaker=2)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            c._creoson_post("file", "exists", {})
+    with pytest.raises(CircuitOpen):
+        c._creoson_post("file", "exists", {})
+    assert len(flaky.calls) == 2
+    assert isinstance(c.circuit_breaker, CircuitBreaker)
+
+
+def test_resilience_client_interrupted_trial(monkeypatch):
+    """Test an interrupted half-open request lets the next one through."""
+    flaky = Flaky(1, error=KeyboardInterrupt)
+    monkeypatch.setattr(requests.Session, "post", flaky)
+    breaker = CircuitBreaker(threshold=1, reset_timeout=0)
+    breaker.failure()
+    c = creopyson.Client(circuit_breaker=breaker)
+    with pytest.raises(KeyboardInterrupt):
+        c._creoson_post("file", "exists", {})
+    assert c._creoson_post("file", "exists", {}) == {"exists": True}
+    assert breaker.state == "closed"
+
+
+def test_resilience_pool_skips_open_circuit():
+    """Test the pool gives sessions with an open circuit last."""
+    with FakeCreoson() as first, FakeCreoson() as second:
+        hosts = [("127.0.0.1", first.port), ("127.0.0.1", second.port)]
+        with creopyson.ClientPool(hosts, circuit_breaker=3) as pool:
+            sick, healthy = pool.clients
+            for _ in range(3):
+                sick.circuit_breaker.failure()
+            assert pool.acquire() is healthy
+            assert pool.acquire() is sick
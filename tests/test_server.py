@@ -4,15 +4,22 @@ import requests
 import json
 import pytest
 import creopyson
+from creopyson.exceptions import CircuitOpen
+from creopyson.fakeserver import FakeCreoson
 
 
 def test_server_pwd_ok(monkeypatch):
     """Test server_pwd ok."""
+    urls = []
+
     class Mk_post():
-        def __init__(self, *args, **kwargs):
-            pass
+        status_code = 200
 
-        def json(self):
+        def __init__(self, url, *args, **kwargs):
+            urls.append(url)
+
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": False,
@@ -21,31 +28,52 @@ def test_server_pwd_ok(monkeypatch):
                     "dirname": "C:/CreosonServer-2.3.0-win64"
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     result = c.server_pwd()
     assert result == "C:/CreosonServer-2.3.0-win64"
+    assert urls == ["http://localhost:9056/server"]
 
 
 def test_server_pwd_error(monkeypatch):
     """Test creoson return error."""
     class Mk_post():
+        status_code = 200
+
         def __init__(self, *args, **kwargs):
             pass
 
-        def json(self):
+        @property
+        def content(self):
             results = {
                 "status": {
                     "error": True,
                     "message": "error message"
                 }
             }
-            return results
+            return json.dumps(results).encode()
 
-    monkeypatch.setattr(requests, 'post', Mk_post)
+    monkeypatch.setattr(requests.Session, 'post', Mk_post)
     c = creopyson.Client()
     with pytest.raises(Warning) as pytest_wrapped_e:
         c.server_pwd()
     assert pytest_wrapped_e.value.args[0] == "error message"
+
+
+def test_server_pwd_hooks_and_breaker():
+    """Test server_pwd is sent like the other commands."""
+    with FakeCreoson() as server:
+        c = server.client(circuit_breaker=1)
+        c.connect()
+        records = []
+        c.add_hook(post=records.append)
+        assert c.server_pwd() == "C:/CreosonServer"
+        assert [(r.command, r.function) for r in records] == [("server", "pwd")]
+    c.close()
+    with pytest.raises(ConnectionError):
+        c.server_pwd()
+    with pytest.raises(CircuitOpen):
+        c.server_pwd()
+    c.close()
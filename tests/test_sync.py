@@ -0,0 +1,124 @@
+"""Sync testing."""
+import pytest
+import creopyson
+from creopyson.fakeserver import FakeCreoson
+from creopyson.sync import SyncReport, plan, same_value
+
+CURRENT = {
+    "box.prt": [
+        {"name": "COLOR", "type": "STRING", "value": "red", "designate": False,
+         "description": ""},
+        {"name": "MASS", "type": "DOUBLE", "value": 1.5, "designate": True,
+         "description": "kg"},
+        {"name": "OLD", "type": "STRING", "value": "x", "designate": False,
+         "description": ""},
+    ],
+}
+
+
+def test_sync_same_value():
+    """Test values compared by parameter type."""
+    assert same_value("DOUBLE", 1.5, "1.5000000000001")
+    assert not same_value("DOUBLE", 1.5, 1.6)
+    assert same_value("INTEGER", 3, "3")
+    assert same_value("BOOL", True, 1)
+    assert same_value("BOOL", True, "true")
+    assert same_value("STRING", "3", 3)
+    assert not same_value("DOUBLE", 1.5, "abc")
+    assert same_value("STRING", None, None)
+    assert not same_value("STRING", "", None)
+
+
+def test_sync_plan():
+    """Test the minimal change set."""
+    desired = {
+        "box.prt": {
+            "color": "red",
+            "MASS": {"designate": False},
+            "OLD": None,
+            "NEW": 2,
+            "GONE": None,
+        },
+        "missing.prt": {"COLOR": "blue"},
+    }
+    changes, unchanged = plan(desired, CURRENT)
+    assert [(c.action, c.name) for c in changes] == [
+        ("create", "NEW"), ("designate", "MASS"), ("delete", "OLD"),
+    ]
+    assert changes[0].type == "INTEGER"
+    assert changes[1].designate is False and changes[1].value == 1.5
+    assert unchanged == 2
+
+    changes, unchanged = plan(
+        {"box.prt": {"MASS": {"value": 2.0, "designate": True, "description": "kg"}}},
+        CURRENT,
+    )
+    assert len(changes) == 1
+    change = changes[0]
+    assert (change.action, change.value, change.type) == ("update", 2.0, "DOUBLE")
+    assert change.designate is None and change.description is None
+    assert change.old["value"] == 1.5
+
+    changes, _ = plan({"box.prt": {"COLOR": {"description": "paint"}}}, CURRENT)
+    assert (changes[0].action, changes[0].value) == ("update", "red")
+    changes, _ = plan({"box.prt": {"MASS": {"value": 1.5, "type": "STRING"}}}, CURRENT)
+    assert changes[0].type == "STRING"
+
+
+def test_sync_parameter_sync():
+    """Test parameter_sync with the fake server."""
+    with FakeCreoson() as server:
+        files = ["part_{}.prt".format(i) for i in range(5)]
+        for name in files:
+            server.add_model(name, parameters={"COLOR": "red", "MASS": 1.0, "OLD": "x"})
+        c = server.client()
+        c.connect()
+        desired = {
+            name: {"COLOR": "red", "MASS": 1.0 + (i == 2), "OLD": None if i < 2 else "x"}
+            for i, name in enumerate(files)
+        }
+        desired["missing.prt"] = {"COLOR": "red"}
+
+        report = c.parameter_sync(desired, dry_run=True)
+        assert report.by_action() == {"update": 1, "delete": 2}
+        assert not report.applied
+        assert list(report.read_errors) == ["missing.prt"]
+        assert "OLD" in server.session.models["part_0.prt"].parameters
+
+        before = server.requests
+        report = c.parameter_sync(desired)
+        assert server.requests - before == 6 + 3
+        assert report.requests == 9
+        assert report.naive_requests == 16
+        assert report.saved == 7
+        assert report.changed_files == ["part_0.prt", "part_1.prt", "part_2.prt"]
+        assert not report
+        assert "OLD" not in server.session.models["part_0.prt"].parameters
+        assert server.session.models["part_2.prt"].parameters["MASS"]["value"] == 2.0
+
+        del desired["missing.prt"]
+        report = c.parameter_sync(desired)
+        assert report and not report.changes
+        assert report.requests == 5
+
+        with c.batch():
+            with pytest.raises(RuntimeError):
+                c.parameter_sync(desired)
+        c.close()
+    assert creopyson.Client.parameter_sync is creopyson.parameter.sync
+
+
+def test_sync_report_record():
+    """Test a failed request is reported, not raised."""
+    changes, _ = plan({"box.prt": {"COLOR": "blue", "NEW": 1}}, CURRENT)
+    report = SyncReport(changes, naive_requests=2)
+    report.requests = 1
+    error = RuntimeError("No parameter")
+    report.record([None, error])
+    assert report.applied == [changes[0]]
+    assert report.failed == [(changes[1], error)]
+    assert report.saved == -1
+    assert not report
+    assert repr(report) == (
+        "<SyncReport 2 changes, 1 applied, 1 failed, -1 requests saved>"
+    )
@@ -0,0 +1,129 @@
+"""Table testing."""
+import io
+import math
+
+import pytest
+import creopyson
+from creopyson.fakeserver import FakeCreoson
+from creopyson.table import ColumnTable, ParameterTable
+
+PARAMS = [
+    {"name": "COLOR", "type": "STRING", "value": "red", "designate": True,
+     "description": "", "encoded": False, "owner_name": "box.prt"},
+    {"name": "MASS", "type": "DOUBLE", "value": 1.5, "designate": False,
+     "description": "kg", "encoded": False, "owner_name": "box.prt"},
+    {"name": "COUNT", "type": "INTEGER", "value": 3, "designate": False,
+     "description": "", "encoded": False, "owner_name": "box.prt"},
+    {"name": "STOCK", "type": "BOOL", "value": True, "designate": False,
+     "description": "", "encoded": False, "owner_name": "box.prt"},
+]
+
+
+def test_table_column_table():
+    """Test typed columns, rows and CSV export."""
+    table = ColumnTable(["name", "x", "n", "ok"], {"x": "float", "n": "int", "ok": "bool"})
+    table.append({"name": "a", "x": 1.5, "n": 2, "ok": True})
+    table.append(["b", None, 3, False])
+    assert len(table) == 2
+    assert table["x"].typecode == "d" and math.isnan(table["x"][1])
+    assert list(table.rows())[0] == ("a", 1.5, 2, 1)
+    with pytest.raises(ValueError):
+        table.append(["c"])
+    stream = io.StringIO()
+    table.to_csv(stream)
+    assert stream.getvalue().splitlines() == ["name,x,n,ok", "a,1.5,2,True", "b,nan,3,False"]
+    assert repr(table) == "<ColumnTable 2 rows: name, x, n, ok>"
+
+
+def test_table_parameter_table(tmp_path):
+    """Test ParameterTable from parameter lists."""
+    table = ParameterTable.from_many([("box.prt", PARAMS), ("plate.prt", PARAMS[:1])])
+    assert len(table) == 5
+    assert table["file"] == ["box.prt"] * 4 + ["plate.prt"]
+    assert list(table["designate"]) == [1, 0, 0, 0, 1]
+    assert table["value_str"] == ["red", None, None, None, "red"]
+    assert table["value_double"] == [None, 1.5, None, None, None]
+    assert table["value_int"] == [None, None, 3, None, None]
+    assert table["value_bool"] == [None, None, None, True, None]
+    same = ParameterTable.from_many({("box.prt", p["name"]): p for p in PARAMS})
+    assert same["name"] == ["COLOR", "MASS", "COUNT", "STOCK"]
+    owner = ParameterTable()
+    owner.add(PARAMS)
+    assert owner["file"] == ["box.prt"] * 4
+    # a value not matching its type, ie. encoded, is kept as a string
+    owner.add([{"name": "X", "type": "DOUBLE", "value": "MS41", "encoded": True}])
+    assert owner["value_str"][-1] == "MS41"
+    assert owner["value_double"][-1] is None
+    path = tmp_path / "params.csv"
+    table.to_csv(str(path))
+    lines = path.read_text().splitlines()
+    assert lines[1] == "box.prt,COLOR,STRING,,,,red,True,,False"
+    assert lines[2] == "box.prt,MASS,DOUBLE,1.5,,,,False,kg,False"
+
+
+def test_table_arrow(tmp_path):
+    """Test Arrow and Parquet export."""
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("pyarrow.parquet")
+    table = ParameterTable.from_many([("box.prt", PARAMS)])
+    arrow = table.to_arrow()
+    assert arrow.column_names == list(ParameterTable.COLUMNS)
+    assert arrow.schema.field("designate").type == pa.bool_()
+    assert arrow.schema.field("value_double").type == pa.float64()
+    assert arrow.schema.field("value_int").type == pa.int64()
+    assert arrow.schema.field("value_bool").type == pa.bool_()
+    assert arrow.schema.field("value_str").type == pa.string()
+    assert arrow.column("designate").to_pylist() == [True, False, False, False]
+    assert arrow.column("value_double").to_pylist() == [None, 1.5, None, None]
+    assert arrow.column("value_int").to_pylist() == [None, None, 3, None]
+    assert arrow.column("value_bool").null_count == 3
+    # typed even when no parameter has this type
+    empty = ParameterTable.from_many([("box.prt", PARAMS[:1])]).to_arrow()
+    assert empty.schema.field("value_int").type == pa.int64()
+    # an untyped column of mixed value types is exported as strings
+    mixed = ColumnTable(["value"])
+    mixed.extend_column("value", ["red", 1.5])
+    assert mixed.to_arrow().column("value").to_pylist() == ["red", "1.5"]
+    numbers = ColumnTable(["x"], {"x": "float"})
+    numbers.append([2.0])
+    assert numbers.to_arrow().column("x").to_pylist() == [2.0]
+    path = tmp_path / "params.parquet"
+    table.to_parquet(str(path))
+    import pyarrow.parquet as pq
+    assert pq.read_table(str(path)).schema == arrow.schema
+
+
+def test_table_pandas():
+    """Test pandas export."""
+    pytest.importorskip("pandas")
+    table = ParameterTable.from_many([("box.prt", PARAMS), ("plate.prt", PARAMS)])
+    df = table.to_pandas(categories=["file", "type"])
+    assert list(df.columns) == list(ParameterTable.COLUMNS)
+    assert df["designate"].dtype == bool
+    assert str(df["file"].dtype) == "category"
+    assert str(df["value_int"].dtype) == "Int64"
+    assert str(df["value_double"].dtype) == "Float64"
+    assert df["value_double"].isna().tolist() == [True, False, True, True] * 2
+    assert df["value_double"][1] == 1.5
+    doubles = ParameterTable.from_many([("box.prt", PARAMS[1:2] * 3)]).to_pandas()
+    assert str(doubles["value_double"].dtype) == "Float64"
+    assert doubles["value_double"].tolist() == [1.5] * 3
+    assert str(doubles["value_bool"].dtype) == "boolean"
+    assert doubles["value_bool"].isna().all()
+    assert df["value_str"].tolist()[0] == "red"
+
+
+def test_table_parameter_list_table():
+    """Test parameter_list_table with the fake server."""
+    with FakeCreoson() as server:
+        files = ["part_{}.prt".format(i) for i in range(5)]
+        for i, name in enumerate(files):
+            server.add_model(name, parameters={"INDEX": i, "COLOR": "red"})
+        c = server.client()
+        c.connect()
+        table = c.parameter_list_table(files)
+        c.close()
+    assert isinstance(table, ParameterTable)
+    assert len(table) == 10
+    assert table["file"][:2] == ["part_0.prt", "part_0.prt"]
+    assert creopyson.Client.parameter_list_table is creopyson.parameter.list_table
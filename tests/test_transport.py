@@ -0,0 +1,91 @@
+"""Transport testing."""
+import pytest
+import creopyson
+from creopyson.exceptions import ReplayMismatch
+from creopyson.fakeserver import FakeCreoson
+from creopyson.transport import ReplayTransport, RecordingTransport, read_recording
+
+
+def _workflow(c):
+    c.connect()
+    params = c.parameter_list_many(["a.prt", "b.prt", "c.prt"], workers=3)
+    c.parameter_set("COLOR", "blue", file_="a.prt")
+    units = c.file_get_length_units(file_="a.prt")
+    return params, units
+
+
+def _record(path, latency=0.0):
+    with FakeCreoson(latency=latency) as server:
+        for name in ("a.prt", "b.prt", "c.prt"):
+            server.add_model(name, parameters={"COLOR": "red"})
+        with RecordingTransport(path) as recorder:
+            c = server.client(transport=recorder)
+            result = _workflow(c)
+            c.close()
+    return recorder, result
+
+
+@pytest.mark.parametrize("name", ["session.jsonl", "session.jsonl.gz"])
+def test_transport_record_replay(tmp_path, name):
+    """Test a workflow replayed without server."""
+    path = tmp_path / name
+    recorder, result = _record(path)
+    assert recorder.count == 6
+    header, entries = read_recording(path)
+    assert header["version"] == 1
+    assert [e["function"] for e in entries][0] == "connect"
+    assert all(e["duration"] >= 0 for e in entries)
+
+    replay = ReplayTransport(path, speed=None)
+    c = creopyson.Client(port=1, transport=replay)
+    assert _workflow(c) == result
+    assert replay.count == 6 and replay.unused == 0
+    with pytest.raises(ReplayMismatch):
+        c.file_get_length_units(file_="a.prt")
+    with pytest.raises(ReplayMismatch):
+        c.file_get_length_units(file_="other.prt")
+
+    c = creopyson.Client(port=1, transport=ReplayTransport(path, speed=None, strict=False))
+    _workflow(c)
+    assert c.file_get_length_units(file_="a.prt") == result[1]
+
+
+def test_transport_replay_speed(tmp_path, monkeypatch):
+    """Test the recorded latency is replayed."""
+    path = tmp_path / "slow.jsonl"
+    _record(path, latency=0.02)
+    sleeps = []
+    monkeypatch.setattr(creopyson.transport.time, "sleep", sleeps.append)
+    c = creopyson.Client(port=1, transport=ReplayTransport(path, speed=2))
+    c.connect()
+    c.parameter_set("COLOR", "blue", file_="a.prt")
+    assert len(sleeps) == 2
+    assert all(duration >= 0.01 for duration in sleeps)
+    sleeps.clear()
+    c = creopyson.Client(port=1, transport=ReplayTransport(path, speed=None))
+    _workflow(c)
+    assert sleeps == []
+
+
+def test_transport_errors(tmp_path):
+    """Test errors are recorded and replayed."""
+    path = tmp_path / "errors.jsonl"
+    with RecordingTransport(path) as recorder:
+        c = creopyson.Client(port=1, transport=recorder)
+        with pytest.raises(ConnectionError):
+            c.connect()
+    c = creopyson.Client(port=1, transport=ReplayTransport(path, speed=None))
+    with pytest.raises(ConnectionError):
+        c.connect()
+    (tmp_path / "bad.jsonl").write_text('{"version": 99}\n')
+    with pytest.raises(ValueError):
+        ReplayTransport(tmp_path / "bad.jsonl")
+
+
+def test_transport_msgpack(tmp_path):
+    """Test msgpack recordings."""
+    pytest.importorskip("msgpack")
+    path = tmp_path / "session.msgpack"
+    _, result = _record(path)
+    c = creopyson.Client(port=1, transport=ReplayTransport(path, speed=None))
+    assert _workflow(c) == result